@@ -0,0 +1,38 @@
+# api/admin_routes.py
+
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from .dependencies import get_memory_manager
+from .models import PrewarmRequest, PrewarmResponse
+from core.manager import MemoryManager
+from core.utils import validate_commit_hash
+
+# Operational endpoints that act on the caches rather than serve memory.
+router = APIRouter(prefix="/admin", tags=["Administration"])
+
+
+@router.post(
+    "/prewarm",
+    response_model=PrewarmResponse,
+    summary="Pre-warm Caches for a Commit Range",
+    description="Loads every file added or modified between two commits into the L1 cache (and L0 when configured), so the first agents to ask for them after a push do not all miss. The same pass runs automatically in the background whenever HEAD moves.",
+)
+async def prewarm_caches(
+    request: PrewarmRequest, manager: MemoryManager = Depends(get_memory_manager)
+):
+    try:
+        old_commit = validate_commit_hash(request.old_commit)
+        new_commit = validate_commit_hash(request.new_commit) if request.new_commit is not None else None
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+
+    logging.info(f"API pre-warm request for {old_commit[:7]}..{(new_commit or 'latest')[:7]}")
+    result = await manager.prewarm(old_commit, new_commit)
+    return PrewarmResponse(
+        old_commit=result.old_commit,
+        new_commit=result.new_commit,
+        changed=result.changed,
+        warmed=result.warmed,
+        seconds=result.seconds,
+    )
@@ -47,6 +47,49 @@ class SemanticSearchRequest(BaseModel):
     )
 
 
+class BatchFileRequest(BaseModel):
+    """
+    Defines the request body for retrieving many files in one call.
+    """
+
+    paths: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="The file paths to retrieve from the configured Git repository.",
+        examples=[["src/main.py", "src/utils/helpers.py"]],
+    )
+    commit_hash: Optional[str] = Field(
+        None, description="The commit to read from. Defaults to the latest commit."
+    )
+
+
+class PrewarmRequest(BaseModel):
+    """
+    Defines the request body for pre-warming the caches with a commit range.
+    """
+
+    old_commit: str = Field(
+        ..., description="The commit to diff from. Paths unchanged since it are not loaded."
+    )
+    new_commit: Optional[str] = Field(
+        None, description="The commit whose files are loaded. Defaults to the latest commit."
+    )
+
+
+class BulkDocument(BaseModel):
+    """
+    Defines one line of a bulk document upload (NDJSON).
+    """
+
+    id: str = Field(..., min_length=1, description="The unique document ID. Existing documents are replaced.")
+    content: str = Field(..., description="The text content to store and embed.")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Metadata stored with the document.")
+    embedding: Optional[List[float]] = Field(
+        None, description="A precomputed embedding. When omitted, the collection's embedding function is used."
+    )
+
+
 # --- Response Models ---
 
 
@@ -72,6 +115,46 @@ class SemanticSearchResponse(BaseModel):
     distances: List[List[float]]
 
 
+class BatchFileResponse(BaseModel):
+    """
+    Defines the response body for a batch file retrieval. Paths that do not
+    exist at the requested commit are listed in `missing` instead of failing
+    the whole batch.
+    """
+
+    files: Dict[str, str]
+    binary: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Files that are not valid UTF-8, base64-encoded.",
+    )
+    missing: List[str]
+
+
+class PrewarmResponse(BaseModel):
+    """
+    Defines the response body for a pre-warm pass.
+    """
+
+    old_commit: str
+    new_commit: str
+    changed: int = Field(..., description="Added or modified paths in the range.")
+    warmed: int = Field(..., description="Paths whose content is now cached.")
+    seconds: float
+
+
+class BulkDocumentResponse(BaseModel):
+    """
+    Defines the response body for a bulk document upload.
+    """
+
+    received: int
+    upserted: int
+    skipped: int = Field(..., description="Documents whose stored content hash already matched.")
+    seconds: float
+    docs_per_second: float
+    batch_latencies_ms: List[float] = Field(..., description="Duration of each batch write, in milliseconds.")
+
+
 class ErrorResponse(BaseModel):
     """
     A generic error response model for consistent error reporting.
@@ -1,8 +1,11 @@
 # api/routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Path
 from fastapi.responses import PlainTextResponse
-from typing import Optional
+from pydantic import ValidationError
+from typing import Any, AsyncIterator, Dict, Optional
+import base64
+import json
 import logging
 
 from .dependencies import get_memory_manager
@@ -20,7 +23,7 @@ router = APIRouter(prefix="/memory", tags=["Memory Operations"])
     response_model=str,
     response_class=PlainTextResponse,
     summary="Retrieve File Content",
-    description="Fetches the content of a file from the memory system, using the full L0 -> L1 -> L3 (Git) fallback logic. This is the primary endpoint for retrieving source-of-truth data.",
+    description="Fetches the content of a file from the memory system, using the full L0 -> L1 -> L3 (Git) fallback logic. This is the primary endpoint for retrieving source-of-truth data. The raw bytes stored in Git are returned unchanged, including files that are not valid UTF-8.",
 )
 async def get_file_from_memory(
     file_path: str = Path(
@@ -45,7 +48,43 @@ async def get_file_from_memory(
     # The actual logic is delegated entirely to the MemoryManager.
     # The API layer is only responsible for handling HTTP concerns.
     # Exceptions raised by the manager will be caught by the handlers in main.py.
-    return await manager.get_file_content(file_path, commit_hash)
+    # The cached bytes are handed to the response as-is, with no transcoding.
+    content = await manager.get_file_bytes(file_path, commit_hash)
+    return PlainTextResponse(content)
+
+
+@router.post(
+    "/files:batch",
+    response_model=BatchFileResponse,
+    summary="Retrieve Many Files",
+    description="Fetches the content of many files in one request. L0 hits are served from memory, L0 misses are resolved from L1 with a single MGET, and the rest are read from one Git commit before both caches are back-filled.",
+)
+async def get_files_batch(
+    request: BatchFileRequest, manager: MemoryManager = Depends(get_memory_manager)
+):
+    logging.info(
+        f"API batch request for {len(request.paths)} files at commit: {request.commit_hash or 'latest'}"
+    )
+
+    try:
+        file_paths = [validate_file_path(path) for path in request.paths]
+        commit_hash = request.commit_hash
+        if commit_hash is not None:
+            commit_hash = validate_commit_hash(commit_hash)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+
+    contents = await manager.get_file_contents_bulk(file_paths, commit_hash)
+    files, binary, missing = {}, {}, []
+    for path, value in contents.items():
+        if value is None:
+            missing.append(path)
+            continue
+        try:
+            files[path] = value.decode("utf-8")
+        except UnicodeDecodeError:
+            binary[path] = base64.b64encode(value).decode("ascii")
+    return BatchFileResponse(files=files, binary=binary, missing=missing)
 
 
 @router.post(
@@ -63,6 +102,54 @@ async def search_semantic_memory(
     return results
 
 
+async def _ndjson_documents(request: Request) -> AsyncIterator[Dict[str, Any]]:
+    """Parses an NDJSON request body line by line as it arrives."""
+    buffer = b""
+    line_number = 0
+
+    def parse(line: bytes) -> Optional[Dict[str, Any]]:
+        if not line.strip():
+            return None
+        try:
+            return BulkDocument.model_validate(json.loads(line)).model_dump()
+        except (ValueError, ValidationError) as err:
+            raise HTTPException(status_code=400, detail=f"Invalid document on line {line_number}: {err}")
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            document = parse(line)
+            if document is not None:
+                yield document
+    line_number += 1
+    document = parse(buffer)
+    if document is not None:
+        yield document
+
+
+@router.post(
+    "/documents:bulk",
+    response_model=BulkDocumentResponse,
+    summary="Bulk Upsert Documents",
+    description="Streams newline-delimited JSON documents (`id`, `content`, optional `metadata` and `embedding`) into the L2 (ChromaDB) layer in size- and count-bounded batches. Documents whose content is unchanged are skipped. Writes are idempotent upserts, so a failed upload can simply be retried; batches before the failing line stay written.",
+)
+async def bulk_upsert_documents(
+    request: Request, manager: MemoryManager = Depends(get_memory_manager)
+):
+    logging.info("API bulk document upsert started.")
+    result = await manager.add_documents_bulk(_ndjson_documents(request))
+    return BulkDocumentResponse(
+        received=result.received,
+        upserted=result.upserted,
+        skipped=result.skipped,
+        seconds=result.seconds,
+        docs_per_second=result.docs_per_second,
+        batch_latencies_ms=[latency * 1000 for latency in result.batch_latencies],
+    )
+
+
 @router.post(
     "/cache",
     response_model=SetMemoryResponse,
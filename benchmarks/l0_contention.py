@@ -0,0 +1,68 @@
+"""
+Microbenchmark for L0 lock contention.
+
+Compares the single-RLock `L0Cache` with `ShardedL0Cache` (exact and sampled
+LRU) under a 90% read / 10% write workload at 1, 8 and 32 threads.
+
+Usage:
+    python -m benchmarks.l0_contention [--ops 200000] [--keys 5000]
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Callable, List
+
+from core.l0_cache import L0Cache, ShardedL0Cache
+
+THREAD_COUNTS = (1, 8, 32)
+
+
+def run(cache, threads: int, ops: int, keys: int) -> float:
+    """Runs `ops` operations spread over `threads` threads and returns ops/s."""
+    for i in range(keys):
+        cache.set(f"key:{i}", i)
+    per_thread = ops // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        picks = [f"key:{rng.randrange(keys)}" for _ in range(per_thread)]
+        writes = [rng.random() < 0.1 for _ in range(per_thread)]
+        barrier.wait()
+        for key, write in zip(picks, writes):
+            if write:
+                cache.set(key, 0)
+            else:
+                cache.get(key)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=5_000)
+    args = parser.parse_args()
+
+    factories: List[tuple[str, Callable]] = [
+        ("L0Cache (global RLock)", lambda: L0Cache(args.keys)),
+        ("ShardedL0Cache exact", lambda: ShardedL0Cache(args.keys, shards=16, approximate=False)),
+        ("ShardedL0Cache sampled", lambda: ShardedL0Cache(args.keys, shards=16, approximate=True)),
+    ]
+    print(f"{'implementation':<28}" + "".join(f"{f'{n} thr ops/s':>18}" for n in THREAD_COUNTS))
+    for name, factory in factories:
+        rates = [run(factory(), threads, args.ops, args.keys) for threads in THREAD_COUNTS]
+        print(f"{name:<28}" + "".join(f"{rate:>18,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark for bulk embedding, insertion and search in `VectorStore`.
+
+Adds 10k synthetic reasoning chains to an offline store (local index only)
+one at a time with `add_entry` and in bulk with `add_entries`, then runs
+1000 queries one at a time and with `query_similar_many`.
+
+Usage:
+    python -m benchmarks.vector_store_bulk [--entries 10000] [--queries 1000]
+"""
+
+import argparse
+import random
+import time
+
+from memory.vector_store import VectorStore
+
+STEPS = ("enumerate services", "find exposed port", "escalate privileges", "dump credentials", "pivot to host")
+
+
+def chains(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [" -> ".join(rng.sample(STEPS, 3)) + f" #{i}" for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+    texts = chains(args.entries)
+    queries = random.Random(1).sample(texts, min(args.queries, len(texts)))
+
+    single = VectorStore(offline=True)
+    start = time.perf_counter()
+    for text in texts:
+        single.add_entry(text)
+    add_one = len(texts) / (time.perf_counter() - start)
+
+    bulk = VectorStore(offline=True)
+    start = time.perf_counter()
+    bulk.add_entries(texts)
+    add_many = len(texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in queries:
+        bulk.query_similar(text)
+    query_one = len(queries) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    bulk.query_similar_many(queries)
+    query_many = len(queries) / (time.perf_counter() - start)
+
+    print(f"{'operation':<22}{'one at a time/s':>18}{'bulk/s':>14}{'speedup':>10}")
+    print(f"{'insert':<22}{add_one:>18,.0f}{add_many:>14,.0f}{add_many / add_one:>9.1f}x")
+    print(f"{'query':<22}{query_one:>18,.0f}{query_many:>14,.0f}{query_many / query_one:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
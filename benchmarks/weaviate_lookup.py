@@ -0,0 +1,74 @@
+"""
+Benchmark for L2 Weaviate lookups by UUID.
+
+Imports 1000 nodes into a scratch class, then resolves 1, 100 and 1000 of
+them with one `get_node_by_uuid` call per ID, with one `get_nodes_by_uuids`
+call against a cold cache, and with the same call once the cache is warm.
+The scratch class is deleted afterwards.
+
+Requires a running Weaviate.
+
+Usage:
+    python -m benchmarks.weaviate_lookup [--url http://localhost:8080] [--repeat 3]
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, List
+
+from core.l2_weaviate import L2Weaviate
+from core.weaviate_importer import deterministic_uuid
+
+CLASS_NAME = "BenchmarkLookupNode"
+ID_COUNTS = (1, 100, 1000)
+
+
+def best_of(repeat: int, setup: Callable[[], None], func: Callable[[], None]) -> float:
+    """Returns the fastest of `repeat` timed runs of `func`, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.environ.get("WEAVIATE_URL", "http://localhost:8080"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    l2w = L2Weaviate(args.url)
+    if l2w.client.schema.exists(CLASS_NAME):
+        l2w.client.schema.delete_class(CLASS_NAME)
+    l2w.client.schema.create_class({
+        "class": CLASS_NAME,
+        "vectorizer": "none",
+        "properties": [{"name": "text", "dataType": ["text"]}],
+    })
+    try:
+        count = max(ID_COUNTS)
+        uuids: List[str] = [deterministic_uuid(CLASS_NAME, i) for i in range(count)]
+        result = l2w.batch_import(CLASS_NAME, ({"text": f"node {i}"} for i in range(count)), uuids=uuids)
+        if result.failed_ids:
+            raise SystemExit(f"{len(result.failed_ids)} benchmark nodes failed to import.")
+
+        def clear_cache() -> None:
+            l2w._evict_nodes(CLASS_NAME)
+
+        print(f"{'ids':>6}{'per-ID ms':>14}{'batched ms':>14}{'cached ms':>14}{'speedup':>10}")
+        for n in ID_COUNTS:
+            ids = uuids[:n]
+            single = best_of(args.repeat, clear_cache, lambda: [l2w.get_node_by_uuid(i, CLASS_NAME, ["text"]) for i in ids])
+            batched = best_of(args.repeat, clear_cache, lambda: l2w.get_nodes_by_uuids(ids, CLASS_NAME, ["text"]))
+            cached = best_of(args.repeat, lambda: None, lambda: l2w.get_nodes_by_uuids(ids, CLASS_NAME, ["text"]))
+            print(f"{n:>6}{single:>14.1f}{batched:>14.1f}{cached:>14.2f}{single / batched:>9.1f}x")
+    finally:
+        l2w.client.schema.delete_class(CLASS_NAME)
+
+
+if __name__ == "__main__":
+    main()
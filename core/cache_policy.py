@@ -0,0 +1,43 @@
+# core/cache_policy.py
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How MemoryManager caches lookups for a group of file paths.
+
+    Attributes:
+        negative_ttl: Seconds to remember that a path does not exist. 0 disables negative caching.
+        stale_while_revalidate: For `latest` lookups, serve the last known
+            version immediately and refresh it in the background if HEAD moved.
+    """
+
+    negative_ttl: int = 0
+    stale_while_revalidate: bool = False
+
+
+class CachePolicies:
+    """Resolves the policy for a path by longest matching prefix."""
+
+    def __init__(self, default: CachePolicy, overrides: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            default: The policy for paths that match no prefix.
+            overrides: Maps path prefixes to the policy fields they override,
+                       e.g. {"docs/": {"stale_while_revalidate": true}}.
+        """
+        self.default = default
+        self._prefixes: List[Tuple[str, CachePolicy]] = sorted(
+            ((prefix, replace(default, **fields)) for prefix, fields in overrides.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def for_path(self, file_path: str) -> CachePolicy:
+        for prefix, policy in self._prefixes:
+            if file_path.startswith(prefix):
+                return policy
+        return self.default
@@ -0,0 +1,174 @@
+# core/coalesce.py
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class _Flight(Generic[T]):
+    """One in-flight execution and the number of callers waiting on it."""
+
+    __slots__ = ("future", "task", "waiters")
+
+    def __init__(self, future: "asyncio.Future[T]"):
+        self.future = future
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls for the same key into one execution.
+
+    The first caller for a key starts the work; everyone who arrives while it
+    is running awaits the same `asyncio.Future` and receives the same result
+    or the same exception. A key is forgotten as soon as its flight settles,
+    so the map only ever holds in-flight work and cannot grow with the number
+    of distinct keys seen. If every waiter is cancelled the work is cancelled
+    too, since nobody is left to use its result.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of keys currently in flight."""
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `fn` for `key`, or joins the execution already running for it.
+
+        Args:
+            key: Identifies equivalent calls. Must be hashable.
+            fn: A zero-argument coroutine function producing the result.
+
+        Returns:
+            The result of the shared execution.
+
+        Raises:
+            Whatever `fn` raised, re-raised in every waiter.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.get_running_loop().create_future())
+            self._flights[key] = flight
+            flight.task = asyncio.ensure_future(self._run(key, flight, fn))
+
+        flight.waiters += 1
+        try:
+            # shield() keeps one waiter's cancellation from cancelling the
+            # shared future out from under the others.
+            return await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.future.done():
+                logging.debug(f"All waiters for '{key}' cancelled; cancelling its flight.")
+                flight.task.cancel()
+                flight.future.cancel()
+                # The task may be cancelled before it ever runs, so its own
+                # cleanup cannot be relied on here.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    async def _run(self, key: Hashable, flight: _Flight, fn: Callable[[], Awaitable[T]]) -> None:
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            if not flight.future.done():
+                flight.future.cancel()
+            raise
+        except BaseException as e:
+            if not flight.future.done():
+                flight.future.set_exception(e)
+                # Mark the exception retrieved; waiters that are still around
+                # receive it through their own shield.
+                flight.future.exception()
+        else:
+            if not flight.future.done():
+                flight.future.set_result(result)
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Gathers concurrent single-item calls into batches for one bulk call.
+
+    Items submitted while a batch is open join it; the batch is flushed as
+    soon as it holds `max_batch` items or `max_delay` seconds after its first
+    item arrived, whichever comes first. `flush` receives the items in
+    submission order and must return one result per item; each submitter
+    receives its own result, or the exception the whole batch failed with.
+    """
+
+    def __init__(self, flush: Callable[[List[T]], Awaitable[List[R]]], max_batch: int = 64, max_delay: float = 0.002):
+        """
+        Args:
+            flush: A coroutine function performing the bulk call.
+            max_batch: The number of items that triggers an immediate flush.
+            max_delay: Seconds a batch may wait for more items.
+        """
+        self.flush = flush
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self._items: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        """Returns the number of items waiting in the open batch."""
+        return len(self._items)
+
+    async def submit(self, item: T) -> R:
+        """Adds an item to the open batch and waits for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append((item, future))
+        if len(self._items) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._dispatch)
+        return await future
+
+    async def close(self) -> None:
+        """Flushes the open batch and waits for every batch still running."""
+        self._dispatch()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._items = self._items, []
+        # Submitters that were cancelled while waiting no longer need a result.
+        items = [(item, future) for item, future in items if not future.done()]
+        if not items:
+            return
+        task = asyncio.ensure_future(self._run(items))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, items: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self.flush([item for item, _ in items])
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch flush returned {len(results)} results for {len(items)} items.")
+        except BaseException as e:
+            for _, future in items:
+                if not future.done():
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        else:
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
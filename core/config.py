@@ -1,6 +1,7 @@
 # core/config.py
 
 import os
+import json
 from dotenv import load_dotenv
 
 # load_dotenv() will search for a .env file in the project root and load its
@@ -13,16 +14,99 @@ LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
 
 # --- L1 Cache Configuration ---
 REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Compression codec for L1 values: none, zlib, lz4 or zstd.
+L1_CODEC: str = os.getenv("L1_CODEC", "none").lower()
+# Values smaller than this many bytes are stored uncompressed.
+L1_COMPRESSION_MIN_BYTES: int = int(os.getenv("L1_COMPRESSION_MIN_BYTES", "1024"))
+L1_COMPRESSION_LEVEL: int = int(os.getenv("L1_COMPRESSION_LEVEL", "3"))
+# Optional zstd dictionary trained with tools/train_zstd_dict.py.
+L1_ZSTD_DICT_PATH: str | None = os.getenv("L1_ZSTD_DICT_PATH")
+
+# --- Embedding Configuration ---
+# "local" runs all-MiniLM-L6-v2 on the CPU; "hashing" gives deterministic, non-semantic vectors of EMBEDDING_DIM.
+EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "local")
+EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", "32"))
+# SQLite file caching vectors by model and content hash. Empty keeps them in memory only.
+EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", ".sentinel/embeddings.sqlite")
+EMBEDDING_MEMORY_CACHE_SIZE: int = int(os.getenv("EMBEDDING_MEMORY_CACHE_SIZE", "10000"))
+EMBEDDING_MAX_BATCH: int = int(os.getenv("EMBEDDING_MAX_BATCH", "64"))
+EMBEDDING_BATCH_WINDOW_MS: float = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "2"))
 
 # --- L2 Memory Configuration ---
 WEAVIATE_URL: str = os.getenv("WEAVIATE_URL", "http://localhost:8080")
+# Connection pool, timeouts and write batching of the shared async Weaviate client.
+WEAVIATE_TIMEOUT_SECONDS: float = float(os.getenv("WEAVIATE_TIMEOUT_SECONDS", "10"))
+WEAVIATE_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("WEAVIATE_CONNECT_TIMEOUT_SECONDS", "2"))
+WEAVIATE_MAX_CONNECTIONS: int = int(os.getenv("WEAVIATE_MAX_CONNECTIONS", "20"))
+WEAVIATE_MAX_BATCH: int = int(os.getenv("WEAVIATE_MAX_BATCH", "64"))
+WEAVIATE_BATCH_WINDOW_MS: float = float(os.getenv("WEAVIATE_BATCH_WINDOW_MS", "5"))
+# Seconds nodes looked up by ID stay in the per-process cache. 0 disables it.
+WEAVIATE_NODE_CACHE_TTL_SECONDS: float = float(os.getenv("WEAVIATE_NODE_CACHE_TTL_SECONDS", "30"))
+WEAVIATE_NODE_CACHE_SIZE: int = int(os.getenv("WEAVIATE_NODE_CACHE_SIZE", "10000"))
+# Embed Weaviate objects and queries with the shared embedding service instead of a
+# server-side vectorizer. Requires classes created with `vectorizer: none`.
+WEAVIATE_SERVICE_EMBEDDINGS: bool = os.getenv("WEAVIATE_SERVICE_EMBEDDINGS", "false").lower() == "true"
 CHROMA_PATH: str = os.getenv("CHROMA_PATH", "./chroma_data")
+# Threads reserved for Chroma calls, and how concurrent queries and writes are batched.
+CHROMA_MAX_THREADS: int = int(os.getenv("CHROMA_MAX_THREADS", "4"))
+CHROMA_MAX_BATCH: int = int(os.getenv("CHROMA_MAX_BATCH", "64"))
+CHROMA_BATCH_WINDOW_MS: float = float(os.getenv("CHROMA_BATCH_WINDOW_MS", "2"))
+# Bounds on each write of a bulk document upsert.
+CHROMA_BULK_BATCH_SIZE: int = int(os.getenv("CHROMA_BULK_BATCH_SIZE", "256"))
+CHROMA_BULK_MAX_BATCH_BYTES: int = int(os.getenv("CHROMA_BULK_MAX_BATCH_BYTES", str(4 * 1024 * 1024)))
+# Seconds to cache semantic search results. 0 disables the search cache.
+SEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+# Reuse results of earlier queries whose embeddings reach this cosine similarity. 0 disables it.
+SEARCH_CACHE_APPROXIMATE_THRESHOLD: float = float(os.getenv("SEARCH_CACHE_APPROXIMATE_THRESHOLD", "0"))
 
 # --- L3 Source of Truth Configuration ---
 GIT_REPO_PATH: str = os.getenv("GIT_REPO_PATH", "./sample_repo")
+# Number of persistent `git cat-file --batch` processes used for non-blocking
+# blob reads. Set to 0 to fall back to offloading GitPython calls to threads.
+L3_CAT_FILE_WORKERS: int = int(os.getenv("L3_CAT_FILE_WORKERS", "2"))
+# Number of per-commit path->blob-SHA indexes kept in memory (LRU).
+L3_TREE_INDEX_SIZE: int = int(os.getenv("L3_TREE_INDEX_SIZE", "16"))
+# Seconds between polls of .git/HEAD and refs. 0 disables the watcher, in
+# which case every `latest` lookup resolves HEAD through Git.
+HEAD_WATCH_INTERVAL_SECONDS: float = float(os.getenv("HEAD_WATCH_INTERVAL_SECONDS", "1.0"))
+# Load the files changed by each new HEAD into the caches before agents request them.
+PREWARM_ON_HEAD_MOVE: bool = os.getenv("PREWARM_ON_HEAD_MOVE", "true").lower() == "true"
+PREWARM_BATCH_SIZE: int = int(os.getenv("PREWARM_BATCH_SIZE", "200"))
+PREWARM_CONCURRENCY: int = int(os.getenv("PREWARM_CONCURRENCY", "4"))
+PREWARM_MAX_PATHS: int = int(os.getenv("PREWARM_MAX_PATHS", "5000"))
+PREWARM_L0: bool = os.getenv("PREWARM_L0", "false").lower() == "true"
+# Cross-replica single-flight for L3 misses: only the replica holding a short
+# Redis lease reads from Git, the others wait for it to fill L1.
+L3_DISTRIBUTED_SINGLE_FLIGHT: bool = os.getenv("L3_DISTRIBUTED_SINGLE_FLIGHT", "false").lower() == "true"
+L3_LEASE_TTL_MS: int = int(os.getenv("L3_LEASE_TTL_MS", "5000"))
+L3_LEASE_POLL_MS: int = int(os.getenv("L3_LEASE_POLL_MS", "25"))
+L3_LEASE_WAIT_TIMEOUT_MS: int = int(os.getenv("L3_LEASE_WAIT_TIMEOUT_MS", "5000"))
+
+# --- File Cache Policy Configuration ---
+# Seconds to remember that a path does not exist (0 disables negative caching).
+NEGATIVE_CACHE_TTL_SECONDS: int = int(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", "30"))
+# Serve `latest` lookups from cache and refresh them in the background when HEAD moves.
+STALE_WHILE_REVALIDATE: bool = os.getenv("STALE_WHILE_REVALIDATE", "false").lower() == "true"
+# Per-path-prefix overrides of the two settings above, as a JSON object, e.g.
+# {"docs/": {"stale_while_revalidate": true}, "generated/": {"negative_ttl": 5}}
+CACHE_POLICY_OVERRIDES: dict = json.loads(os.getenv("CACHE_POLICY_OVERRIDES", "{}"))
+
+# --- Executor Configuration ---
+EXECUTOR_MAX_THREADS: int = int(os.getenv("EXECUTOR_MAX_THREADS", "8"))
+EXECUTOR_MAX_PROCESSES: int = int(os.getenv("EXECUTOR_MAX_PROCESSES", "4"))
 
 # --- L0 Cache Configuration ---
 L0_CACHE_SIZE: int = int(os.getenv("L0_CACHE_SIZE", "10000"))
+# When set to a positive value, L0 is bounded by total bytes instead of item
+# count and uses W-TinyLFU admission. L0_CACHE_SIZE is ignored in that mode.
+L0_CACHE_MAX_BYTES: int = int(os.getenv("L0_CACHE_MAX_BYTES", "0"))
+# Number of independently locked L0 segments. 1 keeps the single-lock cache.
+L0_CACHE_SHARDS: int = int(os.getenv("L0_CACHE_SHARDS", "1"))
+# Sharded mode only: use lock-free reads with sampled (approximate) LRU eviction.
+L0_CACHE_APPROXIMATE_LRU: bool = os.getenv("L0_CACHE_APPROXIMATE_LRU", "true").lower() == "true"
+# Broadcast L0 invalidations to other replicas over Redis pub/sub.
+L0_INVALIDATION_ENABLED: bool = os.getenv("L0_INVALIDATION_ENABLED", "true").lower() == "true"
+L0_INVALIDATION_CHANNEL: str = os.getenv("L0_INVALIDATION_CHANNEL", "sentinel:l0:invalidate")
 
 # --- Security & API Keys ---
 # It's good practice to centralize access to secrets, even if they are just
@@ -0,0 +1,283 @@
+# core/embeddings.py
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+from .coalesce import MicroBatcher
+from .metrics import embedding_model_seconds, embedding_requests_total
+
+
+class EmbeddingBackend(Protocol):
+    """A model turning texts into fixed-size vectors."""
+
+    model_id: str
+    dim: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Returns a float32 array with one row per text."""
+        ...
+
+
+def hash_embed(texts: Sequence[str], dim: int = 32) -> np.ndarray:
+    """
+    Deterministic pseudo-embeddings: SHA-256 digest bytes scaled to [0, 1].
+
+    Digests of `text`, `text#1`, `text#2`, ... are concatenated when `dim`
+    exceeds 32, so the first 32 components never depend on `dim`.
+    """
+    rounds = -(-dim // 32)
+    digests = b"".join(
+        hashlib.sha256(text.encode() if i == 0 else f"{text}#{i}".encode()).digest()
+        for text in texts
+        for i in range(rounds)
+    )
+    matrix = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), rounds * 32)[:, :dim]
+    return matrix.astype(np.float32) / np.float32(255.0)
+
+
+class HashingBackend:
+    """Hash-based vectors: free to compute and stable, but with no semantic meaning."""
+
+    def __init__(self, dim: int = 32):
+        self.dim = dim
+        self.model_id = f"sha256-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return hash_embed(texts, self.dim)
+
+
+class LocalModelBackend:
+    """
+    all-MiniLM-L6-v2 on the CPU through ONNX Runtime.
+
+    This is the model Chroma embeds with by default, so collections written
+    before the shared service existed stay searchable. It is loaded on first
+    use.
+    """
+
+    model_id = "all-MiniLM-L6-v2"
+    dim = 384
+
+    def __init__(self):
+        self._model = None
+        self._lock = threading.Lock()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        with self._lock:
+            if self._model is None:
+                from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+                self._model = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+        return np.asarray(self._model(texts), dtype=np.float32)
+
+
+def build_backend(name: str, dim: int = 32) -> EmbeddingBackend:
+    """Returns the backend configured by name: "local" or "hashing"."""
+    if name == "local":
+        return LocalModelBackend()
+    if name == "hashing":
+        return HashingBackend(dim)
+    raise ValueError(f"Unknown embedding backend '{name}'. Expected 'local' or 'hashing'.")
+
+
+class EmbeddingCache:
+    """
+    Embeddings persisted in SQLite, keyed by the SHA-256 of the model ID and the text.
+
+    Vectors survive restarts and are shared by every process pointed at the
+    same file. Safe to use from several threads.
+    """
+
+    # SQLite's default limit on bound parameters is 999.
+    _CHUNK = 500
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(model_id: str, text: str) -> str:
+        return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._CHUNK):
+                chunk = list(keys[start:start + self._CHUNK])
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model_id: str, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                [(key, model_id, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingService:
+    """
+    The one place texts are embedded, shared by Chroma, Weaviate and the vector store.
+
+    Lookups go through an in-memory LRU, then the on-disk cache, and only
+    the texts missing from both reach the model, in one call. Concurrent
+    `embed_one_async` callers are gathered into batches, flushed when full
+    or after `batch_window_ms`, so the model sees one forward pass per
+    batch instead of one per request.
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        cache: Optional[EmbeddingCache] = None,
+        memory_cache_size: int = 10000,
+        max_batch: int = 64,
+        batch_window_ms: float = 2.0,
+    ):
+        """
+        Args:
+            backend: The model producing the vectors.
+            cache: The on-disk cache. Vectors are only kept in memory when omitted.
+            memory_cache_size: Vectors kept in the in-memory LRU. 0 disables it.
+            max_batch: The number of queued texts that triggers a model call.
+            batch_window_ms: How long queued texts wait for more callers.
+        """
+        self.backend = backend
+        self.cache = cache
+        self.memory_cache_size = memory_cache_size
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._batcher: MicroBatcher[str, np.ndarray] = MicroBatcher(
+            self._flush, max_batch=max_batch, max_delay=batch_window_ms / 1000
+        )
+
+    @property
+    def model_id(self) -> str:
+        return self.backend.model_id
+
+    @property
+    def dim(self) -> int:
+        return self.backend.dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Returns a float32 array with one row per text."""
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        keys = [EmbeddingCache.key(self.model_id, text) for text in texts]
+        found = self._from_memory(keys)
+        embedding_requests_total.labels(tier="memory").inc(len(found))
+        if self.cache is not None and len(found) < len(keys):
+            stored = self.cache.get_many([key for key in dict.fromkeys(keys) if key not in found])
+            embedding_requests_total.labels(tier="disk").inc(len(stored))
+            self._to_memory(stored)
+            found.update(stored)
+        # Identical texts within one call are embedded once.
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            with embedding_model_seconds.time():
+                vectors = self.backend.embed(list(missing.values()))
+            embedding_requests_total.labels(tier="model").inc(len(missing))
+            computed = dict(zip(missing, vectors))
+            if self.cache is not None:
+                self.cache.put_many(self.model_id, computed)
+            self._to_memory(computed)
+            found.update(computed)
+        return np.stack([found[key] for key in keys])
+
+    async def embed_async(self, texts: Sequence[str]) -> np.ndarray:
+        """`embed` run off the event loop."""
+        return await asyncio.to_thread(self.embed, list(texts))
+
+    async def embed_one_async(self, text: str) -> np.ndarray:
+        """Embeds one text, batched with concurrent callers."""
+        return await self._batcher.submit(text)
+
+    async def close(self) -> None:
+        await self._batcher.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def _flush(self, texts: List[str]) -> List[np.ndarray]:
+        logging.debug(f"Embedding {len(texts)} batched texts with '{self.model_id}'.")
+        return list(await self.embed_async(texts))
+
+    def _from_memory(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        if self.memory_cache_size <= 0:
+            return found
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def _to_memory(self, vectors: Dict[str, np.ndarray]) -> None:
+        if self.memory_cache_size <= 0:
+            return
+        with self._lock:
+            for key, vector in vectors.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_cache_size:
+                self._memory.popitem(last=False)
+
+
+_default_service: Optional[EmbeddingService] = None
+_default_lock = threading.Lock()
+
+
+def default_embedding_service() -> EmbeddingService:
+    """Returns the process-wide service configured by the EMBEDDING_* settings, creating it on first use."""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            from .config import (
+                EMBEDDING_BACKEND, EMBEDDING_DIM, EMBEDDING_CACHE_PATH, EMBEDDING_MEMORY_CACHE_SIZE,
+                EMBEDDING_MAX_BATCH, EMBEDDING_BATCH_WINDOW_MS,
+            )
+            _default_service = EmbeddingService(
+                build_backend(EMBEDDING_BACKEND, EMBEDDING_DIM),
+                cache=EmbeddingCache(EMBEDDING_CACHE_PATH) if EMBEDDING_CACHE_PATH else None,
+                memory_cache_size=EMBEDDING_MEMORY_CACHE_SIZE,
+                max_batch=EMBEDDING_MAX_BATCH,
+                batch_window_ms=EMBEDDING_BATCH_WINDOW_MS,
+            )
+        return _default_service
+
+
+async def close_default_embedding_service() -> None:
+    """Closes the process-wide service, if any; the next `default_embedding_service` call creates a fresh one."""
+    global _default_service
+    with _default_lock:
+        service, _default_service = _default_service, None
+    if service is not None:
+        await service.close()
@@ -0,0 +1,111 @@
+# core/head_watcher.py
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from .l3_git_async import AsyncL3Git
+
+# Called with (old HEAD, new HEAD) whenever the repository's HEAD moves.
+HeadListener = Callable[[str, str], Awaitable[None]]
+
+
+class HeadWatcher:
+    """
+    Keeps the repository's resolved HEAD in memory.
+
+    `.git/HEAD`, the ref it points to and `packed-refs` are polled with
+    `os.stat`, which costs a few syscalls per interval and needs no inotify
+    support. Only when one of them changes is HEAD re-resolved, and listeners
+    are notified if it actually moved. Request handlers read `head` instead of
+    asking Git on every `latest` lookup.
+    """
+
+    def __init__(self, l3_async: AsyncL3Git, interval: float = 1.0):
+        """
+        Args:
+            l3_async: The async L3 layer used to resolve HEAD.
+            interval: Seconds between polls of the ref files.
+        """
+        self.l3_async = l3_async
+        self.interval = interval
+        self.git_dir = l3_async.l3.repo.git_dir
+        # Linked worktrees keep HEAD in their own git dir but share refs.
+        self.common_dir = getattr(l3_async.l3.repo, "common_dir", None) or self.git_dir
+        self.head: Optional[str] = None
+        self._signature: Tuple = ()
+        self._listeners: List[HeadListener] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: HeadListener) -> None:
+        """Registers a coroutine function to call with (old, new) when HEAD moves."""
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        """Resolves the current HEAD and starts polling."""
+        self._signature = self._stat_signature()
+        self.head = await self.l3_async.get_latest_commit()
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll())
+            logging.info(f"Watching HEAD of '{self.git_dir}' (currently {self.head[:7]}).")
+
+    async def close(self) -> None:
+        """Stops polling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _ref_files(self) -> List[str]:
+        head_path = os.path.join(self.git_dir, "HEAD")
+        files = [head_path, os.path.join(self.common_dir, "packed-refs")]
+        try:
+            with open(head_path) as f:
+                content = f.read().strip()
+            if content.startswith("ref: "):
+                files.append(os.path.join(self.common_dir, content[5:]))
+        except OSError:
+            pass
+        return files
+
+    def _stat_signature(self) -> Tuple:
+        signature = []
+        for path in self._ref_files():
+            try:
+                st = os.stat(path)
+                signature.append((path, st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                signature.append((path, None))
+        return tuple(signature)
+
+    async def check(self) -> bool:
+        """
+        Re-resolves HEAD if any ref file changed and notifies listeners.
+
+        Returns:
+            True if HEAD moved.
+        """
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        new_head = await self.l3_async.get_latest_commit()
+        old_head, self.head = self.head, new_head
+        if old_head is None or new_head == old_head:
+            return False
+        logging.info(f"HEAD moved from {old_head[:7]} to {new_head[:7]}.")
+        for listener in self._listeners:
+            try:
+                await listener(old_head, new_head)
+            except Exception as e:
+                logging.error(f"HEAD change listener failed: {e}", exc_info=True)
+        return True
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logging.warning(f"HEAD watcher poll failed: {e}")
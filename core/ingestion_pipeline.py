@@ -0,0 +1,394 @@
+# core/ingestion_pipeline.py
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from core.ingestion_service import (
+    CODE_EXTENSIONS,
+    DOCUMENT_EXTENSIONS,
+    extract_document_chunks,
+    process_code_file,
+)
+from core.l2_weaviate import L2Weaviate
+from core.l3_git import L3Git
+from core.weaviate_importer import deterministic_uuid
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkJob(NamedTuple):
+    """One document to partition and chunk in a worker process."""
+
+    rel_path: str
+    # The content SHA-256 for working-tree files, or the blob SHA for Git content.
+    digest: str
+    # Whether objects from an earlier ingest of this path must be deleted first.
+    replace: bool
+    file_path: Optional[str] = None
+    data: Optional[bytes] = None
+    commit: Optional[str] = None
+
+
+# A chunked job and the Weaviate objects extracted from it.
+ChunkedFile = Tuple[ChunkJob, List[Dict[str, Any]]]
+
+
+def hash_file(file_path: str) -> str:
+    """Returns the hex SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def walk_repository(repo_path: str) -> Iterator[str]:
+    """Yields the repo-relative paths of every supported file, pruning `.git` directories."""
+    extensions = CODE_EXTENSIONS | DOCUMENT_EXTENSIONS
+    for root, dirs, files in os.walk(repo_path):
+        dirs[:] = sorted(d for d in dirs if d != ".git")
+        for fname in sorted(files):
+            if os.path.splitext(fname)[1].lower() in extensions:
+                yield os.path.relpath(os.path.join(root, fname), repo_path)
+
+
+def bounded_map(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator[Tuple[Any, Future]]:
+    """
+    Like `executor.map`, but keeps at most `window` calls in flight and never
+    materializes the input, so a slow consumer holds the producer back.
+    Yields (item, future) pairs in input order once each future is done.
+    """
+    pending: Deque[Tuple[Any, Future]] = collections.deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= window:
+            item, future = pending.popleft()
+            future.exception()  # Waits without raising.
+            yield item, future
+    while pending:
+        item, future = pending.popleft()
+        future.exception()
+        yield item, future
+
+
+class IngestManifest:
+    """
+    Records the content hash of every file that was fully ingested.
+
+    A file is only recorded once all of its objects were imported, and the
+    manifest is flushed to disk periodically with an atomic rename, so it
+    doubles as the checkpoint of an interrupted run: re-running skips every
+    file whose hash still matches.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+            logger.info(f"Loaded ingest manifest with {len(self.entries)} entries from {path}.")
+
+    def is_current(self, rel_path: str, digest: str) -> bool:
+        with self._lock:
+            return self.entries.get(rel_path) == digest
+
+    def record(self, rel_path: str, digest: str) -> None:
+        with self._lock:
+            self.entries[rel_path] = digest
+
+    def remove(self, rel_path: str) -> None:
+        with self._lock:
+            self.entries.pop(rel_path, None)
+
+    def paths(self) -> List[str]:
+        with self._lock:
+            return list(self.entries)
+
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps(self.entries, sort_keys=True)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class PipelineStats:
+    """Counts for one pipeline run."""
+
+    scanned: int = 0
+    unchanged: int = 0
+    ingested: int = 0
+    deleted: int = 0
+    failed: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.scanned / self.seconds if self.seconds > 0 else 0.0
+
+
+def _chunk_document(job: ChunkJob) -> List[Dict[str, Any]]:
+    # Runs in a worker process.
+    return extract_document_chunks(job.file_path or job.rel_path, source=job.rel_path, data=job.data, commit=job.commit)
+
+
+class IngestionPipeline:
+    """
+    Ingests a repository as a staged, parallel, incremental pipeline.
+
+    walk -> hash (thread pool) -> skip files unchanged since the manifest ->
+    partition/chunk documents (process pool) -> batch-import to Weaviate
+    (importer thread behind a bounded queue). Each stage holds a bounded
+    number of items in flight, so memory stays flat and a slow Weaviate
+    throttles chunking instead of letting results pile up.
+
+    `run_commit` feeds the same stages from a Git commit instead of the
+    working tree: blob SHAs replace content hashes, and a commit range
+    yields the changed paths directly.
+    """
+
+    def __init__(
+        self,
+        weaviate_manager: L2Weaviate,
+        manifest_path: str,
+        workers: Optional[int] = None,
+        hash_workers: int = 8,
+        batch_size: int = 100,
+        queue_size: int = 64,
+        checkpoint_every: int = 500,
+        import_workers: int = 4,
+    ):
+        """
+        Args:
+            weaviate_manager: The Weaviate layer objects are imported into.
+            manifest_path: Where the manifest/checkpoint is kept.
+            workers: Processes used to partition and chunk documents. Defaults to the CPU count.
+            hash_workers: Threads used to read and hash files.
+            batch_size: Objects per Weaviate batch import.
+            queue_size: Chunked files allowed to wait for the importer.
+            checkpoint_every: Files recorded between manifest flushes.
+            import_workers: Concurrent Weaviate batch requests.
+        """
+        self.weaviate_manager = weaviate_manager
+        self.manifest = IngestManifest(manifest_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.hash_workers = hash_workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.checkpoint_every = checkpoint_every
+        self.import_workers = import_workers
+        # Files are recorded from both the main thread and the importer thread.
+        self._record_lock = threading.Lock()
+
+    def run(self, repo_path: str) -> PipelineStats:
+        """
+        Ingests every new or changed supported file under `repo_path`.
+
+        Once the walk completes, objects for manifest paths it did not find
+        are removed, as `run_commit` does for paths no longer in the commit.
+        """
+        stats = PipelineStats()
+        self._execute(lambda hash_pool: self._changed_files(repo_path, hash_pool, stats), stats)
+        return stats
+
+    def run_commit(self, l3: L3Git, commit: str = "HEAD", since: Optional[str] = None) -> PipelineStats:
+        """
+        Ingests files straight from the blobs of a commit.
+
+        Args:
+            l3: The Git layer to read trees and blobs from.
+            commit: The commit to ingest.
+            since: If given, only paths added or modified in `since..commit`
+                   are ingested, and objects for paths deleted in the range
+                   are removed. Otherwise every path whose blob differs from
+                   the manifest is ingested, and paths no longer in the
+                   commit are removed.
+
+        Raises:
+            ValueError: If a commit does not exist.
+        """
+        resolved = l3.resolve_commit(commit)
+        index = l3.get_tree_index(resolved) if resolved else None
+        if index is None:
+            raise ValueError(f"Commit '{commit}' does not exist.")
+        extensions = CODE_EXTENSIONS | DOCUMENT_EXTENSIONS
+
+        if since is not None:
+            if l3.resolve_commit(since) is None:
+                raise ValueError(f"Commit '{since}' does not exist.")
+            changes = l3.diff_paths(since, resolved)
+            removed = [path for path, status in changes.items() if status == "D"]
+            candidates = [path for path, status in changes.items() if status != "D"]
+        else:
+            removed = [path for path in self.manifest.paths() if path not in index]
+            candidates = list(index)
+        logger.info(f"Ingesting commit {resolved[:7]}: {len(candidates)} candidate paths, {len(removed)} removed.")
+
+        stats = PipelineStats()
+        for rel_path in removed:
+            if os.path.splitext(rel_path)[1].lower() in extensions:
+                self._delete(rel_path, stats)
+        paths = [path for path in candidates if os.path.splitext(path)[1].lower() in extensions and path in index]
+        self._execute(lambda _: self._commit_files(l3, resolved, index, paths, stats), stats)
+        return stats
+
+    def _execute(self, make_jobs: Callable[[Executor], Iterable[ChunkJob]], stats: PipelineStats) -> None:
+        start = time.perf_counter()
+        imports: "queue.Queue[Optional[ChunkedFile]]" = queue.Queue(maxsize=self.queue_size)
+        importer = threading.Thread(target=self._import_loop, args=(imports, stats), name="weaviate_importer")
+        importer.start()
+        try:
+            with ThreadPoolExecutor(self.hash_workers, thread_name_prefix="ingest_hash") as hash_pool, \
+                    ProcessPoolExecutor(self.workers) as chunk_pool:
+                for job, future in bounded_map(chunk_pool, _chunk_document, make_jobs(hash_pool), self.workers * 2):
+                    if future.exception() is not None:
+                        logger.error(f"Failed to chunk {job.rel_path}: {future.exception()}")
+                        with self._record_lock:
+                            stats.failed += 1
+                        continue
+                    # Blocks while the importer is behind: backpressure on chunking.
+                    imports.put((job, future.result()))
+        finally:
+            imports.put(None)
+            importer.join()
+            self.manifest.save()
+        stats.seconds = time.perf_counter() - start
+        logger.info(
+            f"Ingestion finished in {stats.seconds:.1f}s: {stats.scanned} scanned, {stats.unchanged} unchanged, "
+            f"{stats.ingested} ingested ({stats.chunks} chunks), {stats.deleted} deleted, {stats.failed} failed."
+        )
+
+    def _changed_files(self, repo_path: str, hash_pool: Executor, stats: PipelineStats) -> Iterator[ChunkJob]:
+        """Hashes working-tree files and yields a job for every document that changed."""
+        seen = set()
+        paths = ((os.path.join(repo_path, rel_path), rel_path) for rel_path in walk_repository(repo_path))
+        for (file_path, rel_path), future in bounded_map(hash_pool, lambda p: hash_file(p[0]), paths, self.hash_workers * 4):
+            seen.add(rel_path)
+            stats.scanned += 1
+            if future.exception() is not None:
+                logger.error(f"Failed to read {rel_path}: {future.exception()}")
+                with self._record_lock:
+                    stats.failed += 1
+                continue
+            digest = future.result()
+            if self.manifest.is_current(rel_path, digest):
+                stats.unchanged += 1
+                continue
+            if os.path.splitext(rel_path)[1].lower() in CODE_EXTENSIONS:
+                process_code_file(file_path, self.weaviate_manager)
+                self._record(rel_path, digest, stats)
+                continue
+            yield ChunkJob(rel_path, digest, replace=rel_path in self.manifest.entries, file_path=file_path)
+        # Only reached when the whole tree was walked, so a partial walk never deletes anything.
+        for rel_path in [path for path in self.manifest.paths() if path not in seen]:
+            self._delete(rel_path, stats)
+
+    def _commit_files(self, l3: L3Git, commit: str, index: Dict[str, str], paths: List[str], stats: PipelineStats) -> Iterator[ChunkJob]:
+        """Reads changed blobs of a commit and yields a job for every document among them."""
+        for rel_path in paths:
+            stats.scanned += 1
+            blob_sha = index[rel_path]
+            if self.manifest.is_current(rel_path, blob_sha):
+                stats.unchanged += 1
+                continue
+            if os.path.splitext(rel_path)[1].lower() in CODE_EXTENSIONS:
+                process_code_file(rel_path, self.weaviate_manager)
+                self._record(rel_path, blob_sha, stats)
+                continue
+            # GitPython's object database is not thread-safe, so blobs are read here, in order.
+            data = l3.get_blob(blob_sha)
+            if data is None:
+                logger.error(f"Blob {blob_sha[:7]} for {rel_path} is missing.")
+                with self._record_lock:
+                    stats.failed += 1
+                continue
+            yield ChunkJob(rel_path, blob_sha, replace=True, data=data, commit=commit)
+
+    def _import_loop(self, imports: "queue.Queue[Optional[ChunkedFile]]", stats: PipelineStats) -> None:
+        buffer: List[Dict[str, Any]] = []
+        uuids: List[str] = []
+        files: List[ChunkJob] = []
+        while True:
+            item = imports.get()
+            if item is not None:
+                job, objects = item
+                buffer.extend(objects)
+                uuids.extend(deterministic_uuid(job.rel_path, index) for index in range(len(objects)))
+                files.append(job)
+            # Flush on file boundaries only, so a file is recorded only once all of its objects are in.
+            # Enough objects for every import worker to send a full batch.
+            if buffer and (len(buffer) >= self.batch_size * self.import_workers or item is None):
+                self._flush(buffer, uuids, files, stats)
+                buffer, uuids, files = [], [], []
+            elif not buffer and files:
+                # Files without any chunks are done once their old objects are gone.
+                self._flush([], [], files, stats)
+                files = []
+            if item is None:
+                return
+
+    def _flush(self, objects: List[Dict[str, Any]], uuids: List[str], files: List[ChunkJob], stats: PipelineStats) -> None:
+        failed_ids: set = set()
+        try:
+            # Deterministic IDs replace re-imported chunks, but a file that shrank
+            # would keep its trailing chunks, so changed files are cleared first.
+            for job in files:
+                if job.replace:
+                    self.weaviate_manager.delete_by_source("Document", job.rel_path)
+            if objects:
+                result = self.weaviate_manager.batch_import(
+                    "Document", objects, batch_size=self.batch_size, workers=self.import_workers, uuids=uuids
+                )
+                failed_ids = set(result.failed_ids)
+        except Exception as e:
+            logger.error(f"Batch import of {len(objects)} objects from {len(files)} files failed: {e}")
+            with self._record_lock:
+                stats.failed += len(files)
+            return
+        stats.chunks += len(objects) - len(failed_ids)
+        failed_sources = {obj["source"] for obj, object_id in zip(objects, uuids) if object_id in failed_ids}
+        for job in files:
+            if job.rel_path in failed_sources:
+                # Not recorded, so the next run retries the whole file.
+                logger.error(f"Some chunks of {job.rel_path} failed to import.")
+                with self._record_lock:
+                    stats.failed += 1
+                continue
+            self._record(job.rel_path, job.digest, stats)
+
+    def _delete(self, rel_path: str, stats: PipelineStats) -> None:
+        """Removes the objects and manifest entry of a path that no longer exists."""
+        try:
+            self.weaviate_manager.delete_by_source("Document", rel_path)
+        except Exception as e:
+            logger.error(f"Failed to delete objects for removed path {rel_path}: {e}")
+            with self._record_lock:
+                stats.failed += 1
+            return
+        # The importer may be recording other files at the same time.
+        with self._record_lock:
+            self.manifest.remove(rel_path)
+            stats.deleted += 1
+
+    def _record(self, rel_path: str, digest: str, stats: PipelineStats) -> None:
+        with self._record_lock:
+            self.manifest.record(rel_path, digest)
+            stats.ingested += 1
+            if stats.ingested % self.checkpoint_every == 0:
+                self.manifest.save()
@@ -1,10 +1,12 @@
+import io
 import os
 import logging
-from typing import Set
+from typing import Any, Dict, List, Optional, Set
 from unstructured.partition.auto import partition
 from unstructured.chunking.title import chunk_by_title
 
 from core.l2_weaviate import L2Weaviate
+from core.weaviate_importer import deterministic_uuid
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -25,32 +27,69 @@ def process_code_file(file_path: str, weaviate_manager: L2Weaviate) -> None:
         logger.error(f"Failed to process code file {file_path}: {e}")
 
 
+def extract_document_chunks(
+    file_path: str,
+    source: Optional[str] = None,
+    data: Optional[bytes] = None,
+    commit: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Partitions and chunks a document into Weaviate `Document` objects.
+
+    This is pure CPU work with no client state, so it can run in a worker
+    process.
+
+    Args:
+        file_path: The document's path. Only used for type detection when `data` is given.
+        source: The value stored as the chunks' `source`. Defaults to the file name.
+        data: The document's content, e.g. a Git blob. Read from `file_path` when omitted.
+        commit: The commit the content was read from, stored on every chunk.
+    """
+    if data is not None:
+        elements = partition(file=io.BytesIO(data), metadata_filename=file_path, strategy="auto")
+    else:
+        elements = partition(filename=file_path, strategy="auto")
+    chunks = chunk_by_title(
+        elements,
+        max_characters=1024,
+        combine_under_n_chars=512,
+        new_after_n_chars=2048,
+    )
+    objects = [
+        {
+            "source": source or os.path.basename(file_path),
+            "content": str(chunk),
+            "document_type": os.path.splitext(file_path)[1],
+        }
+        for chunk in chunks
+    ]
+    if commit is not None:
+        for obj in objects:
+            obj["commit"] = commit
+    return objects
+
+
+def _import_chunks(weaviate_manager: L2Weaviate, weaviate_objects: List[Dict[str, Any]], file_path: str) -> None:
+    # Chunk IDs derive from the file's absolute path and position, so re-ingesting a file replaces
+    # its chunks. `source` is only the file name here and would collide across directories.
+    key = os.path.abspath(file_path)
+    uuids = [deterministic_uuid(key, index) for index in range(len(weaviate_objects))]
+    result = weaviate_manager.batch_import("Document", weaviate_objects, uuids=uuids)
+    if result.failed_ids:
+        logger.error(f"Failed to store {len(result.failed_ids)} of {result.total} chunks from {file_path}.")
+    else:
+        logger.info(f"Successfully processed and stored {result.succeeded} chunks from {file_path}.")
+
+
 def process_document_file(file_path: str, weaviate_manager: L2Weaviate) -> None:
     """Process generic documents using unstructured."""
     logger.info(f"[ROUTING: DOCUMENT] -> Unstructured for: {file_path}")
     try:
-        elements = partition(filename=file_path, strategy="auto")
-        chunks = chunk_by_title(
-            elements,
-            max_characters=1024,
-            combine_under_n_chars=512,
-            new_after_n_chars=2048,
-        )
-        weaviate_objects = [
-            {
-                "source": os.path.basename(file_path),
-                "content": str(chunk),
-                "document_type": os.path.splitext(file_path)[1],
-            }
-            for chunk in chunks
-        ]
+        weaviate_objects = extract_document_chunks(file_path)
         if not weaviate_objects:
             logger.warning(f"No content chunks extracted from {file_path}. Skipping storage.")
             return
-        weaviate_manager.batch_import("Document", weaviate_objects)
-        logger.info(
-            f"Successfully processed and stored {len(weaviate_objects)} chunks from {file_path}."
-        )
+        _import_chunks(weaviate_manager, weaviate_objects, file_path)
     except Exception as e:
         logger.error(f"Failed to process document file {file_path}: {e}")
 
@@ -69,3 +108,4 @@ def ingest_file(file_path: str, weaviate_manager: L2Weaviate) -> None:
         process_document_file(file_path, weaviate_manager)
     else:
         logger.warning(f"Unsupported file type: '{extension}'. Skipping {file_path}")
+
@@ -0,0 +1,93 @@
+# core/invalidation.py
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, List, Optional
+
+from .l1_redis import L1Redis
+from .exceptions import MemoryLayerError
+
+
+class L0InvalidationBus:
+    """
+    Propagates L0 invalidations between replicas over Redis pub/sub.
+
+    Every replica keeps its own in-process L0. When one replica writes a key it
+    publishes the key on a shared channel and every other replica evicts it
+    from its local L0, so a larger L0 no longer means longer staleness. If the
+    subscription drops, invalidations may have been missed, so the local L0 is
+    cleared before listening again.
+    """
+
+    def __init__(self, l1: L1Redis, l0: Any, channel: str = "sentinel:l0:invalidate"):
+        """
+        Args:
+            l1: The connected L1 client whose pool is used for pub/sub.
+            l0: The local L0 cache to evict from. Must provide `delete` and `clear`.
+            channel: The pub/sub channel shared by all replicas.
+        """
+        self.l1 = l1
+        self.l0 = l0
+        self.channel = channel
+        # Lets a replica ignore the echo of its own invalidations.
+        self.origin = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Starts the background subscriber task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+            logging.info(f"L0 invalidation bus listening on channel '{self.channel}'.")
+
+    async def close(self) -> None:
+        """Stops the background subscriber task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def publish(self, keys: List[str]) -> None:
+        """Asks every other replica to evict `keys` from its L0."""
+        if not keys:
+            return
+        message = json.dumps({"origin": self.origin, "keys": keys})
+        try:
+            await self.l1.publish(self.channel, message)
+        except MemoryLayerError as e:
+            logging.warning(f"Failed to publish L0 invalidation for {len(keys)} keys: {e}")
+
+    def handle_message(self, data: Any) -> None:
+        """Applies one invalidation message to the local L0."""
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            logging.warning(f"Ignoring malformed L0 invalidation message: {data!r}")
+            return
+        if payload.get("origin") == self.origin:
+            return
+        for key in payload.get("keys", []):
+            self.l0.delete(key)
+
+    async def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                pubsub = self.l1.pubsub()
+                try:
+                    await pubsub.subscribe(self.channel)
+                    backoff = 0.5
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self.handle_message(message["data"])
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"L0 invalidation subscription lost: {e}. Clearing L0 and retrying in {backoff:.1f}s.")
+                # Invalidations published while disconnected are lost for good.
+                self.l0.clear()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
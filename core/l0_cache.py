@@ -1,8 +1,20 @@
 # core/l0_cache.py
 
+import itertools
+import random
+import sys
+from collections import OrderedDict
 from cachetools import LRUCache
-from threading import RLock
-from typing import Any, Optional, Hashable
+from threading import Lock, RLock
+from typing import Any, Dict, List, Optional, Hashable, Tuple, Union
+
+from .metrics import (
+    l0_cache_hits_total,
+    l0_cache_misses_total,
+    l0_cache_evictions_total,
+    l0_cache_rejections_total,
+    l0_cache_bytes,
+)
 
 class L0Cache:
     """
@@ -51,6 +63,11 @@ class L0Cache:
         with self.lock:
             self.cache[key] = value
 
+    def delete(self, key: Hashable) -> None:
+        """Removes a key from the cache if present. This operation is thread-safe."""
+        with self.lock:
+            self.cache.pop(key, None)
+
     def clear(self) -> None:
         """Clears the entire cache. This operation is thread-safe."""
         with self.lock:
@@ -60,3 +77,374 @@ class L0Cache:
         """Returns the current number of items in the cache."""
         with self.lock:
             return len(self.cache)
+
+
+class FrequencySketch:
+    """
+    A count-min sketch of recent access frequencies, as used by TinyLFU.
+
+    Four rows of 4-bit saturating counters estimate how often a key has been
+    seen. Every `sample_size` increments all counters are halved, so the
+    sketch tracks recent popularity rather than all-time counts.
+    """
+
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+
+    def __init__(self, width: int = 4096):
+        self._width = 1 << max(4, (width - 1).bit_length())
+        self._mask = self._width - 1
+        self._rows = [bytearray(self._width) for _ in self._SEEDS]
+        self._additions = 0
+        self._sample_size = 10 * self._width
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return [((h * seed) & 0xFFFFFFFFFFFFFFFF) >> 32 & self._mask for seed in self._SEEDS]
+
+    def increment(self, key: Hashable) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        self._rows = [bytearray(count >> 1 for count in row) for row in self._rows]
+        self._additions //= 2
+
+
+class SizedL0Cache:
+    """
+    A thread-safe, byte-budgeted L0 cache with W-TinyLFU admission.
+
+    Entries are sized on insert and the cache is bounded by total bytes rather
+    than item count. New entries land in a small LRU window; entries leaving
+    the window must beat the main segment's eviction victims on estimated
+    access frequency to be admitted. One-off scans of large files therefore
+    pass through the window without flushing the hot set. The main segment is
+    a segmented LRU (probation + protected) as in W-TinyLFU.
+    """
+
+    def __init__(self, max_bytes: int, window_ratio: float = 0.01, protected_ratio: float = 0.8):
+        """
+        Args:
+            max_bytes: The total byte budget for all cached values.
+            window_ratio: The share of the budget reserved for the admission window.
+            protected_ratio: The share of the main segment reserved for entries hit at least twice.
+        """
+        if max_bytes <= 0:
+            raise ValueError("SizedL0Cache max_bytes must be a positive integer.")
+        self.max_bytes = max_bytes
+        self.window_budget = max(1, int(max_bytes * window_ratio))
+        self.main_budget = max_bytes - self.window_budget
+        self.protected_budget = int(self.main_budget * protected_ratio)
+
+        self._window: OrderedDict = OrderedDict()
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+        self._window_bytes = 0
+        self._probation_bytes = 0
+        self._protected_bytes = 0
+        self.sketch = FrequencySketch()
+        self.lock = RLock()
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        """
+        Estimates the bytes held by a value, including everything a container holds.
+
+        `sys.getsizeof` alone only counts a dict's or list's own slots, so a
+        node dict holding megabytes of text would be charged a few hundred
+        bytes. Objects shared within the value are counted once.
+        """
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return len(value)
+        seen = set()
+        total = 0
+        stack = [value]
+        while stack:
+            item = stack.pop()
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            total += sys.getsizeof(item)
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                stack.extend(item)
+        return total
+
+    @property
+    def size_bytes(self) -> int:
+        """Returns the current number of bytes held by the cache."""
+        return self._window_bytes + self._probation_bytes + self._protected_bytes
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retrieves a value from the cache by its key and records the access in
+        the frequency sketch. This operation is thread-safe.
+        """
+        with self.lock:
+            self.sketch.increment(key)
+            if key in self._window:
+                self._window.move_to_end(key)
+                value = self._window[key][0]
+            elif key in self._protected:
+                self._protected.move_to_end(key)
+                value = self._protected[key][0]
+            elif key in self._probation:
+                # A second hit promotes the entry to the protected segment.
+                value, size = self._probation.pop(key)
+                self._probation_bytes -= size
+                self._protected[key] = (value, size)
+                self._protected_bytes += size
+                self._demote_protected()
+            else:
+                l0_cache_misses_total.inc()
+                return None
+        l0_cache_hits_total.inc()
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Sets a value in the cache, subject to the byte budget and admission
+        policy. This operation is thread-safe.
+        """
+        size = self._sizeof(value)
+        with self.lock:
+            self._remove(key)
+            if size > self.main_budget:
+                l0_cache_rejections_total.inc()
+            else:
+                self.sketch.increment(key)
+                self._window[key] = (value, size)
+                self._window_bytes += size
+                while self._window_bytes > self.window_budget and self._window:
+                    candidate, (c_value, c_size) = self._window.popitem(last=False)
+                    self._window_bytes -= c_size
+                    self._admit(candidate, c_value, c_size)
+            l0_cache_bytes.set(self.size_bytes)
+
+    def delete(self, key: Hashable) -> None:
+        """Removes a key from the cache if present. This operation is thread-safe."""
+        with self.lock:
+            self._remove(key)
+            l0_cache_bytes.set(self.size_bytes)
+
+    def _admit(self, key: Hashable, value: Any, size: int) -> None:
+        """Moves a window evictee into probation if it beats the victims it would displace."""
+        needed = self._probation_bytes + self._protected_bytes + size - self.main_budget
+        victims: List[Tuple[OrderedDict, Hashable]] = []
+        freed = 0
+        for segment in (self._probation, self._protected):
+            for victim_key, (_, victim_size) in segment.items():
+                if freed >= needed:
+                    break
+                victims.append((segment, victim_key))
+                freed += victim_size
+        if victims:
+            candidate_freq = self.sketch.estimate(key)
+            if any(self.sketch.estimate(victim_key) >= candidate_freq for _, victim_key in victims):
+                l0_cache_rejections_total.inc()
+                return
+            for segment, victim_key in victims:
+                _, victim_size = segment.pop(victim_key)
+                if segment is self._probation:
+                    self._probation_bytes -= victim_size
+                else:
+                    self._protected_bytes -= victim_size
+            l0_cache_evictions_total.inc(len(victims))
+        self._probation[key] = (value, size)
+        self._probation_bytes += size
+
+    def _demote_protected(self) -> None:
+        while self._protected_bytes > self.protected_budget and self._protected:
+            key, (value, size) = self._protected.popitem(last=False)
+            self._protected_bytes -= size
+            self._probation[key] = (value, size)
+            self._probation_bytes += size
+
+    def _remove(self, key: Hashable) -> None:
+        for segment, attr in ((self._window, "_window_bytes"), (self._probation, "_probation_bytes"), (self._protected, "_protected_bytes")):
+            entry = segment.pop(key, None)
+            if entry is not None:
+                setattr(self, attr, getattr(self, attr) - entry[1])
+                return
+
+    def clear(self) -> None:
+        """Clears the entire cache. This operation is thread-safe."""
+        with self.lock:
+            for segment in (self._window, self._probation, self._protected):
+                segment.clear()
+            self._window_bytes = self._probation_bytes = self._protected_bytes = 0
+            l0_cache_bytes.set(0)
+
+    def __len__(self) -> int:
+        """Returns the current number of items in the cache."""
+        with self.lock:
+            return len(self._window) + len(self._probation) + len(self._protected)
+
+
+class _SampledLRUShard:
+    """
+    One segment of a `ShardedL0Cache` with approximate LRU eviction.
+
+    Reads never take the lock: a dict lookup is atomic and the access stamp is
+    a single list-item store. Writes lock the shard and, when it is full, evict
+    the stalest of a few randomly sampled entries (the same trade-off Redis
+    makes with `maxmemory-policy allkeys-lru`).
+    """
+
+    __slots__ = ("maxsize", "sample_size", "data", "keys", "lock")
+
+    def __init__(self, maxsize: int, sample_size: int):
+        self.maxsize = maxsize
+        self.sample_size = sample_size
+        # key -> [value, last access stamp, position in `keys`]
+        self.data: Dict[Hashable, list] = {}
+        self.keys: List[Hashable] = []
+        self.lock = Lock()
+
+    def get(self, key: Hashable, stamp: int) -> Optional[Any]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        entry[1] = stamp
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, stamp: int) -> None:
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is not None:
+                entry[0] = value
+                entry[1] = stamp
+                return
+            if len(self.keys) >= self.maxsize:
+                self._evict_one()
+            self.data[key] = [value, stamp, len(self.keys)]
+            self.keys.append(key)
+
+    def delete(self, key: Hashable) -> None:
+        with self.lock:
+            if key in self.data:
+                self._remove(key)
+
+    def _evict_one(self) -> None:
+        sample = (self.keys[random.randrange(len(self.keys))] for _ in range(self.sample_size))
+        self._remove(min(sample, key=lambda k: self.data[k][1]))
+
+    def _remove(self, key: Hashable) -> None:
+        position = self.data.pop(key)[2]
+        last = self.keys.pop()
+        if position < len(self.keys):
+            self.keys[position] = last
+            self.data[last][2] = position
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+            self.keys.clear()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class _ExactLRUShard:
+    """One segment of a `ShardedL0Cache` with exact LRU order under its own lock."""
+
+    __slots__ = ("cache", "lock")
+
+    def __init__(self, maxsize: int):
+        self.cache: LRUCache[Hashable, Any] = LRUCache(maxsize=maxsize)
+        self.lock = Lock()
+
+    def get(self, key: Hashable, stamp: int) -> Optional[Any]:
+        with self.lock:
+            return self.cache.get(key)
+
+    def set(self, key: Hashable, value: Any, stamp: int) -> None:
+        with self.lock:
+            self.cache[key] = value
+
+    def delete(self, key: Hashable) -> None:
+        with self.lock:
+            self.cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cache.clear()
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+class ShardedL0Cache:
+    """
+    A thread-safe L0 cache split into independently locked segments.
+
+    Keys are routed to a shard by hash, so threads touching different keys
+    rarely contend on the same lock. With `approximate=True` (the default)
+    shards use sampled LRU eviction and reads take no lock at all; with
+    `approximate=False` each shard is an exact `LRUCache` behind its own lock.
+    """
+
+    def __init__(self, maxsize: int = 10000, shards: int = 16, approximate: bool = True, sample_size: int = 5):
+        """
+        Args:
+            maxsize: The maximum number of items across all shards.
+            shards: The number of segments. Rounded up to a power of two.
+            approximate: Whether to use lock-free reads with sampled LRU eviction.
+            sample_size: How many entries to sample per eviction in approximate mode.
+        """
+        if maxsize <= 0:
+            raise ValueError("ShardedL0Cache maxsize must be a positive integer.")
+        count = 1 << max(0, (shards - 1).bit_length())
+        per_shard = max(1, -(-maxsize // count))
+        self._mask = count - 1
+        self._shards: List[Union[_SampledLRUShard, _ExactLRUShard]] = [
+            _SampledLRUShard(per_shard, sample_size) if approximate else _ExactLRUShard(per_shard)
+            for _ in range(count)
+        ]
+        # next() on itertools.count is atomic under the GIL, so it is a cheap
+        # process-wide logical clock for access stamps.
+        self._clock = itertools.count()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retrieves a value from the cache by its key. This operation is thread-safe."""
+        return self._shards[hash(key) & self._mask].get(key, next(self._clock))
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Sets a value in the cache. This operation is thread-safe."""
+        self._shards[hash(key) & self._mask].set(key, value, next(self._clock))
+
+    def delete(self, key: Hashable) -> None:
+        """Removes a key from the cache if present. This operation is thread-safe."""
+        self._shards[hash(key) & self._mask].delete(key)
+
+    def clear(self) -> None:
+        """Clears the entire cache. This operation is thread-safe."""
+        for shard in self._shards:
+            shard.clear()
+
+    def __len__(self) -> int:
+        """Returns the current number of items in the cache."""
+        return sum(len(shard) for shard in self._shards)
+
+
+def build_l0_cache(max_items: int, max_bytes: int = 0, shards: int = 1, approximate: bool = True):
+    """
+    Creates the L0 implementation selected by configuration.
+
+    A positive `max_bytes` selects the byte-budgeted `SizedL0Cache`; otherwise
+    more than one shard selects `ShardedL0Cache`; otherwise the plain `L0Cache`.
+    """
+    if max_bytes > 0:
+        return SizedL0Cache(max_bytes)
+    if shards > 1:
+        return ShardedL0Cache(max_items, shards=shards, approximate=approximate)
+    return L0Cache(max_items)
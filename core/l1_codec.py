@@ -0,0 +1,126 @@
+# core/l1_codec.py
+
+import logging
+import zlib
+from typing import Any, Optional
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except Exception:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+# Encoded values start with MARKER followed by one codec id byte. Values written
+# before the codec layer existed carry no header and are returned unchanged.
+MARKER = b"\x00"
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_LZ4 = 2
+CODEC_ZSTD = 3
+CODEC_ZSTD_DICT = 4
+
+CODEC_IDS = {"none": CODEC_NONE, "zlib": CODEC_ZLIB, "lz4": CODEC_LZ4, "zstd": CODEC_ZSTD}
+
+
+class CodecError(Exception):
+    """Raised when a stored value carries a codec header but cannot be decoded."""
+    pass
+
+
+class L1Codec:
+    """
+    Compresses L1 values behind a two-byte header identifying the codec.
+
+    Values smaller than `min_size`, and values that do not shrink, are stored
+    raw. With the zstd codec an optional dictionary trained on the ingested
+    repository (see `tools/train_zstd_dict.py`) greatly improves the ratio for
+    small source files.
+    """
+
+    def __init__(self, codec: str = "none", min_size: int = 1024, level: int = 3, zstd_dict_path: Optional[str] = None):
+        """
+        Args:
+            codec: One of "none", "zlib", "lz4" or "zstd". Unavailable optional
+                   codecs fall back to zlib.
+            min_size: Values shorter than this many bytes are never compressed.
+            level: The compression level passed to the codec.
+            zstd_dict_path: Optional path to a trained zstd dictionary.
+        """
+        if codec not in CODEC_IDS:
+            raise ValueError(f"Unknown L1 codec '{codec}'. Expected one of {sorted(CODEC_IDS)}.")
+        if (codec == "zstd" and zstandard is None) or (codec == "lz4" and lz4_frame is None):
+            logging.warning(f"L1 codec '{codec}' is not installed. Falling back to zlib.")
+            codec = "zlib"
+        self.codec_id = CODEC_IDS[codec]
+        self.min_size = min_size
+        self.level = level
+
+        self._zstd_dict = None
+        if zstandard is not None:
+            if zstd_dict_path:
+                with open(zstd_dict_path, "rb") as f:
+                    self._zstd_dict = zstandard.ZstdCompressionDict(f.read())
+                logging.info(f"Loaded zstd dictionary {self._zstd_dict.dict_id()} for L1 values.")
+            # Decompressors are always available so values written by other
+            # replicas with a different codec setting remain readable.
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+            self._zstd_dict_decompressor = (
+                zstandard.ZstdDecompressor(dict_data=self._zstd_dict) if self._zstd_dict else None
+            )
+            if self.codec_id == CODEC_ZSTD:
+                self._zstd_compressor = zstandard.ZstdCompressor(level=level, dict_data=self._zstd_dict)
+        if self.codec_id == CODEC_ZSTD and self._zstd_dict is not None:
+            self.codec_id = CODEC_ZSTD_DICT
+
+    def encode(self, value: Any) -> bytes:
+        """Serializes a value for Redis, compressing it when worthwhile."""
+        if isinstance(value, str):
+            data = value.encode("utf-8")
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            data = bytes(value)
+        else:
+            data = str(value).encode("utf-8")
+
+        if self.codec_id != CODEC_NONE and len(data) >= self.min_size:
+            compressed = self._compress(data)
+            if len(compressed) + 2 < len(data):
+                return MARKER + bytes((self.codec_id,)) + compressed
+        if data[:1] == MARKER:
+            # Raw data that happens to start with the marker must be framed so
+            # it is not mistaken for an encoded value on the way back.
+            return MARKER + bytes((CODEC_NONE,)) + data
+        return data
+
+    def decode(self, data: Optional[bytes]) -> Optional[bytes]:
+        """Restores a value read from Redis. Unframed (legacy) values pass through."""
+        if data is None or data[:1] != MARKER or len(data) < 2:
+            return data
+        codec_id, payload = data[1], data[2:]
+        try:
+            if codec_id == CODEC_NONE:
+                return payload
+            if codec_id == CODEC_ZLIB:
+                return zlib.decompress(payload)
+            if codec_id == CODEC_LZ4 and lz4_frame is not None:
+                return lz4_frame.decompress(payload)
+            if codec_id == CODEC_ZSTD and zstandard is not None:
+                return self._zstd_decompressor.decompress(payload)
+            if codec_id == CODEC_ZSTD_DICT and self._zstd_dict_decompressor is not None:
+                return self._zstd_dict_decompressor.decompress(payload)
+        except Exception as e:
+            raise CodecError(f"Failed to decode L1 value with codec {codec_id}: {e}") from e
+        if codec_id > CODEC_ZSTD_DICT:
+            # Not one of our headers: a legacy raw value that starts with NUL.
+            return data
+        raise CodecError(f"L1 value uses codec {codec_id}, which is not available in this process.")
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec_id == CODEC_ZLIB:
+            return zlib.compress(data, self.level)
+        if self.codec_id == CODEC_LZ4:
+            return lz4_frame.compress(data, compression_level=self.level)
+        return self._zstd_compressor.compress(data)
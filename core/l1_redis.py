@@ -1,46 +1,74 @@
 # core/l1_redis.py
 
 import redis.asyncio as redis
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 import logging
 
 from .exceptions import MemoryLayerError
+from .l1_codec import L1Codec, CodecError
+
+# Deletes a lease only if it is still held by the caller's token.
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
 class L1Redis:
     """
     An asynchronous, connection-pooled Redis client for the L1 (Warm Cache)
     distributed cache layer. It is designed for high throughput and resilience.
+
+    The client is binary: values are returned as raw `bytes` and callers decode
+    only when they actually need text, so large file contents are never
+    transcoded on their way through the cache. Values pass through an
+    `L1Codec`, which may compress them.
     """
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, codec: Optional[L1Codec] = None):
         """
         Initializes the L1 Redis client configuration.
+
+        Args:
+            url: The Redis connection URL.
+            codec: The codec applied to stored values. Defaults to no compression.
         """
         self.url = url
+        self.codec = codec or L1Codec()
         self.pool: Optional[redis.Redis] = None
 
+    def _decode(self, key: str, value: Optional[bytes]) -> Optional[bytes]:
+        """Decodes a stored value, treating undecodable entries as cache misses."""
+        try:
+            return self.codec.decode(value)
+        except CodecError as e:
+            logging.warning(f"Discarding undecodable L1 value for key '{key}': {e}")
+            return None
+
     async def connect(self) -> None:
         """
         Establishes and verifies the connection pool to the Redis server.
         """
         try:
             logging.info(f"Connecting to L1 Redis at {self.url}...")
-            self.pool = redis.from_url(self.url, decode_responses=True)
+            self.pool = redis.from_url(self.url, decode_responses=False)
             await self.pool.ping()
             logging.info("L1 Redis connection established and verified successfully.")
         except Exception as e:
             raise MemoryLayerError(layer="L1-Redis", message=f"Failed to connect: {e}")
 
-    async def get(self, key: str) -> Optional[str]:
+    async def get(self, key: str) -> Optional[bytes]:
         """
         Asynchronously gets a value from Redis by key.
         """
         if self.pool is None:
             raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
         try:
-            return await self.pool.get(key)
+            value = await self.pool.get(key)
         except Exception as e:
             raise MemoryLayerError(layer="L1-Redis", message=f"GET operation failed for key '{key}': {e}")
+        return self._decode(key, value)
 
     async def set(self, key: str, value: Any, expire: Optional[int] = 3600) -> None:
         """
@@ -49,10 +77,110 @@ class L1Redis:
         if self.pool is None:
             raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
         try:
-            await self.pool.set(key, str(value), ex=expire)
+            await self.pool.set(key, self.codec.encode(value), ex=expire)
         except Exception as e:
             raise MemoryLayerError(layer="L1-Redis", message=f"SET operation failed for key '{key}': {e}")
 
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        """
+        Asynchronously gets many values in a single MGET round trip.
+        The result list is aligned with `keys`; missing keys map to None.
+        """
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        if not keys:
+            return []
+        try:
+            values = await self.pool.mget(keys)
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"MGET operation failed for {len(keys)} keys: {e}")
+        return [self._decode(key, value) for key, value in zip(keys, values)]
+
+    async def set_many(self, mapping: Dict[str, Any], expire: Optional[int] = 3600) -> None:
+        """
+        Asynchronously sets many values with one pipelined write. Each key gets
+        the same optional expiration.
+        """
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        if not mapping:
+            return
+        try:
+            async with self.pool.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, self.codec.encode(value), ex=expire)
+                await pipe.execute()
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"Pipelined SET failed for {len(mapping)} keys: {e}")
+
+    async def incr(self, key: str) -> int:
+        """Atomically increments an integer counter and returns its new value."""
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        try:
+            return int(await self.pool.incr(key))
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"INCR operation failed for key '{key}': {e}")
+
+    async def acquire_lease(self, key: str, token: str, ttl_ms: int) -> bool:
+        """
+        Tries to take a short-lived lease with SET NX PX.
+
+        Returns:
+            True if this caller now holds the lease, False if someone else does.
+        """
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        try:
+            return bool(await self.pool.set(key, token, nx=True, px=ttl_ms))
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"Lease acquisition failed for key '{key}': {e}")
+
+    async def release_lease(self, key: str, token: str) -> None:
+        """Releases a lease, unless it has already expired and been taken by someone else."""
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        try:
+            await self.pool.eval(_RELEASE_LEASE_SCRIPT, 1, key, token)
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"Lease release failed for key '{key}': {e}")
+
+    async def ttl(self, key: str) -> int:
+        """
+        Returns the remaining time to live of a key in seconds, -1 if it has
+        no expiry, or -2 if it does not exist.
+        """
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        try:
+            return await self.pool.ttl(key)
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"TTL operation failed for key '{key}': {e}")
+
+    async def exists(self, key: str) -> bool:
+        """Checks whether a key exists."""
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        try:
+            return bool(await self.pool.exists(key))
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"EXISTS operation failed for key '{key}': {e}")
+
+    async def publish(self, channel: str, message: str) -> None:
+        """Publishes a message on a Redis pub/sub channel."""
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        try:
+            await self.pool.publish(channel, message)
+        except Exception as e:
+            raise MemoryLayerError(layer="L1-Redis", message=f"PUBLISH failed on channel '{channel}': {e}")
+
+    def pubsub(self) -> "redis.client.PubSub":
+        """Returns a new pub/sub handle sharing the client's connection pool."""
+        if self.pool is None:
+            raise MemoryLayerError(layer="L1-Redis", message="Connection not initialized. Call connect() first.")
+        return self.pool.pubsub(ignore_subscribe_messages=True)
+
     async def close(self) -> None:
         """Gracefully closes the Redis connection pool."""
         if self.pool is not None:
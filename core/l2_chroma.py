@@ -1,11 +1,91 @@
 # core/l2_chroma.py
 
 import chromadb
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
+import hashlib
 import logging
 
+from .embeddings import EmbeddingService, default_embedding_service
 from .exceptions import MemoryLayerError
 
+# Metadata field recording the SHA-256 of a document's content, so bulk
+# writes can skip documents that have not changed.
+CONTENT_HASH_FIELD = "content_hash"
+
+
+def content_hash(text: str) -> str:
+    """Returns the hex SHA-256 of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DocumentBatcher:
+    """
+    Groups documents into batches of at most `batch_size` documents and about
+    `max_batch_bytes` of content. A single oversized document forms its own batch.
+
+    Documents are pushed in one at a time, so sync and async producers share
+    the same batching.
+    """
+
+    def __init__(self, batch_size: int, max_batch_bytes: int):
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self._batch: List[Dict[str, Any]] = []
+        self._batch_bytes = 0
+
+    def add(self, document: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Adds a document and returns the batch it closed, if any."""
+        size = len(document["content"].encode("utf-8"))
+        full = None
+        if self._batch and (len(self._batch) >= self.batch_size or self._batch_bytes + size > self.max_batch_bytes):
+            full = self.flush()
+        self._batch.append(document)
+        self._batch_bytes += size
+        return full
+
+    def flush(self) -> Optional[List[Dict[str, Any]]]:
+        """Returns the pending batch, if it holds any documents, and starts a new one."""
+        batch = self._batch or None
+        self._batch, self._batch_bytes = [], 0
+        return batch
+
+
+@dataclass
+class BulkUpsertResult:
+    """
+    The outcome of a bulk document upsert.
+
+    Attributes:
+        received: Documents read from the input.
+        upserted: Documents written to the collection.
+        skipped: Documents whose stored content hash already matched.
+        seconds: Wall-clock duration of the whole upsert.
+        batch_latencies: Duration of each batch write, in seconds.
+    """
+
+    received: int = 0
+    upserted: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    batch_latencies: List[float] = field(default_factory=list)
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.received / self.seconds if self.seconds > 0 else 0.0
+
+
+class ServiceEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Adapts the shared `EmbeddingService` to Chroma's embedding function protocol."""
+
+    def __init__(self, service: EmbeddingService):
+        self.service = service
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self.service.embed(input).tolist()
+
+
 class L2Chroma:
     """
     A production-ready client for the L2 semantic memory layer (RAG),
@@ -13,13 +93,23 @@ class L2Chroma:
     unstructured text data (like documentation) for semantic search.
     """
 
-    def __init__(self, path: str, collection_name: str = "project_documentation"):
+    def __init__(
+        self,
+        path: str,
+        collection_name: str = "project_documentation",
+        embedding_function: Optional[EmbeddingFunction] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+    ):
         """
         Initializes the ChromaDB client with persistent storage.
 
         Args:
             path: The file path for ChromaDB's persistent storage directory.
             collection_name: The name of the collection to use for documents.
+            embedding_function: The function used to embed documents and queries.
+                                Defaults to `embedding_service`.
+            embedding_service: The embedding service used when no `embedding_function` is
+                               given. Defaults to the process-wide shared service.
 
         Raises:
             MemoryLayerError: If the client cannot be initialized.
@@ -31,7 +121,12 @@ class L2Chroma:
             
             # get_or_create_collection is an idempotent operation, making it safe
             # to run on every application startup.
-            self.collection = self.client.get_or_create_collection(name=collection_name)
+            self.embedding_function = embedding_function or ServiceEmbeddingFunction(
+                embedding_service or default_embedding_service()
+            )
+            self.collection = self.client.get_or_create_collection(
+                name=collection_name, embedding_function=self.embedding_function
+            )
             logging.info(f"L2 ChromaDB connection established. Using collection: '{collection_name}'.")
         except Exception as e:
             raise MemoryLayerError(
@@ -57,7 +152,7 @@ class L2Chroma:
             self.collection.upsert(
                 ids=[doc_id],
                 documents=[content],
-                metadatas=[metadata or {}]
+                metadatas=[self._with_hash(content, metadata)]
             )
             logging.debug(f"Upserted document with ID '{doc_id}' into ChromaDB.")
         except Exception as e:
@@ -93,3 +188,99 @@ class L2Chroma:
                 layer="L2-Chroma",
                 message=f"Query failed for text '{query_text[:50]}...': {e}"
             ) from e
+
+    def upsert_documents(
+        self, doc_ids: List[str], contents: List[str], metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Adds or updates many documents in a single `upsert` call.
+
+        Raises:
+            MemoryLayerError: If the batch cannot be written.
+        """
+        if not doc_ids:
+            return
+        try:
+            self.collection.upsert(
+                ids=doc_ids,
+                documents=contents,
+                metadatas=[
+                    self._with_hash(content, metadata)
+                    for content, metadata in zip(contents, metadatas or [None] * len(doc_ids))
+                ],
+            )
+            logging.debug(f"Upserted {len(doc_ids)} documents into ChromaDB.")
+        except Exception as e:
+            raise MemoryLayerError(
+                layer="L2-Chroma",
+                message=f"Failed to upsert a batch of {len(doc_ids)} documents: {e}"
+            ) from e
+
+    def query_many(self, query_texts: List[str], n_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Runs several queries in one `collection.query` call.
+
+        Returns:
+            One result dictionary per query text, in the same shape as `query`.
+
+        Raises:
+            MemoryLayerError: If the query operation fails.
+        """
+        try:
+            results = self.collection.query(query_texts=query_texts, n_results=n_results)
+        except Exception as e:
+            raise MemoryLayerError(
+                layer="L2-Chroma",
+                message=f"Query failed for a batch of {len(query_texts)} texts: {e}"
+            ) from e
+        return [
+            {key: ([value[i]] if isinstance(value, list) else value) for key, value in results.items()}
+            for i in range(len(query_texts))
+        ]
+
+    @staticmethod
+    def _with_hash(content: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # Also guarantees a non-empty metadata dict, which Chroma requires.
+        return {**(metadata or {}), CONTENT_HASH_FIELD: content_hash(content)}
+
+    def upsert_changed(self, documents: List[Dict[str, Any]]) -> int:
+        """
+        Upserts one batch of documents, skipping those whose stored content
+        hash matches. Each document is a dict with `id`, `content`, and
+        optional `metadata` and precomputed `embedding`.
+
+        Returns:
+            The number of documents written.
+
+        Raises:
+            MemoryLayerError: If the batch cannot be read or written.
+        """
+        # Chroma rejects duplicate IDs in one call; the last document for an ID wins.
+        latest = {document["id"]: document for document in documents}
+        hashes = {doc_id: content_hash(document["content"]) for doc_id, document in latest.items()}
+        try:
+            existing = self.collection.get(ids=list(latest), include=["metadatas"])
+            stored = {
+                doc_id: (metadata or {}).get(CONTENT_HASH_FIELD)
+                for doc_id, metadata in zip(existing["ids"], existing["metadatas"])
+            }
+            changed = [document for doc_id, document in latest.items() if stored.get(doc_id) != hashes[doc_id]]
+
+            # Documents with and without precomputed embeddings need separate calls.
+            with_embeddings = [document for document in changed if document.get("embedding") is not None]
+            without_embeddings = [document for document in changed if document.get("embedding") is None]
+            for group in (with_embeddings, without_embeddings):
+                if not group:
+                    continue
+                self.collection.upsert(
+                    ids=[document["id"] for document in group],
+                    documents=[document["content"] for document in group],
+                    metadatas=[{**(document.get("metadata") or {}), CONTENT_HASH_FIELD: hashes[document["id"]]} for document in group],
+                    embeddings=[document["embedding"] for document in group] if group is with_embeddings else None,
+                )
+        except Exception as e:
+            raise MemoryLayerError(
+                layer="L2-Chroma",
+                message=f"Failed to upsert a batch of {len(latest)} documents: {e}"
+            ) from e
+        return len(changed)
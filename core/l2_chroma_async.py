@@ -0,0 +1,98 @@
+# core/l2_chroma_async.py
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .coalesce import MicroBatcher
+from .l2_chroma import L2Chroma
+
+# (document id, content, metadata) as queued for a batched upsert.
+PendingDocument = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class AsyncL2Chroma:
+    """
+    A non-blocking, batching facade over the L2 Chroma layer.
+
+    Chroma calls run in a thread pool of their own, so slow embedding or
+    index work never competes with Git and Redis offloads for threads.
+    Concurrent searches with the same `n_results` are merged into one
+    multi-query `collection.query` call and concurrent writes into one
+    `upsert`, which lets the embedding model process a whole batch per
+    forward pass.
+    """
+
+    def __init__(self, l2c: L2Chroma, max_threads: int = 4, max_batch: int = 64, batch_window_ms: float = 2.0):
+        """
+        Args:
+            l2c: The synchronous Chroma layer.
+            max_threads: Threads dedicated to Chroma calls.
+            max_batch: The number of queued queries or documents that triggers a flush.
+            batch_window_ms: How long a batch waits for more callers before it is flushed.
+        """
+        self.l2c = l2c
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000
+        self._pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="chroma_worker")
+        # One query batcher per result count, since a Chroma call takes a single n_results.
+        self._query_batchers: Dict[int, MicroBatcher[str, Dict[str, Any]]] = {}
+        self._upserts: MicroBatcher[PendingDocument, None] = MicroBatcher(
+            self._flush_upserts, max_batch=max_batch, max_delay=self.batch_window
+        )
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args))
+
+    async def query(self, query_text: str, n_results: int = 5) -> Dict[str, Any]:
+        """Async equivalent of `L2Chroma.query`, batched with concurrent queries."""
+        batcher = self._query_batchers.get(n_results)
+        if batcher is None:
+            batcher = MicroBatcher(
+                functools.partial(self._flush_queries, n_results),
+                max_batch=self.max_batch,
+                max_delay=self.batch_window,
+            )
+            self._query_batchers[n_results] = batcher
+        return await batcher.submit(query_text)
+
+    async def add_document(self, doc_id: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Async equivalent of `L2Chroma.add_document`, batched with concurrent writes."""
+        await self._upserts.submit((doc_id, content, metadata))
+
+    async def upsert_changed(self, documents: List[Dict[str, Any]]) -> int:
+        """Async equivalent of `L2Chroma.upsert_changed`, run on the Chroma thread pool."""
+        return await self._run(self.l2c.upsert_changed, documents)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embeds texts with the collection's embedding function, off the event loop."""
+        return await self._run(self.l2c.embedding_function, texts)
+
+    async def close(self) -> None:
+        """Flushes pending batches and stops the thread pool."""
+        await asyncio.gather(
+            self._upserts.close(),
+            *(batcher.close() for batcher in self._query_batchers.values()),
+        )
+        self._pool.shutdown(wait=True)
+
+    async def _flush_queries(self, n_results: int, query_texts: List[str]) -> List[Dict[str, Any]]:
+        # Identical texts in one batch are only searched once.
+        unique = list(dict.fromkeys(query_texts))
+        logging.debug(f"Running {len(unique)} batched Chroma queries for {len(query_texts)} callers.")
+        results = dict(zip(unique, await self._run(self.l2c.query_many, unique, n_results)))
+        return [results[text] for text in query_texts]
+
+    async def _flush_upserts(self, documents: List[PendingDocument]) -> List[None]:
+        # Chroma rejects duplicate IDs in one upsert; the last write for an ID wins.
+        latest = {doc_id: (content, metadata) for doc_id, content, metadata in documents}
+        await self._run(
+            self.l2c.upsert_documents,
+            list(latest),
+            [content for content, _ in latest.values()],
+            [metadata or {} for _, metadata in latest.values()],
+        )
+        return [None] * len(documents)
@@ -1,11 +1,16 @@
 # core/l2_weaviate.py
 
+import httpx
+import threading
 import weaviate
-from typing import Any, Dict, Optional, List
+from cachetools import TTLCache
+from typing import Any, Dict, Iterable, Optional, List, Sequence, Tuple
 from uuid import UUID
 import logging
 
+from .embeddings import EmbeddingService
 from .exceptions import MemoryLayerError
+from .weaviate_importer import BatchImporter, ImportResult
 
 class L2Weaviate:
     """
@@ -14,12 +19,29 @@ class L2Weaviate:
     data like Abstract Syntax Trees (ASTs) and their relationships.
     """
 
-    def __init__(self, url: str):
+    # IDs resolved per GraphQL request by `get_nodes_by_uuids`, and deleted per request by `delete_by_source`.
+    LOOKUP_CHUNK_SIZE = 100
+    # Candidates fetched per request by `delete_by_source`.
+    DELETE_PAGE_SIZE = 1000
+
+    def __init__(
+        self,
+        url: str,
+        node_cache_ttl: float = 30.0,
+        node_cache_size: int = 10000,
+        embedding_service: Optional[EmbeddingService] = None,
+        vector_property: str = "content",
+    ):
         """
         Initializes the Weaviate client and verifies the connection.
 
         Args:
             url: The URL for the Weaviate instance (e.g., "http://localhost:8080").
+            node_cache_ttl: Seconds a node fetched by ID is served from memory. 0 disables the cache.
+            node_cache_size: The maximum number of cached nodes.
+            embedding_service: Embeds objects and queries client-side, for classes
+                               created with `vectorizer: none`. Weaviate vectorizes otherwise.
+            vector_property: The text property embedded for each object.
 
         Raises:
             MemoryLayerError: If the connection to Weaviate cannot be established or
@@ -27,6 +49,17 @@ class L2Weaviate:
         """
         try:
             logging.info(f"Initializing L2 Weaviate client for URL: {url}")
+            self.url = url
+            self.embedding_service = embedding_service
+            self.vector_property = vector_property
+            # Created on the first batch import and shared by later ones.
+            self._http: Optional[httpx.Client] = None
+            # (class name, uuid) -> (requested properties, node). Reads and writes
+            # come from several threads, so the cache is guarded by a lock.
+            self._node_cache: Optional[TTLCache] = (
+                TTLCache(maxsize=node_cache_size, ttl=node_cache_ttl) if node_cache_ttl > 0 and node_cache_size > 0 else None
+            )
+            self._node_cache_lock = threading.Lock()
             # The Weaviate client manages its own connection pooling.
             self.client = weaviate.Client(url)
             if not self.client.is_ready():
@@ -52,11 +85,19 @@ class L2Weaviate:
             MemoryLayerError: If the object creation fails.
         """
         try:
+            text = data.get(self.vector_property)
+            vector = (
+                self.embedding_service.embed([text])[0].tolist()
+                if self.embedding_service is not None and isinstance(text, str) else None
+            )
             result_uuid = self.client.data_object.create(
                 data_object=data,
                 class_name=class_name,
-                uuid=uuid
+                uuid=uuid,
+                vector=vector
             )
+            # Writing to an existing ID replaces the node.
+            self._evict_nodes(class_name, [str(result_uuid)])
             return result_uuid
         except Exception as e:
             raise MemoryLayerError(
@@ -76,29 +117,102 @@ class L2Weaviate:
         Returns:
             The object's properties as a dictionary, or None if not found.
         """
-        try:
-            # The `with_where` filter is the standard way to perform key-based lookups.
-            result = self.client.query.get(
-                class_name, 
-                properties or ["*"] # Fetch all properties if none are specified
-            ).with_where({
-                "path": ["id"],
-                "operator": "Equal",
-                "valueString": uuid
-            }).with_limit(1).do()
-            
-            nodes = result.get("data", {}).get("Get", {}).get(class_name, [])
-            return nodes[0] if nodes else None
-        except Exception as e:
-            raise MemoryLayerError(
-                layer="L2-Weaviate", 
-                message=f"Failed to get node by UUID '{uuid}': {e}"
-            ) from e
+        return self.get_nodes_by_uuids([uuid], class_name, properties).get(str(uuid).lower())
+
+    def get_nodes_by_uuids(
+        self, uuids: Sequence[str], class_name: str, properties: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieves many nodes by UUID with as few requests as possible.
+
+        Nodes fetched within the last `node_cache_ttl` seconds are served from
+        memory; the rest are resolved `LOOKUP_CHUNK_SIZE` at a time with one
+        `ContainsAny` filter on `id` per GraphQL request.
+
+        Args:
+            uuids: The UUIDs to resolve. Duplicates are fetched once.
+            class_name: The class of the objects.
+            properties: A list of properties to return. If None, returns all properties.
+
+        Returns:
+            A mapping of lowercase UUID to the object's properties. UUIDs that were not found are absent.
+
+        Raises:
+            MemoryLayerError: If a lookup request fails.
+        """
+        # Weaviate reports IDs in lowercase; matching and caching use the same form.
+        wanted = list(dict.fromkeys(str(uuid).lower() for uuid in uuids))
+        properties = properties or ["*"]  # Fetch all properties if none are specified
+        nodes, missing = self._cached_nodes(class_name, wanted, properties)
+        for start in range(0, len(missing), self.LOOKUP_CHUNK_SIZE):
+            chunk = missing[start:start + self.LOOKUP_CHUNK_SIZE]
+            # A single ID keeps the plain Equal filter older servers understand.
+            where = (
+                {"path": ["id"], "operator": "Equal", "valueString": chunk[0]}
+                if len(chunk) == 1 else {"path": ["id"], "operator": "ContainsAny", "valueTextArray": chunk}
+            )
+            try:
+                result = self.client.query.get(class_name, properties) \
+                    .with_where(where) \
+                    .with_additional(["id"]) \
+                    .with_limit(len(chunk)) \
+                    .do()
+            except Exception as e:
+                raise MemoryLayerError(
+                    layer="L2-Weaviate",
+                    message=f"Failed to get {len(chunk)} nodes by UUID from class '{class_name}': {e}"
+                ) from e
+            fetched = {}
+            for node in result.get("data", {}).get("Get", {}).get(class_name) or []:
+                node = dict(node)
+                node_id = (node.pop("_additional", None) or {}).get("id")
+                if node_id is not None:
+                    fetched[str(node_id).lower()] = node
+            self._cache_nodes(class_name, properties, fetched)
+            nodes.update(fetched)
+        return nodes
+
+    def _cached_nodes(
+        self, class_name: str, uuids: List[str], properties: List[str]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        if self._node_cache is None:
+            return {}, uuids
+        found, missing = {}, []
+        key = tuple(properties)
+        with self._node_cache_lock:
+            for uuid in uuids:
+                entry = self._node_cache.get((class_name, uuid))
+                if entry is not None and entry[0] == key:
+                    found[uuid] = dict(entry[1])
+                else:
+                    missing.append(uuid)
+        return found, missing
+
+    def _cache_nodes(self, class_name: str, properties: List[str], nodes: Dict[str, Dict[str, Any]]) -> None:
+        if self._node_cache is None:
+            return
+        key = tuple(properties)
+        with self._node_cache_lock:
+            for uuid, node in nodes.items():
+                self._node_cache[(class_name, uuid)] = (key, dict(node))
+
+    def _evict_nodes(self, class_name: str, uuids: Optional[List[str]] = None) -> None:
+        """Drops cached nodes of a class; all of them when `uuids` is None."""
+        if self._node_cache is None:
+            return
+        with self._node_cache_lock:
+            if uuids is None:
+                for key in [key for key in self._node_cache.keys() if key[0] == class_name]:
+                    self._node_cache.pop(key, None)
+            else:
+                for uuid in uuids:
+                    self._node_cache.pop((class_name, str(uuid).lower()), None)
 
     def semantic_search(self, class_name: str, query: str, properties: List[str], limit: int = 5) -> List[Dict[str, Any]]:
         """
-        Performs a semantic vector search (nearText) in Weaviate.
-        This requires a vectorizer module (e.g., text2vec-openai) to be enabled on the class.
+        Performs a semantic vector search in Weaviate. With an embedding service the
+        query is embedded client-side (nearVector); otherwise this is a nearText search,
+        which requires a vectorizer module (e.g., text2vec-openai) on the class.
 
         Args:
             class_name: The class to search within.
@@ -110,12 +224,12 @@ class L2Weaviate:
             A list of result objects, each being a dictionary of properties.
         """
         try:
-            near_text_filter = {"concepts": [query]}
-            
-            result = self.client.query.get(class_name, properties) \
-                .with_near_text(near_text_filter) \
-                .with_limit(limit) \
-                .do()
+            search = self.client.query.get(class_name, properties)
+            if self.embedding_service is not None:
+                search = search.with_near_vector({"vector": self.embedding_service.embed([query])[0].tolist()})
+            else:
+                search = search.with_near_text({"concepts": [query]})
+            result = search.with_limit(limit).do()
                 
             return result.get("data", {}).get("Get", {}).get(class_name, [])
         except Exception as e:
@@ -124,15 +238,99 @@ class L2Weaviate:
                 message=f"Semantic search failed for query '{query[:50]}...': {e}"
             ) from e
 
-    def batch_import(self, class_name: str, objects: List[Dict[str, Any]], batch_size: int = 20) -> None:
-        """Batch import multiple objects into a class."""
+    def delete_by_source(self, class_name: str, source: str) -> int:
+        """
+        Deletes every object of a class whose `source` property equals `source`.
+
+        Classes created before `source` used field tokenization match the
+        filter word by word, so `docs/guide.md` would also match `guide.md`.
+        Candidates are therefore fetched first and only objects whose
+        `source` is exactly `source` are deleted, by ID.
+
+        Returns:
+            The number of objects deleted.
+
+        Raises:
+            MemoryLayerError: If the deletion fails.
+        """
+        try:
+            where = {"path": ["source"], "operator": "Equal", "valueText": source}
+            matched: List[str] = []
+            offset = 0
+            while True:
+                result = self.client.query.get(class_name, ["source"]) \
+                    .with_where(where) \
+                    .with_additional(["id"]) \
+                    .with_limit(self.DELETE_PAGE_SIZE) \
+                    .with_offset(offset) \
+                    .do()
+                page = result.get("data", {}).get("Get", {}).get(class_name) or []
+                matched.extend(node["_additional"]["id"] for node in page if node.get("source") == source)
+                if len(page) < self.DELETE_PAGE_SIZE:
+                    break
+                offset += self.DELETE_PAGE_SIZE
+            deleted = 0
+            for start in range(0, len(matched), self.LOOKUP_CHUNK_SIZE):
+                chunk = matched[start:start + self.LOOKUP_CHUNK_SIZE]
+                result = self.client.batch.delete_objects(
+                    class_name=class_name,
+                    where={"path": ["id"], "operator": "ContainsAny", "valueTextArray": chunk},
+                )
+                deleted += int(((result or {}).get("results") or {}).get("successful", 0))
+            self._evict_nodes(class_name, matched)
+            return deleted
+        except Exception as e:
+            raise MemoryLayerError(
+                layer="L2-Weaviate",
+                message=f"Failed to delete objects of class '{class_name}' from source '{source}': {e}"
+            ) from e
+
+    def batch_import(
+        self,
+        class_name: str,
+        objects: Iterable[Dict[str, Any]],
+        batch_size: int = 100,
+        workers: int = 4,
+        uuids: Optional[Iterable[Optional[str]]] = None,
+        max_retries: int = 3,
+    ) -> ImportResult:
+        """
+        Imports many objects into a class with concurrent batch requests.
+
+        Per-object failures are retried with backoff and reported in the
+        result rather than raised, so callers can tell exactly which objects
+        are missing. Passing deterministic `uuids` (see
+        `weaviate_importer.deterministic_uuid`) makes re-imports replace
+        existing objects instead of duplicating them.
+
+        Args:
+            class_name: The class to import into.
+            objects: The objects' properties. May be a generator.
+            batch_size: Objects per batch request.
+            workers: Batch requests in flight at once.
+            uuids: Optional IDs aligned with `objects`.
+            max_retries: Extra attempts for objects that failed.
+
+        Returns:
+            Counts, throughput and the IDs of objects that failed.
+
+        Raises:
+            MemoryLayerError: If the importer cannot be run at all.
+        """
+        if self._http is None:
+            self._http = httpx.Client(timeout=60.0)
+        importer = BatchImporter(
+            self.url, workers=workers, batch_size=batch_size, max_retries=max_retries, client=self._http,
+            embed=self.embedding_service.embed if self.embedding_service is not None else None,
+            vector_property=self.vector_property,
+        )
         try:
-            self.client.batch.configure(batch_size=batch_size, dynamic=True)
-            with self.client.batch as batch:
-                for obj in objects:
-                    batch.add_data_object(obj, class_name)
+            return importer.import_objects(class_name, objects, uuids=uuids)
         except Exception as e:
             raise MemoryLayerError(
                 layer="L2-Weaviate",
                 message=f"Batch import failed for class '{class_name}': {e}"
             ) from e
+        finally:
+            # Imports may have overwritten cached IDs.
+            self._evict_nodes(class_name)
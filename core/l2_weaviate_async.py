@@ -0,0 +1,224 @@
+# core/l2_weaviate_async.py
+
+import json
+import logging
+import uuid as uuid_lib
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from .coalesce import MicroBatcher
+from .embeddings import EmbeddingService
+from .exceptions import MemoryLayerError
+
+# (class name, properties, object id, vector) as queued for a batched write.
+PendingNode = Tuple[str, Dict[str, Any], str, Optional[List[float]]]
+
+# One client per Weaviate URL for the whole process; see `get_async_weaviate`.
+_shared: Dict[str, "AsyncL2Weaviate"] = {}
+
+
+def _graphql_value(value: Any) -> str:
+    # GraphQL string and number literals share JSON's syntax.
+    return json.dumps(value)
+
+
+class AsyncL2Weaviate:
+    """
+    A non-blocking client for the L2 Weaviate layer over its REST and GraphQL APIs.
+
+    Every call shares one pooled `httpx.AsyncClient`, so the event loop is
+    never blocked and connections are reused across requests. Concurrent
+    `add_node` calls are gathered into one batch request, flushed as soon
+    as it is full or a few milliseconds after its first node arrived.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 10.0,
+        connect_timeout: float = 2.0,
+        max_connections: int = 20,
+        max_batch: int = 64,
+        batch_window_ms: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+        vector_property: str = "content",
+    ):
+        """
+        Args:
+            url: The Weaviate base URL, e.g. "http://localhost:8080".
+            timeout: Seconds allowed for each request.
+            connect_timeout: Seconds allowed to open a connection.
+            max_connections: The size of the shared connection pool.
+            max_batch: The number of queued nodes that triggers a flush.
+            batch_window_ms: How long a batch of nodes waits for more callers.
+            client: An HTTP client to use instead of creating one, e.g. in tests.
+            embedding_service: Embeds nodes and `near_text` queries client-side, for
+                               classes created with `vectorizer: none`.
+            vector_property: The text property embedded for each node.
+        """
+        self.url = url.rstrip("/")
+        self.embedding_service = embedding_service
+        self.vector_property = vector_property
+        self.client = client or httpx.AsyncClient(
+            base_url=self.url,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._nodes: MicroBatcher[PendingNode, Union[str, MemoryLayerError]] = MicroBatcher(
+            self._flush_nodes, max_batch=max_batch, max_delay=batch_window_ms / 1000
+        )
+
+    async def add_node(
+        self,
+        class_name: str,
+        data: Dict[str, Any],
+        uuid: Optional[str] = None,
+        vector: Optional[List[float]] = None,
+    ) -> str:
+        """
+        Async equivalent of `L2Weaviate.add_node`, batched with concurrent writes.
+
+        Args:
+            class_name: The class to add the object to.
+            data: The object's properties.
+            uuid: An optional pre-defined ID. A random one is used otherwise.
+            vector: An optional vector for classes without a vectorizer.
+
+        Returns:
+            The ID of the stored object.
+
+        Raises:
+            MemoryLayerError: If Weaviate rejected the object or the batch failed.
+        """
+        text = data.get(self.vector_property)
+        if vector is None and self.embedding_service is not None and isinstance(text, str):
+            vector = (await self.embedding_service.embed_one_async(text)).tolist()
+        result = await self._nodes.submit((class_name, data, str(uuid or uuid_lib.uuid4()), vector))
+        if isinstance(result, MemoryLayerError):
+            raise result
+        return result
+
+    async def get_node(self, class_name: str, uuid: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetches one object by ID through the REST objects endpoint.
+
+        Returns:
+            The object as Weaviate returns it, with its `properties`, or None if it does not exist.
+
+        Raises:
+            MemoryLayerError: If the request fails.
+        """
+        try:
+            response = await self.client.get(f"/v1/objects/{class_name}/{uuid}")
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            raise MemoryLayerError(
+                layer="L2-Weaviate", message=f"Failed to get object '{uuid}' from class '{class_name}': {e}"
+            ) from e
+
+    async def query(
+        self,
+        class_name: str,
+        properties: Sequence[str],
+        near_text: Optional[Sequence[str]] = None,
+        near_vector: Optional[Sequence[float]] = None,
+        limit: int = 10,
+        additional: Sequence[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs a GraphQL `Get` query against one class.
+
+        Args:
+            class_name: The class to search.
+            properties: The properties to return for each object.
+            near_text: Concepts for a `nearText` search.
+            near_vector: A vector for a `nearVector` search.
+            limit: The maximum number of objects returned.
+            additional: `_additional` fields to return, e.g. "id" or "distance".
+
+        Returns:
+            The matching objects, best first.
+
+        Raises:
+            MemoryLayerError: If the request fails or Weaviate reports an error.
+        """
+        if near_text is not None and near_vector is None and self.embedding_service is not None:
+            near_vector = await self.embedding_service.embed_one_async(" ".join(near_text))
+            near_text = None
+        arguments = [f"limit: {int(limit)}"]
+        if near_text is not None:
+            arguments.append(f"nearText: {{concepts: {_graphql_value(list(near_text))}}}")
+        if near_vector is not None:
+            arguments.append(f"nearVector: {{vector: {_graphql_value([float(v) for v in near_vector])}}}")
+        fields = " ".join(properties)
+        if additional:
+            fields += f" _additional {{ {' '.join(additional)} }}"
+        graphql = f"{{ Get {{ {class_name}({', '.join(arguments)}) {{ {fields} }} }} }}"
+        try:
+            response = await self.client.post("/v1/graphql", json={"query": graphql})
+            response.raise_for_status()
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise MemoryLayerError(layer="L2-Weaviate", message=f"Query on class '{class_name}' failed: {e}") from e
+        if body.get("errors"):
+            messages = "; ".join(error.get("message", "") for error in body["errors"])
+            raise MemoryLayerError(layer="L2-Weaviate", message=f"Query on class '{class_name}' failed: {messages}")
+        return ((body.get("data") or {}).get("Get") or {}).get(class_name) or []
+
+    async def close(self) -> None:
+        """Flushes pending writes and closes the connection pool."""
+        await self._nodes.close()
+        await self.client.aclose()
+        if _shared.get(self.url) is self:
+            del _shared[self.url]
+
+    async def _flush_nodes(self, nodes: List[PendingNode]) -> List[Union[str, MemoryLayerError]]:
+        objects = []
+        for class_name, data, object_id, vector in nodes:
+            obj: Dict[str, Any] = {"class": class_name, "id": object_id, "properties": data}
+            if vector is not None:
+                obj["vector"] = vector
+            objects.append(obj)
+        logging.debug(f"Writing {len(objects)} batched nodes to Weaviate.")
+        try:
+            response = await self.client.post("/v1/batch/objects", json={"objects": objects})
+            response.raise_for_status()
+            items = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise MemoryLayerError(layer="L2-Weaviate", message=f"Batch write of {len(objects)} nodes failed: {e}") from e
+        errors: Dict[str, str] = {}
+        for item in items:
+            item_errors = ((item.get("result") or {}).get("errors") or {}).get("error")
+            if item_errors:
+                errors[item.get("id")] = "; ".join(error.get("message", "") for error in item_errors)
+        return [
+            MemoryLayerError(layer="L2-Weaviate", message=f"Failed to add node to class '{class_name}': {errors[object_id]}")
+            if object_id in errors else object_id
+            for class_name, _, object_id, _ in nodes
+        ]
+
+
+async def close_shared_clients() -> None:
+    """Closes every process-wide client; the next `get_async_weaviate` call creates a fresh one."""
+    for client in list(_shared.values()):
+        await client.close()
+
+
+def get_async_weaviate(url: str, **kwargs: Any) -> AsyncL2Weaviate:
+    """
+    Returns the process-wide `AsyncL2Weaviate` for a URL, creating it on first use.
+
+    The memory manager, the vector store and RAG retrieval all go through
+    this, so they share one connection pool and one write batcher. Keyword
+    arguments only apply when the client is created.
+    """
+    key = url.rstrip("/")
+    client = _shared.get(key)
+    if client is None:
+        client = _shared[key] = AsyncL2Weaviate(url, **kwargs)
+    return client
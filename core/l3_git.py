@@ -1,11 +1,19 @@
 # core/l3_git.py
 
 import logging
-from typing import Optional
+import re
+from threading import Lock
+from typing import Optional, Dict
+from cachetools import LRUCache
 from git import Repo, GitCommandError, NoSuchPathError, InvalidGitRepositoryError, BadName
 
 from .exceptions import MemoryLayerError
 
+# A resolved commit's tree flattened to {file path: blob SHA}.
+TreeIndex = Dict[str, str]
+
+FULL_SHA = re.compile(r"[0-9a-f]{40}")
+
 class L3Git:
     """
     A robust, read-only Git-backed persistent memory layer that serves as the L3
@@ -15,16 +23,22 @@ class L3Git:
     version (commit hash) in a local Git repository.
     """
 
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, tree_index_size: int = 16):
         """
         Initializes the Git repository object and validates the path.
 
         Args:
             repo_path: The local file path to the Git repository.
+            tree_index_size: How many per-commit path->blob indexes to keep in memory.
 
         Raises:
             MemoryLayerError: If the path is not a valid Git repository.
         """
+        # Commits are immutable, so both caches below never need invalidation,
+        # only bounding. The lock guards them across executor threads.
+        self._tree_indexes: LRUCache = LRUCache(maxsize=tree_index_size)
+        self._resolved_commits: LRUCache = LRUCache(maxsize=tree_index_size * 16)
+        self._index_lock = Lock()
         try:
             logging.info(f"Initializing L3 Git repository at path: '{repo_path}'")
             self.repo = Repo(repo_path, search_parent_directories=True)
@@ -86,6 +100,131 @@ class L3Git:
                 message=f"An unexpected error occurred retrieving file '{file_path}' at commit '{commit_hash}': {e}"
             ) from e
 
+    def resolve_commit(self, commit_hash: str) -> Optional[str]:
+        """
+        Resolves a full or short commit hash, or any other revision, to its full 40-character SHA.
+
+        Only full SHAs are cached: refs such as HEAD move, and a short hash
+        can become ambiguous as commits are added.
+
+        Returns:
+            The full commit SHA, or None if the commit does not exist.
+        """
+        with self._index_lock:
+            resolved = self._resolved_commits.get(commit_hash)
+        if resolved is not None:
+            return resolved
+        try:
+            resolved = self.repo.commit(commit_hash).hexsha
+        except (BadName, ValueError):
+            logging.warning(f"Invalid or non-existent commit hash provided: '{commit_hash}'.")
+            return None
+        except Exception as e:
+            raise MemoryLayerError(
+                layer="L3-Git",
+                message=f"An unexpected error occurred resolving commit '{commit_hash}': {e}"
+            ) from e
+        if FULL_SHA.fullmatch(commit_hash):
+            with self._index_lock:
+                self._resolved_commits[commit_hash] = resolved
+        return resolved
+
+    def cached_tree_index(self, commit_hash: str) -> Optional[TreeIndex]:
+        """Returns a commit's index only if it is already built. Never touches the repository."""
+        with self._index_lock:
+            resolved = self._resolved_commits.get(commit_hash, commit_hash)
+            return self._tree_indexes.get(resolved)
+
+    def get_tree_index(self, commit_hash: str) -> Optional[TreeIndex]:
+        """
+        Returns the flattened {path: blob SHA} index of a commit's tree.
+
+        The index is built with a single `git ls-tree -r` the first time a
+        commit is seen and kept in an LRU, so later path lookups at the same
+        commit are plain dict lookups instead of tree walks.
+
+        Args:
+            commit_hash: The full or short commit hash.
+
+        Returns:
+            The index, or None if the commit does not exist.
+
+        Raises:
+            MemoryLayerError: For unexpected repository errors.
+        """
+        resolved = self.resolve_commit(commit_hash)
+        if resolved is None:
+            return None
+        with self._index_lock:
+            index = self._tree_indexes.get(resolved)
+        if index is not None:
+            return index
+
+        try:
+            output = self.repo.git.ls_tree("-r", "-z", "--full-tree", resolved)
+        except GitCommandError as e:
+            raise MemoryLayerError(
+                layer="L3-Git",
+                message=f"Failed to list the tree of commit '{resolved}': {e}"
+            ) from e
+
+        index = {}
+        for entry in output.split("\0"):
+            if not entry:
+                continue
+            meta, path = entry.split("\t", 1)
+            _, obj_type, sha = meta.split()
+            if obj_type == "blob":
+                index[path] = sha
+        logging.info(f"Built tree index for commit '{resolved[:7]}' with {len(index)} blobs.")
+        with self._index_lock:
+            self._tree_indexes[resolved] = index
+        return index
+
+    def get_blob(self, blob_sha: str) -> Optional[bytes]:
+        """
+        Retrieves the raw contents of a blob by its SHA. No decoding is done,
+        so binary and non-UTF-8 files are returned intact.
+
+        Returns:
+            The blob bytes, or None if the blob does not exist.
+
+        Raises:
+            MemoryLayerError: For unexpected repository errors.
+        """
+        try:
+            return self.repo.odb.stream(bytes.fromhex(blob_sha)).read()
+        except (ValueError, KeyError):
+            logging.debug(f"Blob '{blob_sha}' not found.")
+            return None
+        except Exception as e:
+            raise MemoryLayerError(
+                layer="L3-Git",
+                message=f"An unexpected error occurred retrieving blob '{blob_sha}': {e}"
+            ) from e
+
+    def diff_paths(self, old_commit: str, new_commit: str) -> Dict[str, str]:
+        """
+        Lists the paths that differ between two commits.
+
+        Returns:
+            A mapping of each changed path to its status letter: "A" (added),
+            "M" (modified), "D" (deleted) or "T" (type changed). Renames are
+            reported as a deletion plus an addition.
+
+        Raises:
+            MemoryLayerError: If either commit cannot be diffed.
+        """
+        try:
+            output = self.repo.git.diff("--name-status", "-z", "--no-renames", old_commit, new_commit)
+        except GitCommandError as e:
+            raise MemoryLayerError(
+                layer="L3-Git",
+                message=f"Failed to diff '{old_commit}'..'{new_commit}': {e}"
+            ) from e
+        fields = [field for field in output.split("\0") if field]
+        return {path: status[0] for status, path in zip(fields[::2], fields[1::2])}
+
     def get_latest_commit(self) -> str:
         """
         Gets the full commit hash of the current HEAD of the repository.
@@ -0,0 +1,213 @@
+# core/l3_git_async.py
+
+import asyncio
+import collections
+import itertools
+import logging
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .executor import ParallelExecutor
+from .exceptions import MemoryLayerError
+from .l3_git import L3Git, TreeIndex
+
+# (object sha, object type, raw object bytes) as reported by `git cat-file --batch`.
+GitObject = Tuple[str, str, bytes]
+
+
+class CatFileProcess:
+    """
+    A single long-lived `git cat-file --batch` subprocess.
+
+    Requests are pipelined: object names are written to stdin as soon as they
+    arrive and a dedicated reader task resolves the waiting futures in FIFO
+    order, because git answers batch requests strictly in the order received.
+    """
+
+    def __init__(self, git_dir: str):
+        self.git_dir = git_dir
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: Deque[asyncio.Future] = collections.deque()
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None and self._reader is not None and not self._reader.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Spawns the subprocess and its response reader task."""
+        self._proc = await asyncio.create_subprocess_exec(
+            "git", f"--git-dir={self.git_dir}", "cat-file", "--batch",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def read_object(self, name: str) -> Optional[GitObject]:
+        """
+        Reads one object by any name git understands (a SHA, or `<commit>:<path>`).
+
+        Returns:
+            The (sha, type, data) triple, or None if the object does not exist.
+        """
+        if not self.alive or self._proc is None or self._proc.stdin is None:
+            raise MemoryLayerError(layer="L3-Git", message="cat-file worker is not running.")
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        async with self._write_lock:
+            # Queue the future and write the request under one lock so the FIFO
+            # order of `_pending` always matches the order git sees requests.
+            self._pending.append(future)
+            self._proc.stdin.write(name.encode() + b"\n")
+            await self._proc.stdin.drain()
+        return await future
+
+    async def _read_loop(self) -> None:
+        assert self._proc is not None and self._proc.stdout is not None
+        stdout = self._proc.stdout
+        try:
+            while True:
+                header = await stdout.readline()
+                if not header:
+                    raise EOFError("git cat-file exited unexpectedly")
+                parts = header.decode().split()
+                if len(parts) == 3 and parts[2].isdigit():
+                    sha, obj_type, size = parts[0], parts[1], int(parts[2])
+                    data = await stdout.readexactly(size)
+                    await stdout.readexactly(1)  # Trailing newline after the object body.
+                    result: Optional[GitObject] = (sha, obj_type, data)
+                else:
+                    # "<name> missing" or "<name> ambiguous".
+                    result = None
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            error = MemoryLayerError(layer="L3-Git", message=f"cat-file worker failed: {e}")
+            while self._pending:
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(error)
+
+    async def close(self) -> None:
+        """Closes stdin so git exits, then reaps the process and reader task."""
+        if self._proc is None:
+            return
+        try:
+            if self._proc.stdin is not None:
+                self._proc.stdin.close()
+            await asyncio.wait_for(self._proc.wait(), timeout=5)
+        except (asyncio.TimeoutError, ProcessLookupError):
+            self._proc.kill()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self._proc = None
+
+
+class AsyncL3Git:
+    """
+    A non-blocking facade over the L3 Git layer.
+
+    Blob reads are multiplexed over a small pool of persistent `git cat-file
+    --batch` processes using native asyncio subprocess I/O, so a cold miss on
+    a large blob never stalls the event loop. Operations that have no cat-file
+    equivalent, or all reads when the pool is disabled or git is unavailable,
+    are offloaded to the thread pool of a `ParallelExecutor`.
+    """
+
+    def __init__(self, l3: L3Git, executor: ParallelExecutor, workers: int = 2):
+        """
+        Args:
+            l3: The synchronous GitPython-backed layer, used for offloaded calls.
+            executor: The executor whose thread pool runs blocking GitPython code.
+            workers: The number of cat-file processes to keep. 0 disables the pool.
+        """
+        self.l3 = l3
+        self.executor = executor
+        self.workers = workers
+        self._procs: List[CatFileProcess] = []
+        self._round_robin = itertools.count()
+        self._restart_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Spawns the cat-file pool. Falls back to thread offload if git cannot be started."""
+        try:
+            for _ in range(self.workers):
+                proc = CatFileProcess(self.l3.repo.git_dir)
+                await proc.start()
+                self._procs.append(proc)
+            if self._procs:
+                logging.info(f"L3 Git started {len(self._procs)} cat-file worker(s).")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not start git cat-file workers: {e}. Falling back to thread offload.")
+            await self.close()
+
+    async def close(self) -> None:
+        """Terminates every cat-file process."""
+        procs, self._procs = self._procs, []
+        await asyncio.gather(*(proc.close() for proc in procs), return_exceptions=True)
+
+    async def _pick_process(self) -> Optional[CatFileProcess]:
+        """Returns the least-loaded live worker, restarting dead ones on the way."""
+        if not self._procs:
+            return None
+        if not all(proc.alive for proc in self._procs):
+            async with self._restart_lock:
+                for index, proc in enumerate(self._procs):
+                    if not proc.alive:
+                        logging.warning("Restarting dead git cat-file worker.")
+                        await proc.close()
+                        replacement = CatFileProcess(self.l3.repo.git_dir)
+                        await replacement.start()
+                        self._procs[index] = replacement
+        start = next(self._round_robin) % len(self._procs)
+        ordered = self._procs[start:] + self._procs[:start]
+        return min(ordered, key=lambda proc: proc.pending)
+
+    async def read_object(self, name: str) -> Optional[GitObject]:
+        """Reads a raw object through the cat-file pool, or None if it does not exist."""
+        if "\n" in name:
+            # A newline would desynchronize the line-based batch protocol.
+            return None
+        proc = await self._pick_process()
+        if proc is None:
+            raise MemoryLayerError(layer="L3-Git", message="No cat-file workers are running.")
+        return await proc.read_object(name)
+
+    def has_tree_index(self, commit_hash: str) -> bool:
+        """Whether paths at this commit can be resolved without touching the repository."""
+        return self.l3.cached_tree_index(commit_hash) is not None
+
+    async def get_tree_index(self, commit_hash: str) -> Optional[TreeIndex]:
+        """Async equivalent of `L3Git.get_tree_index`. Only cold commits leave the event loop."""
+        index = self.l3.cached_tree_index(commit_hash)
+        if index is not None:
+            return index
+        return await self.executor.run_in_thread(self.l3.get_tree_index, commit_hash)
+
+    async def get_blob(self, blob_sha: str) -> Optional[bytes]:
+        """Async equivalent of `L3Git.get_blob`. Returns the raw blob bytes without decoding."""
+        if not self._procs:
+            return await self.executor.run_in_thread(self.l3.get_blob, blob_sha)
+        obj = await self.read_object(blob_sha)
+        if obj is None or obj[1] != "blob":
+            logging.debug(f"Blob '{blob_sha}' not found.")
+            return None
+        return obj[2]
+
+    async def get_blobs(self, blob_shas: List[str]) -> Dict[str, Optional[bytes]]:
+        """Reads many blobs concurrently over the pool."""
+        values = await asyncio.gather(*(self.get_blob(sha) for sha in blob_shas))
+        return dict(zip(blob_shas, values))
+
+    async def diff_paths(self, old_commit: str, new_commit: str) -> Dict[str, str]:
+        """Async equivalent of `L3Git.diff_paths`, offloaded to a thread."""
+        return await self.executor.run_in_thread(self.l3.diff_paths, old_commit, new_commit)
+
+    async def get_latest_commit(self) -> str:
+        """Async equivalent of `L3Git.get_latest_commit`, offloaded to a thread."""
+        return await self.executor.run_in_thread(self.l3.get_latest_commit)
@@ -0,0 +1,102 @@
+# core/lease.py
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+from .l1_redis import L1Redis
+from .exceptions import MemoryLayerError
+from .metrics import l3_lease_hold_seconds, l3_lease_wait_seconds, l3_lease_waits_total
+
+
+class DistributedSingleFlight:
+    """
+    Cross-replica single-flight for expensive cache fills.
+
+    The first replica to miss a key takes a short-TTL lease in Redis (SET NX PX)
+    and runs the loader, which is expected to fill L1. Other replicas that miss
+    the same key poll L1 until the value appears instead of running the loader
+    themselves. If the holder dies, its lease expires and a waiter takes over;
+    if Redis is unavailable every replica simply loads on its own.
+    """
+
+    def __init__(self, l1: L1Redis, lease_ttl_ms: int = 5000, poll_interval_ms: int = 25, wait_timeout_ms: int = 5000):
+        """
+        Args:
+            l1: The connected L1 client holding leases and filled values.
+            lease_ttl_ms: How long a lease lives if its holder never releases it.
+            poll_interval_ms: The initial delay between L1 polls while waiting.
+            wait_timeout_ms: How long to wait before loading locally anyway.
+        """
+        self.l1 = l1
+        self.lease_ttl_ms = lease_ttl_ms
+        self.poll_interval = poll_interval_ms / 1000
+        self.wait_timeout = wait_timeout_ms / 1000
+
+    async def run(self, cache_key: str, loader: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        """
+        Returns the value for `cache_key`, running `loader` on at most one
+        replica at a time.
+        """
+        lease_key = f"lease:{cache_key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+        waited_since: Optional[float] = None
+
+        while True:
+            try:
+                acquired = await self.l1.acquire_lease(lease_key, token, self.lease_ttl_ms)
+            except MemoryLayerError as e:
+                logging.warning(f"Lease unavailable for key '{cache_key}': {e}. Loading locally.")
+                return await loader()
+
+            if acquired:
+                if waited_since is not None:
+                    # The previous holder released or expired without filling L1.
+                    l3_lease_waits_total.labels(outcome="takeover").inc()
+                return await self._load_holding(lease_key, token, loader)
+
+            if waited_since is None:
+                waited_since = time.monotonic()
+            value = await self._wait_for_fill(cache_key, lease_key, deadline)
+            if value is not None:
+                l3_lease_wait_seconds.observe(time.monotonic() - waited_since)
+                l3_lease_waits_total.labels(outcome="filled").inc()
+                return value
+            if time.monotonic() >= deadline:
+                l3_lease_wait_seconds.observe(time.monotonic() - waited_since)
+                l3_lease_waits_total.labels(outcome="timeout").inc()
+                logging.warning(f"Timed out waiting for another replica to fill '{cache_key}'. Loading locally.")
+                return await loader()
+            # The lease disappeared without a fill: loop and try to take it.
+
+    async def _load_holding(self, lease_key: str, token: str, loader: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        start = time.monotonic()
+        try:
+            return await loader()
+        finally:
+            l3_lease_hold_seconds.observe(time.monotonic() - start)
+            try:
+                await self.l1.release_lease(lease_key, token)
+            except MemoryLayerError as e:
+                logging.warning(f"Failed to release lease '{lease_key}': {e}. It will expire on its own.")
+
+    async def _wait_for_fill(self, cache_key: str, lease_key: str, deadline: float) -> Optional[bytes]:
+        """Polls L1 with backoff until the value appears, the lease is gone, or the deadline passes."""
+        delay = self.poll_interval
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            try:
+                value = await self.l1.get(cache_key)
+                if value is not None:
+                    return value
+                if not await self.l1.exists(lease_key):
+                    # Re-read once: the holder may have filled L1 just before releasing.
+                    return await self.l1.get(cache_key)
+            except MemoryLayerError as e:
+                logging.warning(f"L1 poll failed while waiting for '{cache_key}': {e}")
+                return None
+            delay = min(delay * 2, 0.5)
+        return None
@@ -2,17 +2,49 @@
 
 import asyncio
 import json
-from typing import Any, Optional, Dict, List
+import time
+from typing import Any, AsyncIterator, Optional, Dict, List
 import logging
 import hashlib
 
-from .l0_cache import L0Cache
+from .l0_cache import build_l0_cache
 from .l1_redis import L1Redis
+from .l1_codec import L1Codec
+from .invalidation import L0InvalidationBus
+from .lease import DistributedSingleFlight
+from .coalesce import SingleFlight
+from .cache_policy import CachePolicy, CachePolicies
+from .head_watcher import HeadWatcher
+from .prewarm import CachePrewarmer, PrewarmResult
+from .embeddings import default_embedding_service
 from .l2_weaviate import L2Weaviate
-from .l2_chroma import L2Chroma
+from .l2_weaviate_async import get_async_weaviate
+from .l2_chroma import L2Chroma, BulkUpsertResult, DocumentBatcher
+from .l2_chroma_async import AsyncL2Chroma
+from .search_cache import ApproximateSearchCache, normalize_query
 from .l3_git import L3Git
-from .config import L0_CACHE_SIZE, REDIS_URL, WEAVIATE_URL, CHROMA_PATH, GIT_REPO_PATH
+from .l3_git_async import AsyncL3Git
+from .executor import ParallelExecutor
+from .config import (
+    L0_CACHE_SIZE, L0_CACHE_MAX_BYTES, L0_CACHE_SHARDS, L0_CACHE_APPROXIMATE_LRU,
+    REDIS_URL, L1_CODEC, L1_COMPRESSION_MIN_BYTES, L1_COMPRESSION_LEVEL, L1_ZSTD_DICT_PATH,
+    WEAVIATE_URL, CHROMA_PATH, GIT_REPO_PATH,
+    WEAVIATE_TIMEOUT_SECONDS, WEAVIATE_CONNECT_TIMEOUT_SECONDS, WEAVIATE_MAX_CONNECTIONS, WEAVIATE_MAX_BATCH, WEAVIATE_BATCH_WINDOW_MS,
+    WEAVIATE_NODE_CACHE_TTL_SECONDS, WEAVIATE_NODE_CACHE_SIZE, WEAVIATE_SERVICE_EMBEDDINGS,
+    CHROMA_MAX_THREADS, CHROMA_MAX_BATCH, CHROMA_BATCH_WINDOW_MS,
+    SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_APPROXIMATE_THRESHOLD, CHROMA_BULK_BATCH_SIZE, CHROMA_BULK_MAX_BATCH_BYTES,
+    L0_INVALIDATION_ENABLED, L0_INVALIDATION_CHANNEL,
+    L3_CAT_FILE_WORKERS, L3_TREE_INDEX_SIZE, L3_DISTRIBUTED_SINGLE_FLIGHT, HEAD_WATCH_INTERVAL_SECONDS,
+    L3_LEASE_TTL_MS, L3_LEASE_POLL_MS, L3_LEASE_WAIT_TIMEOUT_MS,
+    PREWARM_BATCH_SIZE, PREWARM_CONCURRENCY, PREWARM_MAX_PATHS, PREWARM_L0,
+    NEGATIVE_CACHE_TTL_SECONDS, STALE_WHILE_REVALIDATE, CACHE_POLICY_OVERRIDES, EXECUTOR_MAX_THREADS, EXECUTOR_MAX_PROCESSES,
+)
 from .exceptions import MemoryLayerError, NotFoundError
+from .metrics import search_cache_requests_total
+
+# Incremented on every write to the Chroma collection; part of every search cache key.
+CHROMA_VERSION_KEY = "sentinel:l2c:version"
+
 
 class MemoryManager:
     """
@@ -23,13 +55,57 @@ class MemoryManager:
 
     def __init__(self):
         """Initializes all memory layer clients and concurrency controls."""
-        self.l0 = L0Cache(L0_CACHE_SIZE)
-        self.l1 = L1Redis(REDIS_URL)
-        self.l2w = L2Weaviate(WEAVIATE_URL)
-        self.l2c = L2Chroma(CHROMA_PATH)
-        self.l3 = L3Git(GIT_REPO_PATH)
-        self._locks: Dict[str, asyncio.Lock] = {}
-        self._locks_lock = asyncio.Lock()
+        self.l0 = build_l0_cache(L0_CACHE_SIZE, L0_CACHE_MAX_BYTES, L0_CACHE_SHARDS, L0_CACHE_APPROXIMATE_LRU)
+        self.l1 = L1Redis(
+            REDIS_URL,
+            codec=L1Codec(L1_CODEC, L1_COMPRESSION_MIN_BYTES, L1_COMPRESSION_LEVEL, L1_ZSTD_DICT_PATH),
+        )
+        self.invalidation_bus = L0InvalidationBus(self.l1, self.l0, L0_INVALIDATION_CHANNEL) if L0_INVALIDATION_ENABLED else None
+        # Every L2 store embeds through this one service and its on-disk cache.
+        self.embeddings = default_embedding_service()
+        weaviate_embeddings = self.embeddings if WEAVIATE_SERVICE_EMBEDDINGS else None
+        self.l2w = L2Weaviate(
+            WEAVIATE_URL, node_cache_ttl=WEAVIATE_NODE_CACHE_TTL_SECONDS, node_cache_size=WEAVIATE_NODE_CACHE_SIZE,
+            embedding_service=weaviate_embeddings,
+        )
+        # Shared with the vector store and RAG retrieval; writes from concurrent requests are batched.
+        self.l2w_async = get_async_weaviate(
+            WEAVIATE_URL, timeout=WEAVIATE_TIMEOUT_SECONDS, connect_timeout=WEAVIATE_CONNECT_TIMEOUT_SECONDS,
+            max_connections=WEAVIATE_MAX_CONNECTIONS, max_batch=WEAVIATE_MAX_BATCH, batch_window_ms=WEAVIATE_BATCH_WINDOW_MS,
+            embedding_service=weaviate_embeddings,
+        )
+        self.l2c = L2Chroma(CHROMA_PATH, embedding_service=self.embeddings)
+        self.l2c_async = AsyncL2Chroma(
+            self.l2c, max_threads=CHROMA_MAX_THREADS, max_batch=CHROMA_MAX_BATCH, batch_window_ms=CHROMA_BATCH_WINDOW_MS
+        )
+        self.search_cache_ttl = SEARCH_CACHE_TTL_SECONDS
+        self.approximate_search = (
+            ApproximateSearchCache(SEARCH_CACHE_APPROXIMATE_THRESHOLD) if SEARCH_CACHE_APPROXIMATE_THRESHOLD > 0 else None
+        )
+        self.l3 = L3Git(GIT_REPO_PATH, tree_index_size=L3_TREE_INDEX_SIZE)
+        self.executor = ParallelExecutor(max_threads=EXECUTOR_MAX_THREADS, max_processes=EXECUTOR_MAX_PROCESSES)
+        # All L3 reads on the request path go through the async facade so a cold
+        # miss never blocks the event loop.
+        self.l3_async = AsyncL3Git(self.l3, self.executor, workers=L3_CAT_FILE_WORKERS)
+        self.head_watcher = HeadWatcher(self.l3_async, HEAD_WATCH_INTERVAL_SECONDS) if HEAD_WATCH_INTERVAL_SECONDS > 0 else None
+        # Optional cross-replica de-duplication of L3 reads, layered on top of
+        # the per-process single-flight below.
+        self.distributed_flight = (
+            DistributedSingleFlight(self.l1, L3_LEASE_TTL_MS, L3_LEASE_POLL_MS, L3_LEASE_WAIT_TIMEOUT_MS)
+            if L3_DISTRIBUTED_SINGLE_FLIGHT else None
+        )
+        self.prewarmer = CachePrewarmer(
+            self, batch_size=PREWARM_BATCH_SIZE, concurrency=PREWARM_CONCURRENCY,
+            max_paths=PREWARM_MAX_PATHS, warm_l0=PREWARM_L0,
+        )
+        # Coalesces concurrent identical misses within this process.
+        self._flights = SingleFlight()
+        self.cache_policies = CachePolicies(
+            CachePolicy(negative_ttl=NEGATIVE_CACHE_TTL_SECONDS, stale_while_revalidate=STALE_WHILE_REVALIDATE),
+            CACHE_POLICY_OVERRIDES,
+        )
+        # Strong references to fire-and-forget revalidation tasks.
+        self._background: set[asyncio.Task] = set()
 
     async def startup(self):
         """
@@ -37,6 +113,12 @@ class MemoryManager:
         This method is called once during the application's startup lifecycle.
         """
         await self.l1.connect()
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.start()
+        await self.l3_async.start()
+        if self.head_watcher is not None:
+            self.head_watcher.add_listener(self._on_head_moved)
+            await self.head_watcher.start()
         logging.info("MemoryManager started up and all memory layers initialized.")
 
     async def shutdown(self):
@@ -44,7 +126,17 @@ class MemoryManager:
         Gracefully closes all stateful connections.
         This method is called once during the application's shutdown lifecycle.
         """
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.close()
+        if self.head_watcher is not None:
+            await self.head_watcher.close()
+        await self.prewarmer.close()
+        await self.l2c_async.close()
+        # The async Weaviate client and the embedding service are process-wide and shared with
+        # RAG retrieval, so they are closed by the application, not by one manager.
         await self.l1.close()
+        await self.l3_async.close()
+        self.executor.shutdown()
         logging.info("MemoryManager shut down successfully.")
 
     def _generate_cache_key(self, prefix: str, identifier: str, version: Optional[str] = None) -> str:
@@ -54,18 +146,107 @@ class MemoryManager:
         key_string = f"{prefix}:{identifier}:{version or 'latest'}"
         return f"cache:{hashlib.sha256(key_string.encode()).hexdigest()}"
 
+    def _blob_cache_key(self, blob_sha: str) -> str:
+        """
+        Creates the cache key for a file version. Blob content is immutable, so
+        keying by blob SHA lets every commit that contains the same version of a
+        file share one L0/L1 entry.
+        """
+        return self._generate_cache_key("blob", blob_sha, blob_sha)
+
+    async def _resolve_head(self) -> str:
+        """Returns the current HEAD, from the watcher's memory when it is running."""
+        if self.head_watcher is not None and self.head_watcher.head is not None:
+            return self.head_watcher.head
+        return await self.l3_async.get_latest_commit()
+
+    async def _on_head_moved(self, old_head: str, new_head: str) -> None:
+        """
+        Drops the stale-while-revalidate pointers of every path that changed
+        between the two commits and builds the new commit's tree index ahead of
+        the first request. Blob-keyed content needs no invalidation.
+        """
+        changed = await self.l3_async.diff_paths(old_head, new_head)
+        for path in changed:
+            self.l0.delete(self._latest_key(path))
+        await self.l3_async.get_tree_index(new_head)
+        logging.info(f"Invalidated {len(changed)} changed paths after HEAD moved to {new_head[:7]}.")
+
+    async def _resolve_blob_shas(self, file_paths: List[str], commit_hash: Optional[str]) -> tuple[str, Dict[str, Optional[str]]]:
+        """
+        Maps file paths to blob SHAs through the per-commit tree index.
+
+        Returns:
+            The commit the paths were resolved against, and a mapping of each
+            path to its blob SHA, or None if it does not exist at that commit.
+        """
+        final_commit_hash = commit_hash or await self._resolve_head()
+        index = await self.l3_async.get_tree_index(final_commit_hash) or {}
+        return final_commit_hash, {path: index.get(path) for path in file_paths}
+
     async def get_file_content(self, file_path: str, commit_hash: Optional[str] = None) -> str:
         """
-        Retrieves file content by its path, implementing a full L0->L1->L3 fallback
-        with cache stampede protection and automatic cache back-filling.
+        Retrieves file content as text. This is the explicit decoding point for
+        callers that need a `str`; bytes that are not valid UTF-8 are replaced
+        rather than failing the request.
         """
-        cache_key = self._generate_cache_key("file", file_path, commit_hash)
+        content = await self.get_file_bytes(file_path, commit_hash)
+        return content.decode("utf-8", errors="replace")
+
+    async def get_file_bytes(self, file_path: str, commit_hash: Optional[str] = None) -> bytes:
+        """
+        Retrieves raw file content by its path, implementing a full L0->L1->L3
+        fallback with cache stampede protection and automatic cache back-filling.
+        The blob bytes from Git are cached and returned as-is, with no decoding.
+
+        Depending on the path's `CachePolicy`, missing paths are remembered for
+        a short TTL, and `latest` lookups may be served stale while they are
+        revalidated in the background.
+        """
+        policy = self.cache_policies.for_path(file_path)
+        swr = commit_hash is None and policy.stale_while_revalidate
+        if swr:
+            stale_value = self._serve_stale(file_path)
+            if stale_value is not None:
+                return stale_value
+
+        # With the HEAD watcher running, `latest` entries are keyed by the real
+        # HEAD SHA, so they stop matching as soon as the repository advances.
+        version = commit_hash or (self.head_watcher.head if self.head_watcher is not None else None)
+        if policy.negative_ttl > 0 and await self._is_known_missing(file_path, version):
+            logging.debug(f"Negative cache HIT for '{file_path}' at '{version or 'latest'}'.")
+            raise NotFoundError(f"File '{file_path}' not found at commit '{version or 'latest'}'.")
+
+        try:
+            final_commit_hash, cache_key, value = await self._read_path(file_path, version)
+        except NotFoundError:
+            if policy.negative_ttl > 0:
+                await self._remember_missing(file_path, version, policy.negative_ttl)
+            raise
+
+        if swr:
+            self.l0.set(self._latest_key(file_path), (final_commit_hash, cache_key))
+        return value
+
+    async def _read_path(self, file_path: str, commit_hash: Optional[str]) -> tuple[str, str, bytes]:
+        """
+        Resolves a path to its blob and reads it through L0->L1->L3.
+
+        Returns:
+            The resolved commit, the blob's cache key, and the content.
+        """
+        final_commit_hash, blob_shas = await self._resolve_blob_shas([file_path], commit_hash)
+        blob_sha = blob_shas[file_path]
+        if blob_sha is None:
+            raise NotFoundError(f"File '{file_path}' not found at commit '{final_commit_hash}'.")
+        cache_key = self._blob_cache_key(blob_sha)
 
         # --- L0 Check (Fastest Path) ---
         cached_value = self.l0.get(cache_key)
         if cached_value is not None:
             logging.debug(f"L0 cache HIT for key: {cache_key}")
-            return cached_value
+            self.prewarmer.observe(cache_key, hit=True)
+            return final_commit_hash, cache_key, cached_value
 
         # --- L1 Check ---
         try:
@@ -73,67 +254,378 @@ class MemoryManager:
             if cached_value is not None:
                 logging.debug(f"L1 cache HIT for key: {cache_key}")
                 self.l0.set(cache_key, cached_value)  # Back-fill L0
-                return cached_value
+                self.prewarmer.observe(cache_key, hit=True)
+                return final_commit_hash, cache_key, cached_value
         except MemoryLayerError as e:
             logging.warning(f"L1 Redis GET failed for key '{cache_key}': {e}. Proceeding to L3.")
 
         # --- Cache Stampede Protection ---
-        async with self._locks_lock:
-            lock = self._locks.setdefault(cache_key, asyncio.Lock())
+        self.prewarmer.observe(cache_key, hit=False)
+        value = await self._flights.do(cache_key, lambda: self._fill_blob(cache_key, blob_sha))
+        if value is None:
+            raise NotFoundError(f"File '{file_path}' not found at commit '{final_commit_hash}'.")
+        return final_commit_hash, cache_key, value
 
-        async with lock:
-            # --- Double-Check Locking Pattern ---
-            cached_value = self.l0.get(cache_key)
-            if cached_value is not None:
-                logging.debug(f"L0 cache HIT (post-lock) for key: {cache_key}")
-                return cached_value
+    # --- Negative Caching ---
+
+    def _negative_key(self, file_path: str, commit_hash: Optional[str]) -> str:
+        return self._generate_cache_key("missing", file_path, commit_hash)
+
+    async def _is_known_missing(self, file_path: str, commit_hash: Optional[str]) -> bool:
+        """
+        Checks whether a path was recently found missing. L0 entries store
+        their expiry time. L1 is only consulted when the alternative is a trip
+        to Git (a pinned commit that is not indexed yet); otherwise resolving
+        the path is an in-memory lookup and not worth a round trip.
+        """
+        neg_key = self._negative_key(file_path, commit_hash)
+        expires_at = self.l0.get(neg_key)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                return True
+            self.l0.delete(neg_key)
+        if commit_hash is None or self.l3_async.has_tree_index(commit_hash):
+            return False
+        try:
+            ttl = await self.l1.ttl(neg_key)
+        except MemoryLayerError as e:
+            logging.warning(f"L1 negative cache lookup failed for '{file_path}': {e}")
+            return False
+        if ttl > 0:
+            self.l0.set(neg_key, time.monotonic() + ttl)
+            return True
+        return False
+
+    async def _remember_missing(self, file_path: str, commit_hash: Optional[str], ttl: int) -> None:
+        neg_key = self._negative_key(file_path, commit_hash)
+        self.l0.set(neg_key, time.monotonic() + ttl)
+        try:
+            await self.l1.set(neg_key, b"1", expire=ttl)
+        except MemoryLayerError as e:
+            logging.warning(f"Failed to store negative cache entry for '{file_path}': {e}")
+
+    # --- Stale-While-Revalidate ---
+
+    def _latest_key(self, file_path: str) -> str:
+        return self._generate_cache_key("latest", file_path)
+
+    def _serve_stale(self, file_path: str) -> Optional[bytes]:
+        """
+        Returns the last version served for a `latest` lookup, if it is still
+        in L0, and schedules a background check for a newer HEAD.
+        """
+        pointer = self.l0.get(self._latest_key(file_path))
+        if pointer is None:
+            return None
+        seen_commit, cache_key = pointer
+        value = self.l0.get(cache_key)
+        if value is None:
+            return None
+        task = asyncio.create_task(
+            self._flights.do(("revalidate", file_path), lambda: self._revalidate(file_path, seen_commit))
+        )
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return value
+
+    async def _revalidate(self, file_path: str, seen_commit: str) -> None:
+        """Refreshes a stale `latest` pointer if HEAD has moved since it was stored."""
+        latest_key = self._latest_key(file_path)
+        try:
+            head = await self._resolve_head()
+            if head == seen_commit:
+                return
+            final_commit_hash, cache_key, _ = await self._read_path(file_path, head)
+            self.l0.set(latest_key, (final_commit_hash, cache_key))
+            logging.debug(f"Revalidated '{file_path}' at new HEAD '{head[:7]}'.")
+        except NotFoundError:
+            self.l0.delete(latest_key)
+        except Exception as e:
+            logging.warning(f"Background revalidation failed for '{file_path}': {e}")
+
+    async def _fill_blob(self, cache_key: str, blob_sha: str) -> Optional[bytes]:
+        """
+        Runs once per in-flight cache key: re-checks L0, which an earlier
+        flight for the same key may just have filled, then falls back to L3.
+        """
+        cached_value = self.l0.get(cache_key)
+        if cached_value is not None:
+            logging.debug(f"L0 cache HIT (in flight) for key: {cache_key}")
+            return cached_value
+
+        # --- L3 Fallback Logic (Definitive Cache Miss) ---
+        logging.info(f"Cache miss for key '{cache_key}'. Fetching blob {blob_sha[:7]} from L3 (Git).")
+        if self.distributed_flight is not None:
+            value = await self.distributed_flight.run(cache_key, lambda: self._load_blob(cache_key, blob_sha))
+            if value is not None:
+                self.l0.set(cache_key, value)
+            return value
+        return await self._load_blob(cache_key, blob_sha)
+
+    async def _load_blob(self, cache_key: str, blob_sha: str) -> Optional[bytes]:
+        """Reads a blob from L3 and back-fills L1 and L0 with it."""
+        value = await self.l3_async.get_blob(blob_sha)
+        if value is not None:
+            logging.info(f"Found blob '{blob_sha[:7]}' in L3. Back-filling L1 and L0 caches.")
             try:
-                cached_value = await self.l1.get(cache_key)
-                if cached_value is not None:
-                    logging.debug(f"L1 cache HIT (post-lock) for key: {cache_key}")
-                    self.l0.set(cache_key, cached_value)
-                    return cached_value
+                await self.l1.set(cache_key, value)
             except MemoryLayerError as e:
-                 logging.warning(f"L1 Redis GET (post-lock) failed for key '{cache_key}': {e}.")
+                logging.warning(f"Failed to back-fill cache for key '{cache_key}': {e}")
+            self.l0.set(cache_key, value)
+        return value
 
-            # --- L3 Fallback Logic (Definitive Cache Miss) ---
-            logging.info(f"Cache miss for key '{cache_key}'. Fetching from L3 (Git).")
+    async def get_file_contents_bulk(self, file_paths: List[str], commit_hash: Optional[str] = None) -> Dict[str, Optional[bytes]]:
+        """
+        Retrieves many files in one pass with a pipelined L0->L1->L3 fallback.
 
-            final_commit_hash = commit_hash or self.l3.get_latest_commit()
-            value = self.l3.get_file_at_commit(file_path, final_commit_hash)
+        Paths are mapped to blob SHAs through the commit's tree index, L0 hits
+        are served from memory, every L0 miss is sent to L1 in a single MGET,
+        and the remaining blobs are read from L3 concurrently. L1 is then
+        back-filled with one pipelined write, so a whole batch costs about
+        three round trips instead of one walk per file.
 
-            if value is not None:
-                logging.info(f"Found key '{file_path}' in L3. Back-filling L1 and L0 caches.")
+        Returns:
+            A mapping of each requested path to its raw content, or None if
+            the file does not exist at the commit.
+        """
+        _, blob_shas = await self._resolve_blob_shas(list(dict.fromkeys(file_paths)), commit_hash)
+        results: Dict[str, Optional[bytes]] = {path: None for path, sha in blob_shas.items() if sha is None}
+        contents = await self._read_blobs_bulk([sha for sha in blob_shas.values() if sha is not None])
+        for path, sha in blob_shas.items():
+            if sha is not None:
+                results[path] = contents.get(sha)
+        return results
+
+    async def warm_files(self, file_paths: List[str], commit_hash: str, fill_l0: bool = False) -> Dict[str, str]:
+        """
+        Loads files into the caches without returning their content.
+
+        Args:
+            file_paths: The paths to warm.
+            commit_hash: The commit to read them at.
+            fill_l0: Also back-fill this replica's L0. L1 is always filled.
+
+        Returns:
+            The cache key of each path whose content is now cached, whether it
+            was loaded now or already cached. Paths sharing a blob share a key.
+        """
+        _, blob_shas = await self._resolve_blob_shas(list(dict.fromkeys(file_paths)), commit_hash)
+        contents = await self._read_blobs_bulk([sha for sha in blob_shas.values() if sha is not None], fill_l0=fill_l0)
+        return {path: self._blob_cache_key(sha) for path, sha in blob_shas.items() if sha in contents}
+
+    async def prewarm(self, old_commit: str, new_commit: Optional[str] = None) -> PrewarmResult:
+        """Warms the caches with the files changed in `old..new` (HEAD by default)."""
+        return await self.prewarmer.warm(old_commit, new_commit or await self._resolve_head())
+
+    async def _read_blobs_bulk(self, blob_list: List[str], fill_l0: bool = True) -> Dict[str, bytes]:
+        """
+        Reads blobs through L0, one L1 MGET, and concurrent L3 reads, then
+        back-fills L1 with one pipelined write.
+
+        Returns:
+            A mapping of each blob SHA that exists to its content.
+        """
+        # Several paths (or the same path listed twice) can share one blob.
+        keys = {sha: self._blob_cache_key(sha) for sha in blob_list}
+        contents: Dict[str, bytes] = {}
+
+        # --- L0 Pass ---
+        l0_misses: List[str] = []
+        for sha, cache_key in keys.items():
+            cached_value = self.l0.get(cache_key)
+            if cached_value is not None:
+                contents[sha] = cached_value
+            else:
+                l0_misses.append(sha)
+
+        # --- L1 Pass (single MGET) ---
+        l1_misses: List[str] = l0_misses
+        if l0_misses:
+            try:
+                l1_values = await self.l1.mget([keys[sha] for sha in l0_misses])
+                l1_misses = []
+                for sha, cached_value in zip(l0_misses, l1_values):
+                    if cached_value is not None:
+                        contents[sha] = cached_value
+                        if fill_l0:
+                            self.l0.set(keys[sha], cached_value)  # Back-fill L0
+                    else:
+                        l1_misses.append(sha)
+            except MemoryLayerError as e:
+                logging.warning(f"L1 Redis MGET failed for {len(l0_misses)} keys: {e}. Proceeding to L3.")
+
+        # --- L3 Pass ---
+        if l1_misses:
+            logging.info(f"Bulk cache miss for {len(l1_misses)} blobs. Fetching from L3 (Git).")
+            fetched = await self.l3_async.get_blobs(l1_misses)
+            backfill = {keys[sha]: value for sha, value in fetched.items() if value is not None}
+            contents.update({sha: value for sha, value in fetched.items() if value is not None})
+            if backfill:
                 try:
-                    await self.l1.set(cache_key, value)
-                    self.l0.set(cache_key, value)
+                    await self.l1.set_many(backfill)
                 except MemoryLayerError as e:
-                    logging.warning(f"Failed to back-fill cache for key '{cache_key}': {e}")
+                    logging.warning(f"Failed to back-fill L1 for {len(backfill)} keys: {e}")
+                if fill_l0:
+                    for cache_key, value in backfill.items():
+                        self.l0.set(cache_key, value)
+        return contents
 
-            # --- Cleanup and Return ---
-            async with self._locks_lock:
-                self._locks.pop(cache_key, None)
+    async def semantic_search(self, query: str, n_results: int = 5) -> Dict[str, Any]:
+        """
+        Performs a semantic search using the L2 ChromaDB layer.
 
-            if value is None:
-                raise NotFoundError(f"File '{file_path}' not found at commit '{final_commit_hash}'.")
+        Results are cached in L0 and L1 under the normalized query, the result
+        count and the collection version, so repeated searches skip Chroma
+        and every write to the collection retires all earlier entries at once.
+        Identical concurrent misses share a single Chroma query, and different
+        ones arriving together are sent to Chroma as one multi-query call.
+        """
+        normalized = normalize_query(query)
+        version = await self._collection_version() if self.search_cache_ttl > 0 else None
+        if version is None:
+            return await self._flights.do(
+                ("search", normalized, n_results), lambda: self.l2c_async.query(normalized, n_results)
+            )
+        cache_key = self._generate_cache_key("search", f"{n_results}:{normalized}", version)
 
-            return value
+        # --- L0 Check ---
+        cached_result = self.l0.get(cache_key)
+        if cached_result is not None:
+            search_cache_requests_total.labels(result="l0").inc()
+            return cached_result
 
-    async def semantic_search(self, query: str, n_results: int = 5) -> Dict[str, Any]:
-        """Performs a semantic search using the L2 ChromaDB layer."""
+        # --- L1 Check ---
+        try:
+            cached_value = await self.l1.get(cache_key)
+            if cached_value is not None:
+                cached_result = json.loads(cached_value)
+                self.l0.set(cache_key, cached_result)  # Back-fill L0
+                search_cache_requests_total.labels(result="l1").inc()
+                return cached_result
+        except MemoryLayerError as e:
+            logging.warning(f"L1 Redis GET failed for search key '{cache_key}': {e}. Querying L2.")
+
+        # --- Approximate Check ---
+        embedding = None
+        if self.approximate_search is not None:
+            embedding = (await self.l2c_async.embed([normalized]))[0]
+            cached_result = self.approximate_search.get(embedding, n_results, version)
+            if cached_result is not None:
+                search_cache_requests_total.labels(result="approximate").inc()
+                return cached_result
+
+        search_cache_requests_total.labels(result="miss").inc()
         logging.info(f"Performing semantic search in L2 (Chroma) for query: '{query[:50]}...'")
-        return self.l2c.query(query, n_results)
+        result = await self._flights.do(cache_key, lambda: self.l2c_async.query(normalized, n_results))
+        self.l0.set(cache_key, result)
+        try:
+            await self.l1.set(cache_key, json.dumps(result), expire=self.search_cache_ttl)
+        except (MemoryLayerError, TypeError) as e:
+            logging.warning(f"Failed to cache search results for key '{cache_key}': {e}")
+        if embedding is not None:
+            self.approximate_search.put(embedding, n_results, version, result)
+        return result
+
+    async def _collection_version(self) -> Optional[str]:
+        """
+        Returns the shared version of the Chroma collection, or None if it
+        cannot be read, in which case search results must not be cached.
+        The version is only kept in L0 while the invalidation bus can tell
+        this replica that another one bumped it.
+        """
+        if self.invalidation_bus is not None:
+            cached_version = self.l0.get(CHROMA_VERSION_KEY)
+            if cached_version is not None:
+                return cached_version
+        try:
+            value = await self.l1.get(CHROMA_VERSION_KEY)
+        except MemoryLayerError as e:
+            logging.warning(f"Could not read the L2 collection version: {e}. Search results will not be cached.")
+            return None
+        version = value.decode() if value else "0"
+        if self.invalidation_bus is not None:
+            self.l0.set(CHROMA_VERSION_KEY, version)
+        return version
+
+    async def add_document(self, doc_id: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Adds or updates a document in the L2 Chroma layer, batched with
+        concurrent writes, then bumps the collection version so cached search
+        results on every replica stop being served.
+        """
+        logging.info(f"Upserting document '{doc_id}' into L2 (Chroma).")
+        await self.l2c_async.add_document(doc_id, content, metadata)
+        await self._bump_collection_version()
+
+    async def add_documents_bulk(
+        self,
+        documents: AsyncIterator[Dict[str, Any]],
+        batch_size: int = CHROMA_BULK_BATCH_SIZE,
+        max_batch_bytes: int = CHROMA_BULK_MAX_BATCH_BYTES,
+    ) -> BulkUpsertResult:
+        """
+        Upserts a stream of documents into the L2 Chroma layer in size- and
+        count-bounded batches, skipping documents whose content is unchanged.
+        The next batch is read from the stream while nothing else is held in
+        memory, and the collection version is bumped once per batch that
+        wrote anything.
+
+        Args:
+            documents: Dicts with `id`, `content`, and optional `metadata` and `embedding`.
+            batch_size: The maximum number of documents per write.
+            max_batch_bytes: The approximate maximum content bytes per write.
+        """
+        result = BulkUpsertResult()
+        start = time.perf_counter()
+
+        async def write(batch: List[Dict[str, Any]]) -> None:
+            batch_start = time.perf_counter()
+            upserted = await self.l2c_async.upsert_changed(batch)
+            result.batch_latencies.append(time.perf_counter() - batch_start)
+            result.received += len(batch)
+            result.upserted += upserted
+            result.skipped += len(batch) - upserted
+            if upserted:
+                await self._bump_collection_version()
+
+        batcher = DocumentBatcher(batch_size, max_batch_bytes)
+        async for document in documents:
+            batch = batcher.add(document)
+            if batch:
+                await write(batch)
+        batch = batcher.flush()
+        if batch:
+            await write(batch)
+
+        result.seconds = time.perf_counter() - start
+        logging.info(
+            f"Bulk upserted {result.upserted} of {result.received} documents into L2 (Chroma) "
+            f"({result.skipped} unchanged) at {result.docs_per_second:.0f} docs/s."
+        )
+        return result
+
+    async def _bump_collection_version(self) -> None:
+        """Retires every cached search result on every replica."""
+        try:
+            await self.l1.incr(CHROMA_VERSION_KEY)
+        except MemoryLayerError as e:
+            logging.warning(f"Failed to bump the L2 collection version: {e}. Cached searches may be stale for up to {self.search_cache_ttl}s.")
+        self.l0.delete(CHROMA_VERSION_KEY)
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.publish([CHROMA_VERSION_KEY])
 
     async def persist_node(self, class_name: str, data: Dict[str, Any]) -> str:
         """Persists a new data object (node) to the L2 Weaviate layer."""
         logging.info(f"Persisting node to L2 (Weaviate) in class '{class_name}'.")
-        uuid = self.l2w.add_node(class_name, data)
+        uuid = await self.l2w_async.add_node(class_name, data)
         logging.info(f"Successfully persisted object to L2 with UUID: {uuid}")
         return uuid
 
     async def set_cache_item(self, key: str, value: Any, expire_seconds: int = 3600):
         """
-        Explicitly sets a value in the cache layers (L0, L1).
+        Explicitly sets a value in the cache layers (L0, L1) and evicts the key
+        from the L0 of every other replica so none of them keeps serving the
+        previous value.
         """
         logging.info(f"Setting cache for key '{key}' with TTL {expire_seconds}s.")
         self.l0.set(key, value)
@@ -142,3 +634,5 @@ class MemoryManager:
             await self.l1.set(key, value_to_store, expire=expire_seconds)
         except MemoryLayerError as e:
             logging.warning(f"L1 Redis SET failed for key '{key}': {e}.")
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.publish([key])
@@ -1,5 +1,5 @@
 import os
-from prometheus_client import Counter, CollectorRegistry, multiprocess
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, multiprocess
 
 registry = CollectorRegistry()
 if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
@@ -8,3 +8,55 @@ if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
 documents_ingested_total = Counter(
     "documents_ingested_total", "Total documents ingested", registry=registry
 )
+
+# --- L0 Cache Metrics ---
+l0_cache_hits_total = Counter(
+    "l0_cache_hits_total", "Total L0 cache hits", registry=registry
+)
+l0_cache_misses_total = Counter(
+    "l0_cache_misses_total", "Total L0 cache misses", registry=registry
+)
+l0_cache_evictions_total = Counter(
+    "l0_cache_evictions_total", "Total L0 entries evicted to stay within the byte budget", registry=registry
+)
+l0_cache_rejections_total = Counter(
+    "l0_cache_rejections_total", "Total L0 insertions refused by the TinyLFU admission filter", registry=registry
+)
+l0_cache_bytes = Gauge(
+    "l0_cache_bytes", "Current size of the byte-budgeted L0 cache in bytes", registry=registry
+)
+
+# --- Distributed Single-Flight Metrics ---
+l3_lease_hold_seconds = Histogram(
+    "l3_lease_hold_seconds", "Time a replica held the L3 fetch lease for a key", registry=registry
+)
+l3_lease_wait_seconds = Histogram(
+    "l3_lease_wait_seconds", "Time a replica waited for another replica's L3 fetch", registry=registry
+)
+l3_lease_waits_total = Counter(
+    "l3_lease_waits_total", "Total waits on another replica's L3 fetch", ["outcome"], registry=registry
+)
+
+# --- Cache Pre-warm Metrics ---
+cache_prewarm_seconds = Histogram(
+    "cache_prewarm_seconds", "Time taken to pre-warm the files changed by a new commit", registry=registry
+)
+cache_prewarm_files_total = Counter(
+    "cache_prewarm_files_total", "Total files loaded into the caches by the pre-warmer", registry=registry
+)
+cache_prewarm_reads_total = Counter(
+    "cache_prewarm_reads_total", "Reads of pre-warmed files, by whether they were served from cache", ["outcome"], registry=registry
+)
+
+# --- L2 Chroma Metrics ---
+search_cache_requests_total = Counter(
+    "search_cache_requests_total", "Semantic searches by the cache tier that answered them", ["result"], registry=registry
+)
+
+# --- Embedding Service Metrics ---
+embedding_requests_total = Counter(
+    "embedding_requests_total", "Texts embedded by the shared service, by the tier that answered", ["tier"], registry=registry
+)
+embedding_model_seconds = Histogram(
+    "embedding_model_seconds", "Time spent in the embedding model per batch", registry=registry
+)
@@ -0,0 +1,134 @@
+# core/prewarm.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Set
+
+from .metrics import cache_prewarm_seconds, cache_prewarm_files_total, cache_prewarm_reads_total
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .manager import MemoryManager
+
+
+@dataclass(frozen=True)
+class PrewarmResult:
+    """
+    The outcome of one pre-warm pass.
+
+    Attributes:
+        old_commit: The commit the diff was taken from.
+        new_commit: The commit whose blobs were loaded.
+        changed: The number of added or modified paths in the diff.
+        warmed: The number of changed paths whose content is now cached, including
+                paths that were already cached and paths sharing a blob.
+        seconds: Wall-clock duration of the pass.
+    """
+
+    old_commit: str
+    new_commit: str
+    changed: int
+    warmed: int
+    seconds: float
+
+
+class CachePrewarmer:
+    """
+    Loads the files changed by a new commit into the caches before agents ask for them.
+
+    When HEAD moves every agent tends to request the same freshly changed
+    files at once, and all of them miss. The pre-warmer diffs `old..new`
+    through L3, drops deleted paths, and reads the rest through the
+    manager's bulk path in bounded-concurrency batches, which back-fills L1
+    (and L0 when `warm_l0` is set). It also remembers the cache keys it
+    loaded so the hit rate of reads after a warm-up can be measured.
+    """
+
+    def __init__(
+        self,
+        manager: "MemoryManager",
+        batch_size: int = 200,
+        concurrency: int = 4,
+        max_paths: int = 5000,
+        warm_l0: bool = False,
+    ):
+        """
+        Args:
+            manager: The memory manager whose caches are warmed.
+            batch_size: Paths read per bulk call.
+            concurrency: Bulk calls allowed in flight at once.
+            max_paths: Upper bound on paths warmed per pass. Larger diffs are truncated.
+            warm_l0: Also load the blobs into this replica's L0.
+        """
+        self.manager = manager
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.max_paths = max_paths
+        self.warm_l0 = warm_l0
+        self.last_result: Optional[PrewarmResult] = None
+        self._warmed_keys: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def warm(self, old_commit: str, new_commit: str) -> PrewarmResult:
+        """Warms the caches with every path added or modified in `old..new`."""
+        start = time.perf_counter()
+        changes = await self.manager.l3_async.diff_paths(old_commit, new_commit)
+        paths = [path for path, status in changes.items() if status != "D"]
+        if len(paths) > self.max_paths:
+            logging.warning(f"Pre-warm of {new_commit[:7]} truncated to {self.max_paths} of {len(paths)} changed paths.")
+            paths = paths[:self.max_paths]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        warmed_keys: Set[str] = set()
+
+        async def warm_batch(batch: List[str]) -> int:
+            async with semaphore:
+                keys = await self.manager.warm_files(batch, new_commit, fill_l0=self.warm_l0)
+                warmed_keys.update(keys.values())
+                return len(keys)
+
+        batches = [paths[i:i + self.batch_size] for i in range(0, len(paths), self.batch_size)]
+        counts = await asyncio.gather(*(warm_batch(batch) for batch in batches))
+        self._warmed_keys = warmed_keys
+
+        result = PrewarmResult(old_commit, new_commit, len(paths), sum(counts), time.perf_counter() - start)
+        self.last_result = result
+        cache_prewarm_seconds.observe(result.seconds)
+        cache_prewarm_files_total.inc(result.warmed)
+        logging.info(f"Pre-warmed {result.warmed}/{result.changed} changed files for {new_commit[:7]} in {result.seconds:.2f}s.")
+        return result
+
+    def schedule(self, old_commit: str, new_commit: str) -> asyncio.Task:
+        """
+        Starts a warm-up in the background, cancelling one still running for
+        an older commit since its files are about to be superseded.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = asyncio.create_task(self._warm_logged(old_commit, new_commit))
+        return self._task
+
+    async def on_head_moved(self, old_commit: str, new_commit: str) -> None:
+        """A `HeadWatcher` listener that warms in the background without stalling the watcher."""
+        self.schedule(old_commit, new_commit)
+
+    async def close(self) -> None:
+        """Cancels a running warm-up."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def observe(self, cache_key: str, hit: bool) -> None:
+        """Records whether a read of a pre-warmed key was served from cache."""
+        if cache_key in self._warmed_keys:
+            cache_prewarm_reads_total.labels(outcome="hit" if hit else "miss").inc()
+
+    async def _warm_logged(self, old_commit: str, new_commit: str) -> None:
+        try:
+            await self.warm(old_commit, new_commit)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"Pre-warm of {new_commit[:7]} failed: {e}")
@@ -0,0 +1,61 @@
+# core/search_cache.py
+
+import collections
+import threading
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    """Canonicalizes a search query so trivially different spellings share a cache entry."""
+    return " ".join(query.casefold().split())
+
+
+class ApproximateSearchCache:
+    """
+    Reuses search results for queries whose embeddings are nearly identical.
+
+    Keeps the embeddings of the most recent distinct queries in a bounded
+    ring, with the results they produced. A lookup returns the stored result
+    of the most similar earlier query with the same `top_k` and collection
+    version, provided their cosine similarity reaches `threshold`. This is a
+    deliberate trade of exactness for latency and is disabled unless a
+    threshold is configured.
+    """
+
+    def __init__(self, threshold: float, maxsize: int = 256):
+        """
+        Args:
+            threshold: The minimum cosine similarity for a reuse, e.g. 0.98.
+            maxsize: The number of recent queries kept.
+        """
+        self.threshold = threshold
+        self._entries: Deque[Tuple[Tuple[int, str], np.ndarray, Dict[str, Any]]] = collections.deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm else array
+
+    def get(self, embedding: Sequence[float], top_k: int, version: str) -> Optional[Dict[str, Any]]:
+        """Returns the result of the closest earlier query, if it is close enough."""
+        query = self._unit(embedding)
+        with self._lock:
+            candidates: List[Tuple[np.ndarray, Dict[str, Any]]] = [
+                (vector, result) for scope, vector, result in self._entries if scope == (top_k, version)
+            ]
+        if not candidates:
+            return None
+        similarities = np.stack([vector for vector, _ in candidates]) @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return candidates[best][1]
+        return None
+
+    def put(self, embedding: Sequence[float], top_k: int, version: str, result: Dict[str, Any]) -> None:
+        """Remembers a query's embedding and result, evicting the oldest entry when full."""
+        with self._lock:
+            self._entries.append(((top_k, version), self._unit(embedding), result))
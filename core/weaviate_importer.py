@@ -0,0 +1,224 @@
+# core/weaviate_importer.py
+
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+# Namespace for deterministic object IDs; changing it would duplicate every
+# object on the next import.
+SENTINEL_NAMESPACE = uuid.UUID("6f1c7a52-3d1e-5b8e-9a47-2b0c5f8e1d93")
+
+# (object id, properties)
+PendingObject = Tuple[str, Dict[str, Any]]
+
+
+def deterministic_uuid(source: str, chunk_index: int) -> str:
+    """
+    Returns a stable object ID for chunk `chunk_index` of `source`, so
+    re-importing the same chunk replaces the existing object instead of
+    adding a duplicate.
+    """
+    return str(uuid.uuid5(SENTINEL_NAMESPACE, f"{source}#{chunk_index}"))
+
+
+@dataclass
+class ImportResult:
+    """
+    The outcome of a batch import.
+
+    Attributes:
+        total: Objects submitted.
+        succeeded: Objects Weaviate accepted.
+        failed_ids: IDs of objects that still failed after every retry.
+        errors: The last error message for each failed ID.
+        retries: Batch attempts that had to be repeated.
+        seconds: Wall-clock duration of the import.
+    """
+
+    total: int = 0
+    succeeded: int = 0
+    failed_ids: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.succeeded / self.seconds if self.seconds > 0 else 0.0
+
+
+class BatchImporter:
+    """
+    Imports objects through Weaviate's REST batch endpoint with concurrent workers.
+
+    Objects are grouped into batches and handed to worker threads through a
+    bounded queue, so a producer reading from disk or a chunking pool is
+    held back instead of buffering the whole import in memory. Weaviate
+    reports success per object; objects that failed, and whole batches that
+    failed in transit, are retried with exponential backoff and jitter.
+    Objects whose ID already exists are replaced, which makes imports with
+    deterministic IDs idempotent upserts.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        workers: int = 4,
+        batch_size: int = 100,
+        queue_size: int = 8,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 60.0,
+        client: Optional[httpx.Client] = None,
+        embed: Optional[Callable[[List[str]], Sequence[Sequence[float]]]] = None,
+        vector_property: str = "content",
+    ):
+        """
+        Args:
+            url: The Weaviate base URL, e.g. "http://localhost:8080".
+            workers: Batches sent concurrently.
+            batch_size: Objects per batch request.
+            queue_size: Batches allowed to wait for a worker.
+            max_retries: Extra attempts for failed objects or batches.
+            backoff: The delay before the first retry, in seconds. Doubles per attempt.
+            timeout: The HTTP timeout per batch request, in seconds.
+            client: An HTTP client to reuse. One with a pool sized for `workers` is created otherwise.
+            embed: Computes vectors client-side, for classes without a vectorizer. Runs in the workers.
+            vector_property: The text property passed to `embed`.
+        """
+        self.endpoint = f"{url.rstrip('/')}/v1/batch/objects"
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.client = client or httpx.Client(
+            timeout=timeout, limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers)
+        )
+        self.embed = embed
+        self.vector_property = vector_property
+        self._lock = threading.Lock()
+
+    def import_objects(
+        self,
+        class_name: str,
+        objects: Iterable[Dict[str, Any]],
+        uuids: Optional[Iterable[Optional[str]]] = None,
+    ) -> ImportResult:
+        """
+        Imports objects into a class.
+
+        Args:
+            class_name: The Weaviate class to import into.
+            objects: The objects' properties. May be a generator.
+            uuids: IDs aligned with `objects`. Objects without one get a random ID.
+
+        Returns:
+            Counts, throughput and the IDs that could not be imported.
+        """
+        result = ImportResult()
+        start = time.perf_counter()
+        batches: "queue.Queue[Optional[List[PendingObject]]]" = queue.Queue(maxsize=self.queue_size)
+        threads = [
+            threading.Thread(target=self._worker, args=(class_name, batches, result), name=f"weaviate_import_{i}")
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            id_iter = iter(uuids) if uuids is not None else None
+            batch: List[PendingObject] = []
+            for properties in objects:
+                object_id = next(id_iter, None) if id_iter is not None else None
+                batch.append((object_id or str(uuid.uuid4()), properties))
+                if len(batch) >= self.batch_size:
+                    batches.put(batch)  # Blocks while every worker is busy.
+                    batch = []
+            if batch:
+                batches.put(batch)
+        finally:
+            for _ in threads:
+                batches.put(None)
+            for thread in threads:
+                thread.join()
+        result.seconds = time.perf_counter() - start
+        logging.info(
+            f"Imported {result.succeeded}/{result.total} objects into '{class_name}' at "
+            f"{result.objects_per_second:.0f} objects/s ({result.retries} retries, {len(result.failed_ids)} failed)."
+        )
+        return result
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _worker(self, class_name: str, batches: "queue.Queue[Optional[List[PendingObject]]]", result: ImportResult) -> None:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                return
+            try:
+                succeeded, errors, retries = self._send_with_retries(class_name, batch)
+            except Exception as e:
+                # A dead worker would leave the producer blocked on a full queue.
+                logging.exception(f"Unexpected error importing a batch into '{class_name}'.")
+                succeeded, errors, retries = 0, {object_id: str(e) for object_id, _ in batch}, 0
+            with self._lock:
+                result.total += len(batch)
+                result.succeeded += succeeded
+                result.retries += retries
+                result.failed_ids.extend(errors)
+                result.errors.update(errors)
+
+    def _send_with_retries(self, class_name: str, batch: List[PendingObject]) -> Tuple[int, Dict[str, str], int]:
+        pending = batch
+        succeeded = 0
+        errors: Dict[str, str] = {}
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)) * (0.5 + random.random()))
+            errors = self._send(class_name, pending)
+            succeeded += len(pending) - len(errors)
+            if not errors:
+                return succeeded, {}, attempt
+            pending = [(object_id, properties) for object_id, properties in pending if object_id in errors]
+            logging.warning(f"{len(errors)} objects failed to import into '{class_name}' (attempt {attempt + 1}).")
+        return succeeded, errors, self.max_retries
+
+    def _send(self, class_name: str, batch: List[PendingObject]) -> Dict[str, str]:
+        """Sends one batch and returns {id: error message} for the objects that failed."""
+        objects = [{"class": class_name, "id": object_id, "properties": properties} for object_id, properties in batch]
+        if self.embed is not None:
+            embeddable = [obj for obj in objects if isinstance(obj["properties"].get(self.vector_property), str)]
+            try:
+                vectors = self.embed([obj["properties"][self.vector_property] for obj in embeddable])
+            except Exception as e:
+                return {object_id: f"Embedding failed: {e}" for object_id, _ in batch}
+            for obj, vector in zip(embeddable, vectors):
+                obj["vector"] = [float(v) for v in vector]
+        body = {"objects": objects}
+        try:
+            response = self.client.post(self.endpoint, json=body)
+            response.raise_for_status()
+            items = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            return {object_id: str(e) for object_id, _ in batch}
+        if not isinstance(items, list):
+            return {object_id: f"Unexpected batch response: {str(items)[:200]}" for object_id, _ in batch}
+        sent = {object_id for object_id, _ in batch}
+        errors: Dict[str, str] = {}
+        for item in items:
+            if not isinstance(item, dict) or item.get("id") not in sent:
+                continue
+            item_errors = (((item.get("result") or {}).get("errors") or {}).get("error")) or []
+            if item_errors:
+                errors[item["id"]] = "; ".join(
+                    str(error.get("message", "")) if isinstance(error, dict) else str(error) for error in item_errors
+                )
+        return errors
@@ -9,10 +9,13 @@ import os
 
 from api.routes import router
 from api.advanced_routes import router as advanced_router
+from api.admin_routes import router as admin_router
 from api.dependencies import get_memory_manager
 from core.metrics import registry
-from core.config import LOG_LEVEL
+from core.config import LOG_LEVEL, PREWARM_ON_HEAD_MOVE
 from core.logging import setup_logging
+from core.embeddings import close_default_embedding_service
+from core.l2_weaviate_async import close_shared_clients
 from core.exceptions import MemoryLayerError, NotFoundError
 from core.manager import MemoryManager
 
@@ -34,6 +37,10 @@ async def lifespan(app: FastAPI):
                 f"A critical memory layer failed to start: {e}. Shutting down."
             )
             raise e
+        if PREWARM_ON_HEAD_MOVE and manager.head_watcher is not None:
+            # Warm the files of each new commit in the background so agents
+            # hit the caches from the first request after a push.
+            manager.head_watcher.add_listener(manager.prewarmer.on_head_moved)
     else:
         manager = None
 
@@ -42,6 +49,9 @@ async def lifespan(app: FastAPI):
     finally:
         if manager is not None:
             await manager.shutdown()
+        # Process-wide clients shared by the manager and RAG retrieval.
+        await close_shared_clients()
+        await close_default_embedding_service()
 
 app = FastAPI(
     title="Sentinel AI Memory Service",
@@ -87,6 +97,7 @@ async def generic_exception_handler(request: Request, exc: Exception):
 # Include the API routers without a versioned prefix
 app.include_router(router)
 app.include_router(advanced_router)
+app.include_router(admin_router)
 
 @app.get("/health", tags=["Health"])
 async def health_check(manager: MemoryManager = Depends(get_memory_manager)):
@@ -0,0 +1,179 @@
+"""In-process cosine-similarity index for `VectorStore`."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class LocalVectorIndex:
+    """
+    Keeps unit-normalized vectors in a NumPy matrix and searches them by cosine similarity.
+
+    Up to `brute_force_limit` vectors every query scans the whole matrix,
+    which is exact and takes microseconds at that size. Above it, an IVF
+    index is trained with a few rounds of k-means: each vector is filed
+    under its nearest centroid and a query only scans the `nprobe` lists
+    whose centroids are closest to it. The index is retrained once the
+    collection has doubled since the last training.
+    """
+
+    def __init__(self, dim: int, brute_force_limit: int = 10000, nprobe: int = 8, initial_capacity: int = 1024) -> None:
+        self.dim = dim
+        self.brute_force_limit = brute_force_limit
+        self.nprobe = nprobe
+        self._vectors = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._trained_size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, entry_id: str, text: str, vector: Sequence[float]) -> None:
+        """Adds an entry, replacing any entry with the same ID."""
+        self.add_many([entry_id], [text], np.asarray([vector], dtype=np.float32))
+
+    def add_many(self, ids: Sequence[str], texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Adds many entries at once; `vectors` has one row per ID."""
+        ids, texts = list(ids), list(texts)
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        with self._lock:
+            self._reserve(len(self._ids) + len(ids))
+            if self._centroids is None and len(set(ids)) == len(ids) and not any(i in self._positions for i in ids):
+                # Only new entries and no IVF lists to maintain: one block copy.
+                start = len(self._ids)
+                self._vectors[start:start + len(ids)] = vectors
+                self._positions.update((entry_id, start + offset) for offset, entry_id in enumerate(ids))
+                self._ids.extend(ids)
+                self._texts.extend(texts)
+                ids = texts = ()
+            for entry_id, text, vector in zip(ids, texts, vectors):
+                position = self._positions.get(entry_id)
+                if position is None:
+                    position = len(self._ids)
+                    self._reserve(position + 1)
+                    self._ids.append(entry_id)
+                    self._texts.append(text)
+                    self._positions[entry_id] = position
+                else:
+                    self._texts[position] = text
+                    if self._centroids is not None:
+                        # The old row is filed under its old centroid.
+                        for members in self._lists:
+                            if position in members:
+                                members.remove(position)
+                self._vectors[position] = vector
+                if self._centroids is not None:
+                    self._lists[int(np.argmax(self._centroids @ vector))].append(position)
+            if len(self._ids) > self.brute_force_limit and len(self._ids) >= 2 * self._trained_size:
+                self._train()
+
+    def search(self, vector: Sequence[float], top_k: int = 3) -> List[Tuple[str, str, float]]:
+        """Returns up to `top_k` (id, text, cosine similarity) tuples, most similar first."""
+        return self.search_many(np.asarray([vector], dtype=np.float32), top_k)[0]
+
+    def search_many(self, vectors: np.ndarray, top_k: int = 3) -> List[List[Tuple[str, str, float]]]:
+        """`search` for every row of `vectors`; without IVF all rows are scored in one matrix product."""
+        queries = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        with self._lock:
+            count = len(self._ids)
+            if count == 0 or top_k <= 0:
+                return [[] for _ in queries]
+            if self._centroids is not None:
+                return [self._search_ivf(query, top_k) for query in queries]
+            scores = queries @ self._vectors[:count].T
+            k = min(top_k, count)
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1)
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            return [
+                [(self._ids[p], self._texts[p], float(s)) for p, s in zip(row, row_scores)]
+                for row, row_scores in zip(best, best_scores)
+            ]
+
+    def _search_ivf(self, query: np.ndarray, top_k: int) -> List[Tuple[str, str, float]]:
+        probes = np.argsort(self._centroids @ query)[::-1][: self.nprobe]
+        candidates = np.fromiter((position for probe in probes for position in self._lists[probe]), dtype=np.int64)
+        scores = self._vectors[candidates] @ query
+        k = min(top_k, len(scores))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(self._ids[p], self._texts[p], float(s)) for p, s in zip(candidates[best], scores[best])]
+
+    def save(self, path: str) -> None:
+        """Writes the vectors to `<path>.npy` and the IDs and texts to `<path>.json`."""
+        with self._lock:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.save(f"{path}.npy", self._vectors[: len(self._ids)])
+            tmp = f"{path}.json.tmp"
+            with open(tmp, "w", encoding="utf-8") as handle:
+                json.dump({"dim": self.dim, "ids": self._ids, "texts": self._texts}, handle)
+            os.replace(tmp, f"{path}.json")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, **kwargs) -> "LocalVectorIndex":
+        """
+        Loads an index written by `save`.
+
+        With `mmap` the vectors stay in the file and are paged in on demand;
+        they are copied into memory on the first write.
+        """
+        with open(f"{path}.json", encoding="utf-8") as handle:
+            meta = json.load(handle)
+        index = cls(meta["dim"], **kwargs)
+        index._vectors = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        index._ids = list(meta["ids"])
+        index._texts = list(meta["texts"])
+        index._positions = {entry_id: position for position, entry_id in enumerate(index._ids)}
+        if len(index._ids) > index.brute_force_limit:
+            with index._lock:
+                index._train()
+        return index
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+        grown = np.zeros((max(size, 2 * len(self._vectors), 1), self.dim), dtype=np.float32)
+        grown[: len(self._ids)] = self._vectors[: len(self._ids)]
+        self._vectors = grown
+
+    def _train(self, iterations: int = 10, sample_size: int = 50000) -> None:
+        count = len(self._ids)
+        data = self._vectors[:count]
+        nlist = max(1, min(4096, int(np.sqrt(count))))
+        rng = np.random.default_rng(0)
+        sample = data[rng.choice(count, size=min(count, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assignment == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = self._normalize(centroids)
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        self._lists = [[] for _ in range(nlist)]
+        for position, c in enumerate(assignment):
+            self._lists[c].append(position)
+        self._centroids = centroids
+        self._trained_size = count
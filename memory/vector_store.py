@@ -1,28 +1,87 @@
 from __future__ import annotations
 
-"""Simple vector store client backed by Weaviate."""
+"""Simple vector store client backed by Weaviate, with an optional in-process index."""
 
-from typing import Any, List, Optional
-import hashlib
+from typing import Any, List, Optional, Sequence
+import asyncio
+import os
+import threading
+import uuid
 
 import numpy as np
 import weaviate
 
+from core.embeddings import EmbeddingService, HashingBackend
+from core.l2_weaviate_async import AsyncL2Weaviate, get_async_weaviate
+from memory.vector_index import LocalVectorIndex
+
+EMBEDDING_DIM = 32
+
 
 class VectorStore:
-    """Store and retrieve reasoning chains or attack paths as vectors."""
+    """
+    Store and retrieve reasoning chains or attack paths as vectors.
+
+    With a local index, similarity queries are answered in-process and
+    writes go to both the index and Weaviate. With `offline=True` the store
+    never contacts Weaviate, which suits tests and disconnected runs. An
+    index that did not come from `index_path` or the caller starts empty, so
+    it is filled from the Weaviate class before it answers its first query.
+    """
+
+    # Objects fetched per request when filling the local index from Weaviate.
+    BACKFILL_PAGE_SIZE = 500
 
     def __init__(
         self,
-        url: str,
+        url: Optional[str] = None,
         class_name: str = "ReasoningMemory",
         client: Optional[Any] = None,
+        async_client: Optional[AsyncL2Weaviate] = None,
+        index: Optional[LocalVectorIndex] = None,
+        index_path: Optional[str] = None,
+        offline: bool = False,
+        embedding_service: Optional[EmbeddingService] = None,
     ) -> None:
-        self.client = client or weaviate.Client(url)
-        if not self.client.is_ready():
-            raise ConnectionError("Weaviate server is not ready")
+        """
+        Args:
+            url: The Weaviate URL. Not needed when `offline`.
+            class_name: The Weaviate class holding the entries.
+            client: A Weaviate client to use instead of connecting to `url`.
+            async_client: An async client to use instead of the process-wide one.
+            index: A local index to serve queries from.
+            index_path: Where the local index is saved; loaded from there when present.
+            offline: Keep entries only in the local index.
+            embedding_service: The shared embedding service. Defaults to the
+                32-dimensional hashing embedding entries have always used.
+        """
+        # Not the process-wide service: the class already holds 32-dimensional hash vectors, and
+        # hashing a text costs less than looking it up, so this service caches nothing.
+        self.embeddings = embedding_service or EmbeddingService(HashingBackend(EMBEDDING_DIM), memory_cache_size=0)
+        self.url = url
         self.class_name = class_name
-        self._ensure_schema()
+        self.index_path = index_path
+        if index is None and index_path and os.path.exists(f"{index_path}.json"):
+            index = LocalVectorIndex.load(index_path)
+        self._needs_backfill = False
+        self._backfill_lock = threading.Lock()
+        if index is None and (offline or index_path):
+            index = LocalVectorIndex(self.embeddings.dim)
+            self._needs_backfill = not offline
+        self.index = index
+        self.offline = offline
+        self._async_client = async_client
+        self.client = None
+        if not offline:
+            self.client = client or weaviate.Client(url)
+            if not self.client.is_ready():
+                raise ConnectionError("Weaviate server is not ready")
+            self._ensure_schema()
+
+    def save_index(self) -> None:
+        """Writes the local index to `index_path`."""
+        if self.index is not None and self.index_path:
+            self.index.save(self.index_path)
 
     def _ensure_schema(self) -> None:
         if hasattr(self.client, "schema") and hasattr(self.client.schema, "contains"):
@@ -38,20 +97,61 @@ class VectorStore:
                 }
                 self.client.schema.create(schema)
 
-    @staticmethod
-    def _embed(text: str) -> List[float]:
-        digest = hashlib.sha256(text.encode()).digest()
-        # Normalize bytes to floats for a deterministic embedding
-        return [b / 255.0 for b in digest[:32]]
+    def _backfill_index(self) -> None:
+        # Entries written to Weaviate before this index existed must be searchable too.
+        if not self._needs_backfill:
+            return
+        with self._backfill_lock:
+            if self._needs_backfill:
+                self._backfill_pages()
+                self._needs_backfill = False
+
+    def _backfill_pages(self) -> None:
+        after: Optional[str] = None
+        while True:
+            query = (
+                self.client.query.get(self.class_name, ["text"])
+                .with_additional(["id", "vector"])
+                .with_limit(self.BACKFILL_PAGE_SIZE)
+            )
+            if after is not None:
+                query = query.with_after(after)
+            docs = query.do().get("data", {}).get("Get", {}).get(self.class_name) or []
+            if docs:
+                texts = [d["text"] for d in docs]
+                stored = [d["_additional"].get("vector") for d in docs]
+                if all(vector is not None and len(vector) == self.embeddings.dim for vector in stored):
+                    vectors = np.asarray(stored, dtype=np.float32)
+                else:
+                    vectors = self._vectors(texts)
+                self.index.add_many([d["_additional"]["id"] for d in docs], texts, vectors)
+                after = docs[-1]["_additional"]["id"]
+            if len(docs) < self.BACKFILL_PAGE_SIZE:
+                break
+
+    def _vectors(self, texts: Sequence[str]) -> np.ndarray:
+        return self.embeddings.embed(texts)
+
+    def _vector(self, text: str) -> List[float]:
+        return self._vectors([text])[0].tolist()
 
     def add_entry(self, text: str) -> str:
-        vector = self._embed(text)
-        return self.client.data_object.create(
-            data_object={"text": text}, class_name=self.class_name, vector=vector
-        )
+        vector = self._vector(text)
+        if self.offline:
+            entry_id = str(uuid.uuid4())
+        else:
+            entry_id = self.client.data_object.create(
+                data_object={"text": text}, class_name=self.class_name, vector=vector
+            )
+        if self.index is not None:
+            self.index.add(str(entry_id), text, vector)
+        return entry_id
 
     def query_similar(self, text: str, top_k: int = 3) -> List[str]:
-        vector = self._embed(text)
+        vector = self._vector(text)
+        if self.index is not None:
+            self._backfill_index()
+            return [entry_text for _, entry_text, _ in self.index.search(vector, top_k)]
         result = (
             self.client.query.get(self.class_name, ["text"])
             .with_near_vector({"vector": vector})
@@ -60,3 +160,50 @@ class VectorStore:
         )
         docs = result.get("data", {}).get("Get", {}).get(self.class_name, [])
         return [d["text"] for d in docs]
+
+    def add_entries(self, texts: Sequence[str], batch_size: int = 200) -> List[str]:
+        """Adds many entries with one embedding pass and batched Weaviate writes; returns their IDs."""
+        texts = list(texts)
+        vectors = self._vectors(texts)
+        entry_ids = [str(uuid.uuid4()) for _ in texts]
+        if not self.offline:
+            self.client.batch.configure(batch_size=batch_size, dynamic=True)
+            with self.client.batch as batch:
+                for entry_id, text, vector in zip(entry_ids, texts, vectors):
+                    batch.add_data_object({"text": text}, self.class_name, uuid=entry_id, vector=vector.tolist())
+        if self.index is not None:
+            self.index.add_many(entry_ids, texts, vectors)
+        return entry_ids
+
+    def query_similar_many(self, texts: Sequence[str], top_k: int = 3) -> List[List[str]]:
+        """`query_similar` for many texts; answered in one matrix product by the local index when there is one."""
+        if self.index is None:
+            return [self.query_similar(text, top_k) for text in texts]
+        self._backfill_index()
+        return [
+            [entry_text for _, entry_text, _ in hits]
+            for hits in self.index.search_many(self._vectors(texts), top_k)
+        ]
+
+    @property
+    def async_client(self) -> AsyncL2Weaviate:
+        # The process-wide client unless one was injected, so async callers share its pool and write batches.
+        return self._async_client or get_async_weaviate(self.url)
+
+    async def add_entry_async(self, text: str) -> str:
+        """Async `add_entry`, batched with concurrent writes through the shared client."""
+        if self.offline:
+            return self.add_entry(text)
+        vector = self._vector(text)
+        entry_id = await self.async_client.add_node(self.class_name, {"text": text}, vector=vector)
+        if self.index is not None:
+            self.index.add(entry_id, text, vector)
+        return entry_id
+
+    async def query_similar_async(self, text: str, top_k: int = 3) -> List[str]:
+        """Async `query_similar` through the shared client, or the local index when there is one."""
+        if self.index is not None:
+            # Off the event loop: the first query may fill the index from Weaviate.
+            return await asyncio.to_thread(self.query_similar, text, top_k)
+        docs = await self.async_client.query(self.class_name, ["text"], near_vector=self._vector(text), limit=top_k)
+        return [d["text"] for d in docs]
@@ -15,5 +15,13 @@ if not OPENAI_API_KEY:
 # Memory Configuration
 CHROMA_DB_PATH: str = os.getenv("CHROMA_DB_PATH", "/app/chroma_data")
 
+# RAG Retrieval
+RAG_TOP_K: int = int(os.getenv("RAG_TOP_K", "3"))
+# Characters of retrieved context handed to the prompt.
+RAG_CONTEXT_MAX_CHARS: int = int(os.getenv("RAG_CONTEXT_MAX_CHARS", "12000"))
+RAG_RRF_K: int = int(os.getenv("RAG_RRF_K", "60"))
+# Seconds a retrieved context is reused for the same query. 0 disables the cache.
+RAG_CACHE_TTL_SECONDS: float = float(os.getenv("RAG_CACHE_TTL_SECONDS", "300"))
+
 # Logging
 LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
\ No newline at end of file
@@ -1,64 +1,215 @@
 import os
+import asyncio
 import logging
-from core.l2_weaviate import L2Weaviate
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from cachetools import TTLCache
+from core.config import WEAVIATE_SERVICE_EMBEDDINGS
+from core.embeddings import EmbeddingService, default_embedding_service
+from core.l2_weaviate_async import AsyncL2Weaviate, get_async_weaviate
+from core.coalesce import SingleFlight
+from core.exceptions import MemoryLayerError
+from core.search_cache import normalize_query
+from orchestrator.core.config import RAG_TOP_K, RAG_CONTEXT_MAX_CHARS, RAG_RRF_K, RAG_CACHE_TTL_SECONDS
 
 logger = logging.getLogger(__name__)
 
 
-def unified_search(query: str, weaviate_manager: L2Weaviate, top_k: int = 3) -> str:
-    """Perform a hybrid search across Code and Document classes."""
-    logger.info(f"Performing unified search for query: '{query}'")
-    near_text_filter = {"concepts": [query]}
-    try:
-        code_results = (
-            weaviate_manager.client.query.get("Code", ["file_path", "content"]).with_near_text(near_text_filter).with_limit(top_k).do()
-        )
-    except Exception as e:
-        logger.error(f"Error querying 'Code' class in Weaviate: {e}")
-        code_results = {}
+@dataclass(frozen=True)
+class RetrievedChunk:
+    """One search hit with its place in the fused ranking."""
 
+    class_name: str
+    label: str
+    content: str
+    distance: Optional[float]
+    score: float
+
+    def render(self) -> str:
+        distance = f", distance {self.distance:.3f}" if self.distance is not None else ""
+        if self.class_name == "Code":
+            return f"### Source File: {self.label} (score {self.score:.4f}{distance})\n```\n{self.content}\n```\n---"
+        return f"### Source Document: {self.label} (score {self.score:.4f}{distance})\n{self.content}\n---"
+
+
+def _distance(hit: Dict[str, Any]) -> Optional[float]:
+    distance = (hit.get("_additional") or {}).get("distance")
+    return float(distance) if distance is not None else None
+
+
+# Class searched -> the property naming each hit's origin.
+RETRIEVAL_SOURCES: Dict[str, str] = {"Code": "file_path", "Document": "source"}
+
+
+class UnifiedRetriever:
+    """
+    Async hybrid retrieval over the `Code` and `Document` classes.
+
+    Every class is searched concurrently, so latency tracks the slowest
+    class rather than the sum. Hits are fused with reciprocal-rank fusion
+    over two rankings: their rank within their own class, and their rank by
+    vector distance across all classes. The rendered context is capped at
+    `max_chars` and cached per normalized query; concurrent misses for the
+    same query share one retrieval.
+    """
+
+    def __init__(
+        self,
+        weaviate: AsyncL2Weaviate,
+        top_k: int = 3,
+        max_chars: int = 12000,
+        rrf_k: int = 60,
+        cache_ttl: float = 300.0,
+        cache_size: int = 1024,
+        sources: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            weaviate: The shared async Weaviate client.
+            top_k: Hits fetched per class.
+            max_chars: The character budget of the rendered context.
+            rrf_k: The reciprocal-rank fusion constant; larger values flatten rank differences.
+            cache_ttl: Seconds a rendered context is reused. 0 disables the cache.
+            cache_size: The maximum number of cached contexts.
+            sources: Classes to search, mapped to the property naming each hit's origin.
+        """
+        self.weaviate = weaviate
+        self.top_k = top_k
+        self.max_chars = max_chars
+        self.rrf_k = rrf_k
+        self.sources = sources or RETRIEVAL_SOURCES
+        self._cache: Optional[TTLCache] = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_ttl > 0 else None
+        self._flights = SingleFlight()
+
+    async def retrieve(self, query: str) -> List[RetrievedChunk]:
+        """Searches every class concurrently and returns the hits in fused order."""
+        chunks, _ = await self._retrieve(query)
+        return chunks
+
+    async def _retrieve(self, query: str) -> Tuple[List[RetrievedChunk], bool]:
+        # Also reports whether every class answered; a failed class contributes no hits.
+        results = await asyncio.gather(*(self._search(class_name, query) for class_name in self.sources))
+        complete = all(hits is not None for hits in results)
+        per_class = {class_name: hits or [] for class_name, hits in zip(self.sources, results)}
+        scores: Dict[Tuple[str, int], float] = {}
+        for class_name, hits in per_class.items():
+            for rank, _ in enumerate(hits):
+                scores[(class_name, rank)] = 1.0 / (self.rrf_k + rank + 1)
+        distances = {hit: _distance(per_class[hit[0]][hit[1]]) for hit in scores}
+        # Hits without a distance rank after every hit that has one.
+        by_distance = sorted(scores, key=lambda hit: float("inf") if distances[hit] is None else distances[hit])
+        for rank, hit in enumerate(by_distance):
+            scores[hit] += 1.0 / (self.rrf_k + rank + 1)
+        chunks = []
+        for (class_name, rank), score in scores.items():
+            hit = per_class[class_name][rank]
+            distance = distances[(class_name, rank)]
+            chunks.append(RetrievedChunk(
+                class_name=class_name,
+                label=str(hit.get(self.sources[class_name], "")),
+                content=str(hit.get("content", "")),
+                distance=distance,
+                score=score,
+            ))
+        chunks.sort(key=lambda chunk: chunk.score, reverse=True)
+        return chunks, complete
+
+    async def context(self, query: str) -> str:
+        """Returns the fused context for a query within the character budget, from the cache when possible."""
+        key = (normalize_query(query), self.top_k, self.max_chars)
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        return await self._flights.do(key, lambda: self._build_context(key, query))
+
+    async def _build_context(self, key: Tuple[str, int, int], query: str) -> str:
+        logger.info(f"Performing unified search for query: '{query}'")
+        chunks, complete = await self._retrieve(query)
+        parts: List[str] = []
+        used = 0
+        for chunk in chunks:
+            rendered = chunk.render()
+            if used + len(rendered) + 1 > self.max_chars:
+                if not parts:
+                    # Never return nothing just because the best hit is large.
+                    parts.append(rendered[: self.max_chars])
+                break
+            parts.append(rendered)
+            used += len(rendered) + 1
+        if parts:
+            logger.info(f"Retrieved {len(chunks)} hits; {len(parts)} fit the {self.max_chars}-character budget.")
+            context = "\n".join(parts)
+        else:
+            logger.warning("Unified search returned no results for the query.")
+            context = "No relevant information found in the knowledge base."
+        # A context missing a failed class is not cached, so the next call retries it.
+        if self._cache is not None and complete:
+            self._cache[key] = context
+        return context
+
+    async def _search(self, class_name: str, query: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            return await self.weaviate.query(
+                class_name,
+                [self.sources[class_name], "content"],
+                near_text=[query],
+                limit=self.top_k,
+                additional=["distance"],
+            )
+        except MemoryLayerError as e:
+            logger.error(f"Error querying '{class_name}' class in Weaviate: {e}")
+            return None
+
+
+def _embedding_service() -> Optional[EmbeddingService]:
+    # Classes created with `vectorizer: none` are searched with vectors from the shared service.
+    return default_embedding_service() if WEAVIATE_SERVICE_EMBEDDINGS else None
+
+
+class RAGSystem:
+    """
+    Async RAG retrieval used by the analysis workflow.
+
+    Retrieval goes through a `UnifiedRetriever` on the process-wide async
+    Weaviate client, created on first use. If that client has been closed
+    and replaced since, the retriever moves to the new one.
+    """
+
+    def __init__(self, url: Optional[str] = None, top_k: int = RAG_TOP_K, weaviate: Optional[AsyncL2Weaviate] = None):
+        self.url = url or os.environ.get("WEAVIATE_URL", "http://localhost:8080")
+        self.top_k = top_k
+        self._weaviate = weaviate
+        self._retriever: Optional[UnifiedRetriever] = None
+
+    def _get_retriever(self) -> UnifiedRetriever:
+        # Created lazily so importing the workflow does not open a connection pool.
+        weaviate = self._weaviate or get_async_weaviate(self.url, embedding_service=_embedding_service())
+        if self._retriever is None or self._retriever.weaviate is not weaviate:
+            self._retriever = UnifiedRetriever(
+                weaviate,
+                top_k=self.top_k,
+                max_chars=RAG_CONTEXT_MAX_CHARS,
+                rrf_k=RAG_RRF_K,
+                cache_ttl=RAG_CACHE_TTL_SECONDS,
+            )
+        return self._retriever
+
+    async def query(self, query: str) -> str:
+        """Returns the fused, budgeted search context for a query."""
+        return await self._get_retriever().context(query)
+
+
+_default_rag: Optional[RAGSystem] = None
+
+
+async def generate_answer_from_query(query: str) -> str:
+    """Example pipeline using the unified retrieval of `RAGSystem`."""
+    global _default_rag
     try:
-        doc_results = (
-            weaviate_manager.client.query.get("Document", ["source", "content"]).with_near_text(near_text_filter).with_limit(top_k).do()
-        )
-    except Exception as e:
-        logger.error(f"Error querying 'Document' class in Weaviate: {e}")
-        doc_results = {}
-
-    context_parts = []
-
-    code_data = code_results.get("data", {}).get("Get", {}).get("Code")
-    if code_data:
-        context_parts.append("--- CONTEXT FROM SOURCE CODE ---")
-        for res in code_data:
-            context_parts.append(f"### Source File: {res['file_path']}")
-            context_parts.append("```")
-            context_parts.append(res["content"])
-            context_parts.append("```")
-            context_parts.append("---")
-        logger.info(f"Retrieved {len(code_data)} results from 'Code' class.")
-
-    doc_data = doc_results.get("data", {}).get("Get", {}).get("Document")
-    if doc_data:
-        context_parts.append("\n--- CONTEXT FROM DOCUMENTS ---")
-        for res in doc_data:
-            context_parts.append(f"### Source Document: {res['source']}")
-            context_parts.append(res["content"])
-            context_parts.append("---")
-        logger.info(f"Retrieved {len(doc_data)} results from 'Document' class.")
-
-    if not context_parts:
-        logger.warning("Unified search returned no results for the query.")
-        return "No relevant information found in the knowledge base."
-
-    return "\n".join(context_parts)
-
-
-def generate_answer_from_query(query: str) -> str:
-    """Example pipeline using the unified search."""
-    try:
-        weaviate_manager = L2Weaviate(os.environ.get("WEAVIATE_URL", "http://localhost:8080"))
-        context = unified_search(query, weaviate_manager)
+        if _default_rag is None:
+            _default_rag = RAGSystem()
+        context = await _default_rag.query(query)
         prompt = f"""
         You are an expert AI assistant. Answer the following question based *only* on the provided context.
         If the answer is not in the context, state that you cannot answer based on the available information.
@@ -44,11 +44,14 @@ def mock_memory_manager() -> MagicMock:
     mock = MagicMock(spec=MemoryManager)
     # Configure the async methods with AsyncMock
     mock.get_file_content = AsyncMock()
+    mock.get_file_bytes = AsyncMock()
+    mock.get_file_contents_bulk = AsyncMock()
     async def _semantic_search(query: str, top_k: int = 5):
         return {"ids": [["doc1"]], "documents": [["This is a test document."]], "metadatas": [[{"source": "README.md"}]], "distances": [[0.123]]}
     mock.semantic_search = AsyncMock(side_effect=_semantic_search)
     mock.set_cache_item = AsyncMock()
     mock.persist_node = AsyncMock()
+    mock.prewarm = AsyncMock()
 
     return mock
 
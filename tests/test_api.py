@@ -24,6 +24,8 @@ for _var in REQUIRED_ENV_VARS:
     os.environ.setdefault(_var, "test")
 
 from core.exceptions import NotFoundError, MemoryLayerError
+from core.prewarm import PrewarmResult
+from core.l2_chroma import BulkUpsertResult
 
 # Mark all tests in this file as requiring an asyncio event loop
 # pytestmark = pytest.mark.asyncio
@@ -52,15 +54,29 @@ async def test_get_file_success(
 ):
     """Tests the successful retrieval of a file."""
     file_path = "src/main.py"
-    file_content = "print('hello world')"
-    mock_memory_manager.get_file_content.return_value = file_content
+    file_content = b"print('hello world')"
+    mock_memory_manager.get_file_bytes.return_value = file_content
 
     response = await async_test_app_client.get(f"/memory/file/{file_path}")
 
     assert response.status_code == 200
-    assert response.text == file_content
+    assert response.content == file_content
     # Verify that the manager was called with the correct arguments
-    mock_memory_manager.get_file_content.assert_called_once_with(file_path, None)
+    mock_memory_manager.get_file_bytes.assert_called_once_with(file_path, None)
+
+
+@pytest.mark.asyncio
+async def test_get_file_non_utf8(
+    async_test_app_client: AsyncClient, mock_memory_manager: AsyncMock
+):
+    """Tests that bytes which are not valid UTF-8 are served unchanged."""
+    file_content = b"caf\xe9\x00\xff"
+    mock_memory_manager.get_file_bytes.return_value = file_content
+
+    response = await async_test_app_client.get("/memory/file/assets/latin1.txt")
+
+    assert response.status_code == 200
+    assert response.content == file_content
 
 
 @pytest.mark.asyncio
@@ -70,7 +86,7 @@ async def test_get_file_not_found(
     """Tests the 404 response when a file is not found in any layer."""
     file_path = "non/existent/file.py"
     # Configure the mock to raise the specific exception our app handles
-    mock_memory_manager.get_file_content.side_effect = NotFoundError(
+    mock_memory_manager.get_file_bytes.side_effect = NotFoundError(
         f"File '{file_path}' not found."
     )
 
@@ -87,7 +103,7 @@ async def test_get_file_memory_layer_failure(
     """Tests the 503 response when a backend service is unavailable."""
     file_path = "src/main.py"
     # Configure the mock to raise a service error
-    mock_memory_manager.get_file_content.side_effect = MemoryLayerError(
+    mock_memory_manager.get_file_bytes.side_effect = MemoryLayerError(
         "L3-Git", "Repository is corrupted."
     )
 
@@ -98,6 +114,43 @@ async def test_get_file_memory_layer_failure(
     assert "[L3-Git] Repository is corrupted" in response.json()["message"]
 
 
+@pytest.mark.asyncio
+async def test_get_files_batch(
+    async_test_app_client: AsyncClient, mock_memory_manager: AsyncMock
+):
+    """Tests that the batch endpoint splits found and missing files."""
+    mock_memory_manager.get_file_contents_bulk.return_value = {
+        "src/main.py": b"print('hello world')",
+        "assets/logo.bin": b"\xff\xfe",
+        "src/missing.py": None,
+    }
+
+    request_data = {"paths": ["src/main.py", "assets/logo.bin", "src/missing.py"]}
+    response = await async_test_app_client.post("/memory/files:batch", json=request_data)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "files": {"src/main.py": "print('hello world')"},
+        "binary": {"assets/logo.bin": "//4="},
+        "missing": ["src/missing.py"],
+    }
+    mock_memory_manager.get_file_contents_bulk.assert_called_once_with(
+        ["src/main.py", "assets/logo.bin", "src/missing.py"], None
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_files_batch_rejects_traversal(
+    async_test_app_client: AsyncClient, mock_memory_manager: AsyncMock
+):
+    """Tests that one invalid path rejects the whole batch."""
+    request_data = {"paths": ["src/main.py", "../etc/passwd"]}
+    response = await async_test_app_client.post("/memory/files:batch", json=request_data)
+
+    assert response.status_code == 400
+    mock_memory_manager.get_file_contents_bulk.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_semantic_search_success(
     async_test_app_client: AsyncClient, mock_memory_manager: AsyncMock
@@ -118,6 +171,60 @@ async def test_semantic_search_success(
     assert response.json()["documents"][0][0] == "This is a test document."
 
 
+@pytest.mark.asyncio
+async def test_prewarm_endpoint(
+    async_test_app_client: AsyncClient, mock_memory_manager: AsyncMock
+):
+    """Tests that the admin endpoint runs a pre-warm pass and reports it."""
+    mock_memory_manager.prewarm.return_value = PrewarmResult("a" * 40, "b" * 40, 3, 2, 0.5)
+
+    response = await async_test_app_client.post("/admin/prewarm", json={"old_commit": "a" * 40})
+
+    assert response.status_code == 200
+    assert response.json()["warmed"] == 2
+    mock_memory_manager.prewarm.assert_called_once_with("a" * 40, None)
+
+
+@pytest.mark.asyncio
+async def test_bulk_documents_streams_ndjson(
+    async_test_app_client: AsyncClient, mock_memory_manager: AsyncMock
+):
+    """Tests that NDJSON lines reach the manager as documents."""
+    received = []
+
+    async def _add_documents_bulk(documents):
+        async for document in documents:
+            received.append(document)
+        return BulkUpsertResult(received=len(received), upserted=1, skipped=1, seconds=0.5, batch_latencies=[0.25])
+
+    mock_memory_manager.add_documents_bulk = AsyncMock(side_effect=_add_documents_bulk)
+    body = '{"id": "a", "content": "alpha"}\n\n{"id": "b", "content": "beta", "metadata": {"source": "b.md"}}'
+
+    response = await async_test_app_client.post("/memory/documents:bulk", content=body)
+
+    assert response.status_code == 200
+    assert response.json()["docs_per_second"] == 4.0
+    assert response.json()["batch_latencies_ms"] == [250.0]
+    assert [d["id"] for d in received] == ["a", "b"]
+    assert received[1]["metadata"] == {"source": "b.md"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_documents_rejects_malformed_line(
+    async_test_app_client: AsyncClient, mock_memory_manager: AsyncMock
+):
+    """Tests that a malformed line fails the upload with its line number."""
+    async def _add_documents_bulk(documents):
+        async for _ in documents:
+            pass
+
+    mock_memory_manager.add_documents_bulk = AsyncMock(side_effect=_add_documents_bulk)
+    response = await async_test_app_client.post("/memory/documents:bulk", content='{"id": "a", "content": "x"}\n{"id": "b"}')
+
+    assert response.status_code == 400
+    assert "line 2" in response.json()["detail"]
+
+
 def test_required_env_vars_present():
     required_vars = [
         "JWT_SECRET",
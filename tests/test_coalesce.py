@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from core.coalesce import MicroBatcher, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(flights.do("k", work) for _ in range(10)))
+
+    assert results == ["value"] * 10
+    assert len(calls) == 1
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter_and_key_is_released():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelling_all_waiters_releases_key():
+    flights = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(flights.do("k", slow))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_on_size_and_deadline():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(flush, max_batch=3, max_delay=0.01)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+
+    assert results == [0, 2, 4, 6]
+    assert batches == [[0, 1, 2], [3]]
+    assert len(batcher) == 0
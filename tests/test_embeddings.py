@@ -0,0 +1,65 @@
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from core.embeddings import EmbeddingCache, EmbeddingService, HashingBackend, hash_embed
+from core.l2_chroma import ServiceEmbeddingFunction
+
+
+class CountingBackend(HashingBackend):
+    def __init__(self, dim=8):
+        super().__init__(dim)
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return super().embed(texts)
+
+
+def test_hash_embed_matches_the_legacy_vector_store_embedding_and_extends_stably():
+    legacy = [b / 255.0 for b in hashlib.sha256(b"attack path").digest()]
+    assert np.allclose(hash_embed(["attack path"])[0], legacy)
+    wide = hash_embed(["attack path"], dim=48)
+    assert wide.shape == (1, 48)
+    assert np.array_equal(wide[0, :32], hash_embed(["attack path"])[0])
+
+
+def test_service_embeds_each_text_once_and_persists_vectors(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.sqlite")
+    backend = CountingBackend()
+    service = EmbeddingService(backend, cache=EmbeddingCache(path))
+
+    first = service.embed(["a", "b", "a"])
+    service.embed(["b"])
+    assert backend.calls == [["a", "b"]]
+    assert np.array_equal(first[0], first[2])
+
+    # A fresh process only has the on-disk cache.
+    restarted_backend = CountingBackend()
+    restarted = EmbeddingService(restarted_backend, cache=EmbeddingCache(path))
+    assert np.array_equal(restarted.embed(["a", "b", "c"])[:2], first[:2])
+    assert restarted_backend.calls == [["c"]]
+
+    # Vectors are keyed by model, so another model never reads them.
+    other_backend = CountingBackend(dim=16)
+    EmbeddingService(other_backend, cache=EmbeddingCache(path)).embed(["a"])
+    assert other_backend.calls == [["a"]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_single_text_requests_share_one_model_call():
+    backend = CountingBackend()
+    service = EmbeddingService(backend, batch_window_ms=20)
+
+    vectors = await asyncio.gather(*(service.embed_one_async(f"text {i}") for i in range(5)))
+    await service.close()
+
+    assert len(backend.calls) == 1 and len(backend.calls[0]) == 5
+    assert np.array_equal(vectors[3], hash_embed(["text 3"], dim=8)[0])
+
+
+def test_chroma_adapter_returns_plain_lists():
+    embeddings = ServiceEmbeddingFunction(EmbeddingService(HashingBackend(4)))(["x", "y"])
+    assert len(embeddings) == 2 and all(isinstance(v, float) for v in embeddings[0])
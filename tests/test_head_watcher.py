@@ -0,0 +1,43 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from core.head_watcher import HeadWatcher
+
+
+class FakeL3Async:
+    def __init__(self, git_dir):
+        self.l3 = SimpleNamespace(repo=SimpleNamespace(git_dir=git_dir, common_dir=git_dir))
+        self.head = "a" * 40
+
+    async def get_latest_commit(self):
+        return self.head
+
+
+@pytest.mark.asyncio
+async def test_watcher_notifies_only_when_head_moves(tmp_path):
+    git_dir = str(tmp_path)
+    (tmp_path / "HEAD").write_text("ref: refs/heads/main\n")
+    os.makedirs(tmp_path / "refs" / "heads")
+    (tmp_path / "refs" / "heads" / "main").write_text("a" * 40 + "\n")
+
+    l3_async = FakeL3Async(git_dir)
+    watcher = HeadWatcher(l3_async, interval=3600)
+    moves = []
+
+    async def on_move(old, new):
+        moves.append((old, new))
+
+    watcher.add_listener(on_move)
+    await watcher.start()
+    try:
+        assert await watcher.check() is False
+
+        l3_async.head = "b" * 40
+        (tmp_path / "refs" / "heads" / "main").write_text("b" * 40 + "\n")
+        assert await watcher.check() is True
+        assert watcher.head == "b" * 40
+        assert moves == [("a" * 40, "b" * 40)]
+    finally:
+        await watcher.close()
@@ -0,0 +1,111 @@
+import pytest
+
+from core.weaviate_importer import ImportResult
+
+pytest.importorskip("unstructured")
+
+from core.ingestion_pipeline import IngestionPipeline, walk_repository
+from core.ingestion_service import ingest_file
+
+
+class FakeWeaviate:
+    def __init__(self):
+        self.objects = []
+        self.deleted = []
+
+    def batch_import(self, class_name, objects, uuids=None, **kwargs):
+        self.objects.extend(objects)
+        return ImportResult(total=len(objects), succeeded=len(objects))
+
+    def delete_by_source(self, class_name, source):
+        self.deleted.append(source)
+        self.objects = [obj for obj in self.objects if obj["source"] != source]
+        return 1
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "guide.md").write_text("# Guide\n\nHow the cache works.\n")
+    (tmp_path / "notes.github").mkdir()
+    (tmp_path / "notes.github" / "todo.txt").write_text("Remember the manifest.\n")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "description.txt").write_text("not content\n")
+    return tmp_path
+
+
+def test_walk_prunes_only_git_directories(repo):
+    assert sorted(walk_repository(str(repo))) == ["docs/guide.md", "notes.github/todo.txt"]
+
+
+def test_second_run_skips_unchanged_files(repo, tmp_path_factory):
+    manifest = str(tmp_path_factory.mktemp("state") / "manifest.json")
+    weaviate = FakeWeaviate()
+
+    first = IngestionPipeline(weaviate, manifest, workers=1).run(str(repo))
+    assert (first.scanned, first.ingested) == (2, 2)
+    assert {obj["source"] for obj in weaviate.objects} == {"docs/guide.md", "notes.github/todo.txt"}
+
+    (repo / "docs" / "guide.md").write_text("# Guide\n\nRewritten.\n")
+    second = IngestionPipeline(weaviate, manifest, workers=1).run(str(repo))
+    assert (second.unchanged, second.ingested) == (1, 1)
+    assert weaviate.deleted == ["docs/guide.md"]
+    assert "Rewritten." in " ".join(obj["content"] for obj in weaviate.objects if obj["source"] == "docs/guide.md")
+    assert "How the cache works." not in " ".join(obj["content"] for obj in weaviate.objects)
+
+    (repo / "notes.github" / "todo.txt").unlink()
+    third = IngestionPipeline(weaviate, manifest, workers=1).run(str(repo))
+    assert (third.unchanged, third.deleted) == (1, 1)
+    assert {obj["source"] for obj in weaviate.objects} == {"docs/guide.md"}
+
+
+def test_ingest_file_keeps_files_sharing_a_name_apart(tmp_path):
+    stored = {}
+
+    class KeyedWeaviate:
+        def batch_import(self, class_name, objects, uuids=None, **kwargs):
+            objects = list(objects)
+            stored.update(zip(uuids, objects))
+            return ImportResult(total=len(objects), succeeded=len(objects))
+
+    for directory, text in (("docs", "Docs readme.\n"), ("src", "Source readme.\n")):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "README.md").write_text(text)
+        ingest_file(str(tmp_path / directory / "README.md"), KeyedWeaviate())
+
+    contents = " ".join(obj["content"] for obj in stored.values())
+    assert "Docs readme." in contents and "Source readme." in contents
+
+
+class FakeL3:
+    def __init__(self):
+        self.trees = {
+            "c1": {"docs/guide.md": "b1", "docs/old.md": "b2"},
+            "c2": {"docs/guide.md": "b3", "docs/new.txt": "b4"},
+        }
+        self.blobs = {"b1": b"v1\n", "b2": b"old\n", "b3": b"v2\n", "b4": b"new\n"}
+
+    def resolve_commit(self, commit):
+        return commit if commit in self.trees else None
+
+    def get_tree_index(self, commit):
+        return self.trees.get(commit)
+
+    def diff_paths(self, old, new):
+        return {"docs/guide.md": "M", "docs/old.md": "D", "docs/new.txt": "A"}
+
+    def get_blob(self, sha):
+        return self.blobs.get(sha)
+
+
+def test_commit_range_ingests_changes_and_deletes_removed_paths(tmp_path):
+    weaviate = FakeWeaviate()
+    l3 = FakeL3()
+    pipeline = IngestionPipeline(weaviate, str(tmp_path / "manifest.json"), workers=1)
+
+    pipeline.run_commit(l3, "c1")
+    assert {(obj["source"], obj["commit"]) for obj in weaviate.objects} == {("docs/guide.md", "c1"), ("docs/old.md", "c1")}
+
+    stats = pipeline.run_commit(l3, "c2", since="c1")
+    assert (stats.ingested, stats.deleted) == (2, 1)
+    assert {(obj["source"], obj["commit"]) for obj in weaviate.objects} == {("docs/guide.md", "c2"), ("docs/new.txt", "c2")}
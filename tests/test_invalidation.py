@@ -0,0 +1,21 @@
+import json
+from unittest.mock import MagicMock
+
+from core.invalidation import L0InvalidationBus
+from core.l0_cache import L0Cache
+
+
+def test_remote_invalidation_evicts_local_key():
+    l0 = L0Cache(10)
+    l0.set("k", "v")
+    bus = L0InvalidationBus(MagicMock(), l0)
+    bus.handle_message(json.dumps({"origin": "other-replica", "keys": ["k"]}))
+    assert l0.get("k") is None
+
+
+def test_own_invalidation_is_ignored():
+    l0 = L0Cache(10)
+    l0.set("k", "v")
+    bus = L0InvalidationBus(MagicMock(), l0)
+    bus.handle_message(json.dumps({"origin": bus.origin, "keys": ["k"]}))
+    assert l0.get("k") == "v"
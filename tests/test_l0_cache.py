@@ -0,0 +1,50 @@
+from core.l0_cache import ShardedL0Cache, SizedL0Cache
+
+
+def test_sized_cache_respects_byte_budget():
+    cache = SizedL0Cache(max_bytes=1000)
+    for i in range(50):
+        cache.set(f"k{i}", b"x" * 100)
+    assert cache.size_bytes <= 1000
+
+
+def test_sized_cache_rejects_oversized_values():
+    cache = SizedL0Cache(max_bytes=1000)
+    cache.set("huge", b"x" * 5000)
+    assert cache.get("huge") is None
+    assert len(cache) == 0
+
+
+def test_sized_cache_counts_the_contents_of_containers():
+    node = {"path": "big.py", "content": "x" * 50000, "children": [{"content": "y" * 20000}]}
+    assert SizedL0Cache._sizeof(node) > 70000
+
+    cache = SizedL0Cache(max_bytes=10000)
+    cache.set("node", node)
+    assert cache.get("node") is None
+    assert cache.size_bytes == 0
+
+
+def test_scan_does_not_flush_hot_set():
+    cache = SizedL0Cache(max_bytes=1000)
+    for i in range(9):
+        cache.set(f"hot{i}", b"h" * 100)
+    for _ in range(5):
+        for i in range(9):
+            assert cache.get(f"hot{i}") == b"h" * 100
+    # A one-off scan of many unseen keys must lose admission to the hot set.
+    for i in range(100):
+        cache.set(f"scan{i}", b"s" * 100)
+    assert all(cache.get(f"hot{i}") is not None for i in range(9))
+
+
+def test_sharded_cache_bounds_size_in_both_modes():
+    for approximate in (True, False):
+        cache = ShardedL0Cache(maxsize=64, shards=4, approximate=approximate)
+        for i in range(1000):
+            cache.set(i, i)
+        assert len(cache) <= 64
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,32 @@
+import pytest
+
+from core.l1_codec import L1Codec, CodecError
+
+
+def test_small_values_are_stored_raw():
+    codec = L1Codec("zlib", min_size=1024)
+    assert codec.encode("short") == b"short"
+    assert codec.decode(b"short") == b"short"
+
+
+def test_large_values_round_trip_compressed():
+    codec = L1Codec("zlib", min_size=16)
+    value = b"def handler(request):\n    return request\n" * 100
+    encoded = codec.encode(value)
+    assert len(encoded) < len(value)
+    assert codec.decode(encoded) == value
+
+
+def test_raw_values_starting_with_marker_round_trip():
+    codec = L1Codec("none")
+    value = b"\x00\x01binary"
+    assert codec.decode(codec.encode(value)) == value
+
+
+def test_legacy_uncompressed_entries_are_readable():
+    assert L1Codec("zlib").decode(b"legacy value") == b"legacy value"
+
+
+def test_corrupt_compressed_entry_raises():
+    with pytest.raises(CodecError):
+        L1Codec("zlib").decode(b"\x00\x01not-zlib")
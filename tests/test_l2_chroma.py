@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from chromadb.api.types import EmbeddingFunction
+
+from core.l2_chroma import DocumentBatcher, L2Chroma
+from core.l2_chroma_async import AsyncL2Chroma
+
+
+class LengthEmbedding(EmbeddingFunction):
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [[float(len(text)), 1.0] for text in input]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_one_chroma_call(tmp_path):
+    l2c = L2Chroma(str(tmp_path), embedding_function=LengthEmbedding())
+    chroma = AsyncL2Chroma(l2c, max_threads=1, batch_window_ms=5)
+    try:
+        await asyncio.gather(
+            chroma.add_document("short", "hi", {"source": "a.md"}),
+            chroma.add_document("long", "hello there", {"source": "b.md"}),
+        )
+        assert l2c.collection.count() == 2
+
+        calls = []
+        original = l2c.query_many
+        l2c.query_many = lambda texts, n: calls.append(texts) or original(texts, n)
+
+        first, second, repeat = await asyncio.gather(
+            chroma.query("hi", 1), chroma.query("hello there", 1), chroma.query("hi", 1)
+        )
+        assert calls == [["hi", "hello there"]]
+        assert first["ids"] == [["short"]] and repeat == first
+        assert second["ids"] == [["long"]]
+    finally:
+        await chroma.close()
+
+
+def test_document_batcher_bounds_count_and_bytes():
+    batcher = DocumentBatcher(batch_size=2, max_batch_bytes=10)
+    documents = [{"id": str(i), "content": content} for i, content in enumerate(["aa", "bb", "cc", "x" * 20, "dd"])]
+
+    batches = [batch for batch in map(batcher.add, documents) if batch] + [batcher.flush()]
+
+    assert [[document["id"] for document in batch] for batch in batches] == [["0", "1"], ["2"], ["3"], ["4"]]
+    assert batcher.flush() is None
+
+
+def test_upsert_changed_skips_unchanged_documents(tmp_path):
+    inner = LengthEmbedding()
+    l2c = L2Chroma(str(tmp_path), embedding_function=inner)
+    documents = [{"id": f"doc{i}", "content": "x" * (i + 1), "metadata": {"n": i}} for i in range(5)]
+    documents.append({"id": "pre", "content": "precomputed", "embedding": [9.0, 9.0]})
+
+    assert l2c.upsert_changed(documents) == 6
+    assert "precomputed" not in sum(inner.calls, [])
+
+    documents[0] = {"id": "doc0", "content": "changed"}
+    assert l2c.upsert_changed(documents) == 1
+    assert l2c.collection.get(ids=["doc0"])["documents"] == ["changed"]
\ No newline at end of file
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+from core.l2_weaviate import L2Weaviate
+
+
+def test_delete_by_source_only_deletes_exact_source_matches():
+    l2w = L2Weaviate("http://weaviate:8080")
+    l2w.client = MagicMock()
+    query = l2w.client.query.get.return_value
+    query.with_where.return_value = query
+    query.with_additional.return_value = query
+    query.with_limit.return_value = query
+    query.with_offset.return_value = query
+    # A word-tokenized `source` makes `a/guide.md` match `guide.md` too.
+    query.do.return_value = {"data": {"Get": {"Document": [
+        {"source": "guide.md", "_additional": {"id": "u1"}},
+        {"source": "a/guide.md", "_additional": {"id": "u2"}},
+        {"source": "guide.md", "_additional": {"id": "u3"}},
+    ]}}}
+    l2w.client.batch.delete_objects.return_value = {"results": {"successful": 2}}
+
+    assert l2w.delete_by_source("Document", "guide.md") == 2
+    query.with_where.assert_called_once_with({"path": ["source"], "operator": "Equal", "valueText": "guide.md"})
+    l2w.client.batch.delete_objects.assert_called_once_with(
+        class_name="Document",
+        where={"path": ["id"], "operator": "ContainsAny", "valueTextArray": ["u1", "u3"]},
+    )
+
+
+def chained_query(l2w, nodes):
+    query = l2w.client.query.get.return_value
+    query.with_where.return_value = query
+    query.with_additional.return_value = query
+    query.with_limit.return_value = query
+    query.do.side_effect = lambda: {"data": {"Get": {"MemoryNode": nodes.pop(0)}}}
+    return query
+
+
+def test_get_nodes_by_uuids_resolves_many_ids_per_request_and_caches_them():
+    l2w = L2Weaviate("http://weaviate:8080")
+    query = chained_query(l2w, [[
+        {"text": "a", "_additional": {"id": "u1"}},
+        {"text": "b", "_additional": {"id": "u2"}},
+    ]])
+
+    nodes = l2w.get_nodes_by_uuids(["u1", "u2", "u3", "u1"], "MemoryNode", ["text"])
+
+    assert nodes == {"u1": {"text": "a"}, "u2": {"text": "b"}}
+    query.with_where.assert_called_once_with(
+        {"path": ["id"], "operator": "ContainsAny", "valueTextArray": ["u1", "u2", "u3"]}
+    )
+    # Found nodes now come from the cache; only the missing one is queried again.
+    chained_query(l2w, [[]])
+    assert l2w.get_node_by_uuid("u2", "MemoryNode", ["text"]) == {"text": "b"}
+    assert l2w.get_node_by_uuid("u3", "MemoryNode", ["text"]) is None
+    assert query.do.call_count == 2
+
+
+def test_writes_evict_cached_nodes():
+    l2w = L2Weaviate("http://weaviate:8080")
+    chained_query(l2w, [[{"text": "old", "_additional": {"id": "u1"}}], [{"text": "new", "_additional": {"id": "u1"}}]])
+    l2w.client.data_object.create.return_value = "u1"
+
+    assert l2w.get_node_by_uuid("u1", "MemoryNode", ["text"]) == {"text": "old"}
+    l2w.add_node("MemoryNode", {"text": "new"}, uuid="u1")
+    assert l2w.get_node_by_uuid("u1", "MemoryNode", ["text"]) == {"text": "new"}
+
+
+def test_uuid_lookups_are_case_insensitive():
+    l2w = L2Weaviate("http://weaviate:8080")
+    l2w.client = MagicMock()
+    node_id = "0b6f3c4e-9a1d-4c1e-8f3b-2d5e7a9c1b20"
+    query = chained_query(l2w, [[{"text": "a", "_additional": {"id": node_id}}]])
+
+    assert l2w.get_node_by_uuid(node_id.upper(), "MemoryNode", ["text"]) == {"text": "a"}
+    query.with_where.assert_called_once_with({"path": ["id"], "operator": "Equal", "valueString": node_id})
+    # Cached under the lowercase ID, whichever case the caller uses.
+    assert l2w.get_nodes_by_uuids([node_id], "MemoryNode", ["text"]) == {node_id: {"text": "a"}}
+    assert query.do.call_count == 1
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.exceptions import MemoryLayerError
+from core.l2_weaviate_async import AsyncL2Weaviate
+
+
+def make_client(handler, **kwargs):
+    http = httpx.AsyncClient(base_url="http://weaviate:8080", transport=httpx.MockTransport(handler))
+    return AsyncL2Weaviate("http://weaviate:8080", client=http, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_add_node_calls_share_one_batch_request():
+    batches = []
+
+    def handler(request):
+        objects = json.loads(request.content)["objects"]
+        batches.append(objects)
+        items = []
+        for obj in objects:
+            failed = obj["properties"]["text"] == "bad"
+            result = {"errors": {"error": [{"message": "invalid property"}]}} if failed else {}
+            items.append({"id": obj["id"], "result": result})
+        return httpx.Response(200, json=items)
+
+    client = make_client(handler, max_batch=10, batch_window_ms=50)
+    results = await asyncio.gather(
+        client.add_node("MemoryNode", {"text": "a"}, uuid="id-a"),
+        client.add_node("MemoryNode", {"text": "b"}, vector=[0.1, 0.2]),
+        client.add_node("MemoryNode", {"text": "bad"}),
+        return_exceptions=True,
+    )
+    await client.close()
+
+    assert len(batches) == 1 and len(batches[0]) == 3
+    assert batches[0][1]["vector"] == [0.1, 0.2]
+    assert results[0] == "id-a"
+    assert results[1] == batches[0][1]["id"]
+    assert isinstance(results[2], MemoryLayerError) and "invalid property" in str(results[2])
+
+
+@pytest.mark.asyncio
+async def test_query_builds_graphql_and_surfaces_errors():
+    queries = []
+
+    def handler(request):
+        queries.append(json.loads(request.content)["query"])
+        if "Broken" in queries[-1]:
+            return httpx.Response(200, json={"errors": [{"message": "no such class"}]})
+        return httpx.Response(200, json={"data": {"Get": {"Document": [{"source": "a.md"}]}}})
+
+    client = make_client(handler)
+    docs = await client.query("Document", ["source"], near_text=['say "hi"'], limit=2, additional=["distance"])
+    with pytest.raises(MemoryLayerError, match="no such class"):
+        await client.query("Broken", ["source"])
+    await client.close()
+
+    assert docs == [{"source": "a.md"}]
+    assert queries[0] == '{ Get { Document(limit: 2, nearText: {concepts: ["say \\"hi\\""]}) { source _additional { distance } } } }'
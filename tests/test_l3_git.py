@@ -0,0 +1,17 @@
+from unittest.mock import MagicMock
+
+from core.l3_git import L3Git
+
+
+def test_resolve_commit_only_caches_full_shas(tmp_path):
+    l3 = L3Git(str(tmp_path))
+    heads = iter(["1" * 40, "2" * 40])
+    l3.repo = MagicMock()
+    l3.repo.commit.side_effect = lambda ref: MagicMock(hexsha=ref if len(ref) == 40 else next(heads))
+
+    # HEAD moved between the calls and must not be served from the cache.
+    assert l3.resolve_commit("HEAD") == "1" * 40
+    assert l3.resolve_commit("HEAD") == "2" * 40
+    assert l3.resolve_commit("a" * 40) == "a" * 40
+    assert l3.resolve_commit("a" * 40) == "a" * 40
+    assert l3.repo.commit.call_count == 3
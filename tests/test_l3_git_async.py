@@ -0,0 +1,31 @@
+import subprocess
+
+import pytest
+
+from core.l3_git_async import CatFileProcess
+
+
+@pytest.fixture
+def git_dir(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    (tmp_path / "a.txt").write_text("alpha\n")
+    subprocess.run(["git", "-C", str(tmp_path), "add", "a.txt"], check=True)
+    subprocess.run(
+        ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"],
+        check=True,
+    )
+    return str(tmp_path / ".git")
+
+
+@pytest.mark.asyncio
+async def test_cat_file_pipelines_requests(git_dir):
+    proc = CatFileProcess(git_dir)
+    await proc.start()
+    try:
+        found = await proc.read_object("HEAD:a.txt")
+        missing = await proc.read_object("HEAD:missing.txt")
+    finally:
+        await proc.close()
+    assert found[1] == "blob"
+    assert found[2] == b"alpha\n"
+    assert missing is None
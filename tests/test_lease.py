@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from core.lease import DistributedSingleFlight
+
+
+class FakeL1:
+    """In-memory stand-in for the lease and value operations of L1Redis."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def acquire_lease(self, key, token, ttl_ms):
+        if key in self.values:
+            return False
+        self.values[key] = token
+        return True
+
+    async def release_lease(self, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+
+    async def exists(self, key):
+        return key in self.values
+
+    async def get(self, key):
+        return self.values.get(key)
+
+
+@pytest.mark.asyncio
+async def test_only_lease_holder_runs_loader():
+    l1 = FakeL1()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        l1.values["k"] = b"content"
+        return b"content"
+
+    flights = [DistributedSingleFlight(l1, poll_interval_ms=5) for _ in range(5)]
+    results = await asyncio.gather(*(f.run("k", loader) for f in flights))
+
+    assert results == [b"content"] * 5
+    assert len(calls) == 1
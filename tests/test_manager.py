@@ -0,0 +1,194 @@
+import asyncio
+
+import pytest
+
+from core.cache_policy import CachePolicy, CachePolicies
+from core.coalesce import SingleFlight
+from core.exceptions import NotFoundError
+from core.l0_cache import L0Cache
+from core.manager import MemoryManager
+from core.prewarm import CachePrewarmer
+
+COMMIT = "a" * 40
+
+
+class FakeL1:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def set(self, key, value, expire=3600):
+        self.store[key] = value
+
+    async def set_many(self, mapping, expire=3600):
+        self.store.update(mapping)
+
+    async def ttl(self, key):
+        return 30 if key in self.store else -2
+
+    async def incr(self, key):
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode()
+        return value
+
+
+class FakeChroma:
+    def __init__(self):
+        self.queries = []
+        self.documents = {}
+
+    async def query(self, query_text, n_results=5):
+        self.queries.append(query_text)
+        ids = [doc_id for doc_id in self.documents][:n_results]
+        return {"ids": [ids], "documents": [[self.documents[i] for i in ids]], "metadatas": [[{} for _ in ids]], "distances": [[0.1 for _ in ids]]}
+
+    async def add_document(self, doc_id, content, metadata=None):
+        self.documents[doc_id] = content
+
+
+class FakeL3:
+    def __init__(self, tree, blobs):
+        self.tree = tree
+        self.blobs = blobs
+        self.blob_reads = 0
+        self.index_lookups = 0
+        self.head = COMMIT
+
+    async def get_latest_commit(self):
+        return self.head
+
+    def has_tree_index(self, commit_hash):
+        return False
+
+    async def get_tree_index(self, commit_hash):
+        self.index_lookups += 1
+        return self.tree if commit_hash == self.head else None
+
+    async def get_blob(self, sha):
+        self.blob_reads += 1
+        return self.blobs.get(sha)
+
+    async def get_blobs(self, shas):
+        return {sha: await self.get_blob(sha) for sha in shas}
+
+    async def diff_paths(self, old_commit, new_commit):
+        return {"a.py": "M", "b.py": "A", "gone.py": "D"}
+
+
+@pytest.fixture
+def manager():
+    m = MemoryManager.__new__(MemoryManager)
+    m.l0 = L0Cache(100)
+    m.l1 = FakeL1()
+    m.l3_async = FakeL3(
+        tree={"a.py": "b1", "copy_of_a.py": "b1", "b.py": "b2"},
+        blobs={"b1": b"print('a')", "b2": b"\xff\xfe"},
+    )
+    m.l2c_async = FakeChroma()
+    m.search_cache_ttl = 300
+    m.approximate_search = None
+    m.distributed_flight = None
+    m.invalidation_bus = None
+    m.head_watcher = None
+    m._flights = SingleFlight()
+    m.cache_policies = CachePolicies(
+        CachePolicy(negative_ttl=30),
+        {"docs/": {"stale_while_revalidate": True}},
+    )
+    m._background = set()
+    m.prewarmer = CachePrewarmer(m, batch_size=1)
+    return m
+
+
+@pytest.mark.asyncio
+async def test_get_file_bytes_fills_caches_once(manager):
+    assert await manager.get_file_bytes("a.py") == b"print('a')"
+    assert await manager.get_file_bytes("a.py", COMMIT) == b"print('a')"
+    assert manager.l3_async.blob_reads == 1
+    assert len(manager.l1.store) == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_blobs_share_one_entry(manager):
+    await manager.get_file_bytes("a.py")
+    await manager.get_file_bytes("copy_of_a.py")
+    assert manager.l3_async.blob_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_file_raises_not_found(manager):
+    with pytest.raises(NotFoundError):
+        await manager.get_file_bytes("missing.py")
+
+
+@pytest.mark.asyncio
+async def test_bulk_resolves_hits_and_misses(manager):
+    await manager.get_file_bytes("a.py")
+    results = await manager.get_file_contents_bulk(["a.py", "b.py", "missing.py"])
+    assert results == {"a.py": b"print('a')", "b.py": b"\xff\xfe", "missing.py": None}
+    assert await manager.get_file_content("b.py") == "��"
+
+
+@pytest.mark.asyncio
+async def test_missing_path_is_negatively_cached(manager):
+    for _ in range(3):
+        with pytest.raises(NotFoundError):
+            await manager.get_file_bytes("missing.py", "b" * 40)
+    assert manager.l3_async.index_lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_serves_old_then_refreshes(manager):
+    l3 = manager.l3_async
+    l3.tree["docs/guide.md"] = "d1"
+    l3.blobs["d1"] = b"v1"
+    assert await manager.get_file_bytes("docs/guide.md") == b"v1"
+
+    # HEAD moves to a commit with a new version of the file.
+    l3.head = "c" * 40
+    l3.tree = {"docs/guide.md": "d2"}
+    l3.blobs["d2"] = b"v2"
+
+    assert await manager.get_file_bytes("docs/guide.md") == b"v1"
+    await asyncio.gather(*manager._background)
+    assert await manager.get_file_bytes("docs/guide.md") == b"v2"
+
+
+@pytest.mark.asyncio
+async def test_warm_files_counts_paths_sharing_a_blob_and_already_cached_paths(manager):
+    paths = ["a.py", "copy_of_a.py", "b.py", "missing.py"]
+    first = await manager.warm_files(paths, COMMIT)
+    again = await manager.warm_files(paths, COMMIT)
+
+    assert sorted(first) == sorted(again) == ["a.py", "b.py", "copy_of_a.py"]
+    assert first["a.py"] == first["copy_of_a.py"]
+    assert manager.l3_async.blob_reads == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_loads_changed_files_into_l1(manager):
+    result = await manager.prewarm("b" * 40)
+    assert (result.new_commit, result.changed, result.warmed) == (COMMIT, 2, 2)
+    assert len(manager.l1.store) == 2
+    assert len(manager.l0) == 0
+
+    assert await manager.get_file_bytes("b.py") == b"\xff\xfe"
+    assert manager.l3_async.blob_reads == 2
+
+
+@pytest.mark.asyncio
+async def test_search_results_are_cached_until_collection_changes(manager):
+    await manager.add_document("doc1", "alpha")
+    first = await manager.semantic_search("Hello   World", 3)
+    assert await manager.semantic_search("hello world", 3) == first
+    assert manager.l2c_async.queries == ["hello world"]
+
+    await manager.add_document("doc2", "beta")
+    second = await manager.semantic_search("hello world", 3)
+    assert second["ids"] == [["doc1", "doc2"]]
+    assert len(manager.l2c_async.queries) == 2
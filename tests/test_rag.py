@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from core.exceptions import MemoryLayerError
+from orchestrator.core.rag import UnifiedRetriever
+
+
+class FakeWeaviate:
+    def __init__(self, results, delay=0.05):
+        self.results = results
+        self.delay = delay
+        self.calls = []
+
+    async def query(self, class_name, properties, near_text=None, limit=10, additional=()):
+        self.calls.append(class_name)
+        await asyncio.sleep(self.delay)
+        result = self.results[class_name]
+        if isinstance(result, Exception):
+            raise result
+        return result[:limit]
+
+
+def hit(key, value, distance, content="x"):
+    return {key: value, "content": content, "_additional": {"distance": distance}}
+
+
+@pytest.mark.asyncio
+async def test_retrieve_searches_classes_concurrently_and_fuses_by_rank_and_distance():
+    weaviate = FakeWeaviate({
+        "Code": [hit("file_path", "a.py", 0.30), hit("file_path", "b.py", 0.40)],
+        "Document": [hit("source", "guide.md", 0.10), hit("source", "faq.md", 0.50)],
+    })
+    retriever = UnifiedRetriever(weaviate, top_k=2)
+
+    start = asyncio.get_running_loop().time()
+    chunks = await retriever.retrieve("how does caching work")
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert elapsed < 0.09  # Both 50ms searches overlap.
+    assert [chunk.label for chunk in chunks] == ["guide.md", "a.py", "b.py", "faq.md"]
+    assert chunks[0].distance == 0.10 and chunks[0].score > chunks[1].score
+
+
+@pytest.mark.asyncio
+async def test_context_is_budgeted_and_only_cached_once_every_class_answered():
+    weaviate = FakeWeaviate({
+        "Code": MemoryLayerError(layer="L2-Weaviate", message="down"),
+        "Document": [hit("source", "a.md", 0.1, "a" * 100), hit("source", "b.md", 0.2, "b" * 100)],
+    }, delay=0)
+    retriever = UnifiedRetriever(weaviate, top_k=2, max_chars=200)
+
+    context = await retriever.context("Caching?")
+    assert "a.md" in context and "b.md" not in context
+    assert len(context) <= 200
+
+    # The degraded context was not cached: the next call searches again.
+    await retriever.context("  caching? ")
+    assert weaviate.calls == ["Code", "Document", "Code", "Document"]
+
+    weaviate.results["Code"] = [hit("file_path", "a.py", 0.3)]
+    recovered = await retriever.context("caching?")
+    again = await retriever.context("Caching?")
+    assert again is recovered
+    assert len(weaviate.calls) == 6
+
+
+@pytest.mark.asyncio
+async def test_rag_system_moves_to_a_fresh_shared_client_after_shutdown():
+    from core.l2_weaviate_async import close_shared_clients, get_async_weaviate
+    from orchestrator.core.rag import RAGSystem
+
+    rag = RAGSystem(url="http://rag-test:8080")
+    first = rag._get_retriever().weaviate
+    assert first is get_async_weaviate("http://rag-test:8080")
+
+    await close_shared_clients()
+
+    second = rag._get_retriever().weaviate
+    assert second is not first and not second.client.is_closed
+    await close_shared_clients()
@@ -0,0 +1,15 @@
+from core.search_cache import ApproximateSearchCache, normalize_query
+
+
+def test_normalize_query_ignores_case_and_whitespace():
+    assert normalize_query("  How does\tthe  L0 cache\nwork? ") == "how does the l0 cache work?"
+
+
+def test_approximate_cache_reuses_close_queries_only():
+    cache = ApproximateSearchCache(threshold=0.99)
+    cache.put([1.0, 0.0, 0.0], top_k=5, version="1", result={"ids": [["a"]]})
+
+    assert cache.get([0.999, 0.01, 0.0], top_k=5, version="1") == {"ids": [["a"]]}
+    assert cache.get([0.5, 0.5, 0.0], top_k=5, version="1") is None
+    assert cache.get([1.0, 0.0, 0.0], top_k=3, version="1") is None
+    assert cache.get([1.0, 0.0, 0.0], top_k=5, version="2") is None
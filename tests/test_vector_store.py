@@ -1,5 +1,8 @@
+from core.embeddings import hash_embed
 from memory.vector_store import VectorStore
 import numpy as np
+import pytest
+import threading
 from types import SimpleNamespace
 
 
@@ -7,8 +10,9 @@ class FakeQuery:
     def __init__(self, store, class_name):
         self.store = store
         self.class_name = class_name
-        self.vector = []
+        self.vector = None
         self.limit = 0
+        self.after = None
 
     def get(self, class_name, props):
         self.class_name = class_name
@@ -22,7 +26,23 @@ class FakeQuery:
         self.limit = k
         return self
 
+    def with_additional(self, fields):
+        return self
+
+    def with_after(self, after):
+        self.after = after
+        return self
+
     def do(self):
+        if self.vector is None:
+            # A cursor scan of the whole class.
+            ids = [item["id"] for item in self.store]
+            start = ids.index(self.after) + 1 if self.after else 0
+            data = [
+                {"text": item["text"], "_additional": {"id": item["id"], "vector": item["vector"]}}
+                for item in self.store[start:start + self.limit]
+            ]
+            return {"data": {"Get": {self.class_name: data}}}
         sims = []
         for item in self.store:
             v = np.array(item["vector"])
@@ -42,8 +62,9 @@ class FakeClient:
         self.query = SimpleNamespace(get=self._get)
 
     def _create(self, data_object, class_name, vector):
-        self.store.append({"text": data_object["text"], "vector": vector})
-        return str(len(self.store))
+        entry_id = str(len(self.store) + 1)
+        self.store.append({"id": entry_id, "text": data_object["text"], "vector": vector})
+        return entry_id
 
     def _get(self, class_name, props):
         return FakeQuery(self.store, class_name)
@@ -59,3 +80,85 @@ def test_add_and_query(monkeypatch):
     store.add_entry("backup data")
     results = store.query_similar("compromise server", top_k=1)
     assert results == ["compromise server"]
+
+
+def test_local_index_answers_queries_and_writes_through(tmp_path, monkeypatch):
+    fake_client = FakeClient()
+    fake_client.data_object.create({"text": "escalate privileges"}, "ReasoningMemory", hash_embed(["escalate privileges"])[0].tolist())
+    monkeypatch.setattr(VectorStore, "BACKFILL_PAGE_SIZE", 1)
+    path = str(tmp_path / "index" / "reasoning")
+    store = VectorStore(url="http://test", client=fake_client, index_path=path)
+    store.add_entry("compromise server")
+    store.add_entry("backup data")
+
+    # The new index is filled from Weaviate on first use, then answers on its own.
+    assert store.query_similar("escalate privileges", top_k=1) == ["escalate privileges"]
+    fake_client.query = None  # Queries must not reach Weaviate any more.
+    assert store.query_similar("backup data", top_k=1) == ["backup data"]
+    assert len(store.index) == 3
+    assert [item["text"] for item in fake_client.store] == ["escalate privileges", "compromise server", "backup data"]
+
+    store.save_index()
+    reloaded = VectorStore(index_path=path, offline=True)
+    assert reloaded.query_similar("compromise server", top_k=2)[0] == "compromise server"
+
+
+def test_ivf_index_finds_exact_matches():
+    from memory.vector_index import LocalVectorIndex
+
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(3000, 32)).astype(np.float32)
+    index = LocalVectorIndex(32, brute_force_limit=1000, nprobe=4)
+    index.add_many([str(i) for i in range(3000)], [f"t{i}" for i in range(3000)], vectors)
+
+    assert index._centroids is not None
+    assert [index.search(vectors[i], top_k=1)[0][0] for i in (0, 1234, 2999)] == ["0", "1234", "2999"]
+
+
+class FakeBatch:
+    def __init__(self, store):
+        self.store = store
+
+    def configure(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_data_object(self, data_object, class_name, uuid=None, vector=None):
+        self.store.append({"id": uuid, "text": data_object["text"], "vector": vector})
+
+
+def test_add_entries_and_query_similar_many_match_single_calls(tmp_path):
+    fake_client = FakeClient()
+    fake_client.batch = FakeBatch(fake_client.store)
+    store = VectorStore(url="http://test", client=fake_client, index_path=str(tmp_path / "idx"))
+    texts = [f"chain {i}" for i in range(50)]
+
+    ids = store.add_entries(texts)
+
+    assert len(set(ids)) == 50
+    assert np.allclose(fake_client.store[7]["vector"], hash_embed(["chain 7"])[0])
+    assert store.query_similar_many(["chain 3", "chain 42"], top_k=2) == [
+        store.query_similar("chain 3", top_k=2),
+        store.query_similar("chain 42", top_k=2),
+    ]
+    assert store.query_similar_many(["chain 3"], top_k=1) == [["chain 3"]]
+
+
+@pytest.mark.asyncio
+async def test_indexed_async_queries_run_off_the_event_loop(tmp_path):
+    fake_client = FakeClient()
+    fake_client.data_object.create({"text": "escalate privileges"}, "ReasoningMemory", hash_embed(["escalate privileges"])[0].tolist())
+    store = VectorStore(url="http://test", client=fake_client, index_path=str(tmp_path / "idx"))
+    loop_thread = threading.get_ident()
+    threads = []
+    original = fake_client.query.get
+    fake_client.query = SimpleNamespace(get=lambda *args: threads.append(threading.get_ident()) or original(*args))
+
+    # The first query fills the index from Weaviate, which is blocking I/O.
+    assert await store.query_similar_async("escalate privileges", top_k=1) == ["escalate privileges"]
+    assert threads and loop_thread not in threads
@@ -0,0 +1,97 @@
+import json
+
+import httpx
+
+from core.weaviate_importer import BatchImporter, deterministic_uuid
+
+
+def make_importer(handler, **kwargs):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return BatchImporter("http://weaviate:8080", backoff=0, client=client, **kwargs)
+
+
+def test_deterministic_uuid_is_stable_per_source_and_index():
+    assert deterministic_uuid("docs/a.md", 0) == deterministic_uuid("docs/a.md", 0)
+    assert deterministic_uuid("docs/a.md", 0) != deterministic_uuid("docs/a.md", 1)
+    assert deterministic_uuid("docs/a.md", 0) != deterministic_uuid("docs/b.md", 0)
+
+
+def test_import_batches_objects_across_workers():
+    sizes = []
+
+    def handler(request):
+        objects = json.loads(request.content)["objects"]
+        sizes.append(len(objects))
+        return httpx.Response(200, json=[{"id": obj["id"], "result": {}} for obj in objects])
+
+    importer = make_importer(handler, workers=3, batch_size=10)
+    result = importer.import_objects("Document", ({"content": str(i)} for i in range(45)))
+
+    assert sorted(sizes) == [5, 10, 10, 10, 10]
+    assert (result.total, result.succeeded, result.failed_ids, result.retries) == (45, 45, [], 0)
+
+
+def test_failed_objects_are_retried_then_reported():
+    flaky, broken = deterministic_uuid("a", 0), deterministic_uuid("a", 1)
+    attempts = {flaky: 0, broken: 0}
+
+    def handler(request):
+        items = []
+        for obj in json.loads(request.content)["objects"]:
+            attempts[obj["id"]] = attempts.get(obj["id"], 0) + 1
+            failing = obj["id"] == broken or (obj["id"] == flaky and attempts[flaky] == 1)
+            errors = {"errors": {"error": [{"message": "vectorizer timeout"}]}} if failing else {}
+            items.append({"id": obj["id"], "result": errors})
+        return httpx.Response(200, json=items)
+
+    importer = make_importer(handler, workers=1, max_retries=2)
+    uuids = [flaky, broken, deterministic_uuid("a", 2)]
+    result = importer.import_objects("Document", [{"content": "x"}] * 3, uuids=uuids)
+
+    assert attempts == {flaky: 2, broken: 3, uuids[2]: 1}
+    assert result.succeeded == 2
+    assert result.failed_ids == [broken]
+    assert result.errors[broken] == "vectorizer timeout"
+
+
+def test_transport_errors_fail_the_whole_batch():
+    def handler(request):
+        return httpx.Response(503)
+
+    importer = make_importer(handler, max_retries=1)
+    result = importer.import_objects("Document", [{"content": "x"}] * 2, uuids=["u1", "u2"])
+
+    assert result.succeeded == 0
+    assert sorted(result.failed_ids) == ["u1", "u2"]
+
+
+def test_unexpected_errors_fail_the_batch_without_stopping_the_import():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) % 2:
+            raise RuntimeError("boom")
+        return httpx.Response(200, json={"error": [{"message": "not a list"}]})
+
+    # Far more batches than queue slots: the import only finishes if every batch is consumed.
+    importer = make_importer(handler, workers=2, batch_size=1, queue_size=1, max_retries=0)
+    result = importer.import_objects("Document", ({"content": str(i)} for i in range(10)))
+
+    assert (result.total, result.succeeded, len(result.failed_ids)) == (10, 0, 10)
+    assert "boom" in result.errors.values()
+
+
+def test_importer_attaches_client_side_vectors():
+    bodies = []
+
+    def handler(request):
+        objects = json.loads(request.content)["objects"]
+        bodies.extend(objects)
+        return httpx.Response(200, json=[{"id": obj["id"], "result": {}} for obj in objects])
+
+    importer = make_importer(handler, embed=lambda texts: [[float(len(text))] for text in texts])
+    importer.import_objects("Document", [{"content": "abc"}, {"source": "no text"}])
+
+    assert bodies[0]["vector"] == [3.0]
+    assert "vector" not in bodies[1]
@@ -1,41 +1,130 @@
 import os
 import argparse
 import logging
+from core.config import WEAVIATE_SERVICE_EMBEDDINGS
+from core.embeddings import default_embedding_service
 from core.l2_weaviate import L2Weaviate
-from core.ingestion_service import ingest_file
+from core.ingestion_pipeline import IngestionPipeline
+from core.l3_git import L3Git
+from tools.init_weaviate_schema import create_schemas
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def main(repo_path: str) -> None:
+def main(
+    repo_path: str,
+    weaviate_url: str = os.environ.get("WEAVIATE_URL", "http://localhost:8080"),
+    manifest_path: str = None,
+    workers: int = None,
+    hash_workers: int = 8,
+    batch_size: int = 100,
+    queue_size: int = 64,
+    checkpoint_every: int = 500,
+    import_workers: int = 4,
+    full: bool = False,
+    commit: str = None,
+    since: str = None,
+    wipe: bool = False,
+) -> None:
     if not os.path.isdir(repo_path):
         logger.error(f"Provided path is not a directory: {repo_path}")
         return
 
     logger.info(f"Starting ingestion for repository: {repo_path}")
     try:
-        weaviate_manager = L2Weaviate(os.environ.get("WEAVIATE_URL", "http://localhost:8080"))
+        weaviate_manager = L2Weaviate(
+            weaviate_url, embedding_service=default_embedding_service() if WEAVIATE_SERVICE_EMBEDDINGS else None
+        )
     except Exception as e:
         logger.error(f"Failed to initialize WeaviateManager: {e}. Aborting.")
         return
 
-    file_count = 0
-    for root, _, files in os.walk(repo_path):
-        if '.git' in root:
-            continue
-        for fname in files:
-            file_path = os.path.join(root, fname)
-            ingest_file(file_path, weaviate_manager)
-            file_count += 1
+    if wipe:
+        # Objects ingested before `source` held repo-relative paths are keyed by basename and
+        # never matched again, and old classes tokenize `source` by word. Recreating the class
+        # and re-ingesting everything clears both.
+        logger.info("Wipe requested. Recreating the 'Document' class; every repository must be re-ingested.")
+        try:
+            if weaviate_manager.client.schema.exists("Document"):
+                weaviate_manager.client.schema.delete_class("Document")
+            create_schemas(weaviate_manager.client)
+        except Exception as e:
+            logger.error(f"Failed to recreate the 'Document' class: {e}. Aborting.")
+            return
+        full = True
 
-    logger.info(f"Repository ingestion process complete. Scanned {file_count} files.")
+    git_mode = commit is not None or since is not None
+    # Git mode tracks blob SHAs instead of content hashes, so it keeps its own manifest.
+    manifest_name = f"ingest-{os.path.basename(os.path.abspath(repo_path))}{'-git' if git_mode else ''}.json"
+    manifest_path = manifest_path or os.path.join(".sentinel", manifest_name)
+    if full and os.path.exists(manifest_path):
+        logger.info(f"Full re-ingest requested. Discarding manifest {manifest_path}.")
+        os.remove(manifest_path)
+
+    pipeline = IngestionPipeline(
+        weaviate_manager,
+        manifest_path,
+        workers=workers,
+        hash_workers=hash_workers,
+        batch_size=batch_size,
+        queue_size=queue_size,
+        checkpoint_every=checkpoint_every,
+        import_workers=import_workers,
+    )
+    if git_mode:
+        try:
+            stats = pipeline.run_commit(L3Git(repo_path), commit or "HEAD", since=since)
+        except Exception as e:
+            logger.error(f"Failed to ingest commit '{commit or 'HEAD'}': {e}")
+            return
+    else:
+        stats = pipeline.run(repo_path)
+    logger.info(
+        f"Repository ingestion process complete. Scanned {stats.scanned} files "
+        f"({stats.files_per_second:.0f} files/s), ingested {stats.ingested}, skipped {stats.unchanged} unchanged, "
+        f"deleted {stats.deleted} removed."
+    )
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Ingest a Git repository and other documents into Sentinel-AI."
     )
-    parser.add_argument("repo_path", type=str, help="The local path to the repository or directory of documents.")
+    parser.add_argument("repo_path", type=str, nargs="?", help="The local path to the repository or directory of documents.")
+    parser.add_argument("--repo", dest="repo_option", type=str, help="Alternative to the positional repository path.")
+    parser.add_argument("--weaviate", type=str, default=os.environ.get("WEAVIATE_URL", "http://localhost:8080"), help="The Weaviate URL.")
+    parser.add_argument("--manifest", type=str, help="Where to keep the manifest of ingested file hashes. Also the resume checkpoint.")
+    parser.add_argument("--workers", type=int, help="Processes used to partition and chunk documents. Defaults to the CPU count.")
+    parser.add_argument("--hash-workers", type=int, default=8, help="Threads used to read and hash files.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Objects per Weaviate batch import.")
+    parser.add_argument("--queue-size", type=int, default=64, help="Chunked files allowed to wait for the importer.")
+    parser.add_argument("--checkpoint-every", type=int, default=500, help="Files ingested between manifest flushes.")
+    parser.add_argument("--import-workers", type=int, default=4, help="Weaviate batch requests in flight at once.")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-ingest every file.")
+    parser.add_argument(
+        "--wipe", action="store_true",
+        help="Delete and recreate the Document class, then re-ingest every file. Needed once when upgrading "
+             "from basename sources; removes the documents of every other ingested repository too.",
+    )
+    parser.add_argument("--commit", type=str, help="Read files from this commit's blobs instead of the working tree.")
+    parser.add_argument("--since", type=str, help="With Git reads, only ingest paths changed since this commit and delete removed ones.")
     args = parser.parse_args()
-    main(args.repo_path)
+    repo_path = args.repo_option or args.repo_path
+    if not repo_path:
+        parser.error("a repository path is required")
+    main(
+        repo_path,
+        weaviate_url=args.weaviate,
+        manifest_path=args.manifest,
+        workers=args.workers,
+        hash_workers=args.hash_workers,
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+        checkpoint_every=args.checkpoint_every,
+        import_workers=args.import_workers,
+        full=args.full,
+        commit=args.commit,
+        since=args.since,
+        wipe=args.wipe,
+    )
@@ -1,5 +1,6 @@
 import os
 import weaviate
+from core.config import WEAVIATE_SERVICE_EMBEDDINGS
 from core.l2_weaviate import L2Weaviate
 import logging
 
@@ -7,18 +8,28 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def vectorizer_config() -> dict:
+    """Server-side OpenAI vectorization, or none when vectors come from the shared embedding service."""
+    if WEAVIATE_SERVICE_EMBEDDINGS:
+        return {"vectorizer": "none"}
+    return {
+        "vectorizer": "text2vec-openai",
+        "moduleConfig": {
+            "text2vec-openai": {"model": "ada", "modelVersion": "002", "type": "text"}
+        },
+    }
+
+
 def create_schemas(client: weaviate.Client):
     """Creates all necessary schemas in Weaviate."""
     code_schema = {
         "class": "Code",
         "description": "A class to store code snippets and AST data",
-        "vectorizer": "text2vec-openai",
-        "moduleConfig": {
-            "text2vec-openai": {"model": "ada", "modelVersion": "002", "type": "text"}
-        },
+        **vectorizer_config(),
         "properties": [
             {"name": "file_path", "dataType": ["text"], "description": "The full path to the source file."},
             {"name": "content", "dataType": ["text"], "description": "The raw code content or snippet."},
+            {"name": "commit", "dataType": ["text"], "description": "The Git commit the content was ingested from."},
         ],
     }
     if not client.schema.exists("Code"):
@@ -30,14 +41,15 @@ def create_schemas(client: weaviate.Client):
     document_schema = {
         "class": "Document",
         "description": "A class to store chunks from generic documents (PDF, MD, TXT)",
-        "vectorizer": "text2vec-openai",
-        "moduleConfig": {
-            "text2vec-openai": {"model": "ada", "modelVersion": "002", "type": "text"}
-        },
+        **vectorizer_config(),
         "properties": [
-            {"name": "source", "dataType": ["text"], "description": "The name of the source file"},
+            # Field tokenization makes `source` filters match whole paths, not their words.
+            # Existing classes keep word tokenization (it cannot be changed in place);
+            # L2Weaviate.delete_by_source stays exact for them by re-checking matches.
+            {"name": "source", "dataType": ["text"], "tokenization": "field", "description": "The name of the source file"},
             {"name": "content", "dataType": ["text"], "description": "The text chunk from the document"},
             {"name": "document_type", "dataType": ["text"], "description": "The file type of the document (e.g., .pdf, .md)"},
+            {"name": "commit", "dataType": ["text"], "description": "The Git commit the chunk was ingested from"},
         ],
     }
     if not client.schema.exists("Document"):
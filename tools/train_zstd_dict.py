@@ -0,0 +1,45 @@
+import argparse
+import logging
+import random
+
+import zstandard
+
+from core.l3_git import L3Git
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main(repo_path: str, output: str, dict_size: int, max_samples: int) -> None:
+    """Trains a zstd dictionary from blobs at the repository's HEAD."""
+    l3 = L3Git(repo_path)
+    index = l3.get_tree_index(l3.get_latest_commit()) or {}
+    blob_shas = list(set(index.values()))
+    random.shuffle(blob_shas)
+
+    samples = []
+    for sha in blob_shas[:max_samples]:
+        data = l3.get_blob(sha)
+        if data:
+            samples.append(data)
+    if not samples:
+        logger.error("No blobs found to train on. Aborting.")
+        return
+
+    logger.info(f"Training a {dict_size}-byte zstd dictionary from {len(samples)} blobs...")
+    trained = zstandard.train_dictionary(dict_size, samples)
+    with open(output, "wb") as f:
+        f.write(trained.as_bytes())
+    logger.info(f"Wrote dictionary {trained.dict_id()} to '{output}'. Set L1_ZSTD_DICT_PATH to use it.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train a zstd dictionary for L1 value compression from a Git repository."
+    )
+    parser.add_argument("repo_path", type=str, help="The local path to the Git repository.")
+    parser.add_argument("--output", type=str, default="l1_zstd.dict", help="Where to write the dictionary.")
+    parser.add_argument("--dict-size", type=int, default=112_640, help="Dictionary size in bytes.")
+    parser.add_argument("--max-samples", type=int, default=5_000, help="Maximum number of blobs to sample.")
+    args = parser.parse_args()
+    main(args.repo_path, args.output, args.dict_size, args.max_samples)